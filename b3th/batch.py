@@ -0,0 +1,241 @@
+"""
+Bulk, offline generation through Groq's Batch API.
+
+For overnight jobs (summaries across many repositories, pre-generated PR
+descriptions) latency is irrelevant but throughput and cost matter. Batch
+requests are billed at a discount and don't count against per-minute limits.
+
+Usage:
+    results = run_batch({"repo-a": prompt_a, "repo-b": prompt_b})
+    results["repo-a"].content      # or .error
+
+Flow: requests are written to a JSONL file, uploaded via ``/files``, a
+``/batches`` job is created and polled, and the output file is downloaded
+and mapped back to the caller's ids. Replies already in the LLM cache are
+served locally and fresh ones are added to it.
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import requests
+
+from . import llm, llm_cache
+from .llm import LLMError
+
+_MAX_LINES_PER_FILE = 50_000  # Groq's per-batch request limit
+_TERMINAL_OK = {"completed"}
+_TERMINAL_FAILED = {"failed", "expired", "cancelled"}
+
+
+class BatchError(LLMError):
+    """Raised when a batch job cannot be submitted or finishes unsuccessfully."""
+
+
+class BatchResult(NamedTuple):
+    """Outcome for one request: *content* on success, else *error*."""
+
+    custom_id: str
+    content: str | None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# --------------------------------------------------------------------------- #
+# HTTP helpers
+# --------------------------------------------------------------------------- #
+def _url(path: str) -> str:
+    return f"{llm._api_base()}/openai/v1/{path.lstrip('/')}"
+
+
+def _auth() -> dict[str, str]:
+    return {"Authorization": f"Bearer {llm._api_key()}"}
+
+
+def _request(method: str, path: str, **kwargs: Any) -> requests.Response:
+    try:
+        resp = llm._session().request(
+            method, _url(path), headers=_auth(), timeout=60, **kwargs
+        )
+    except requests.RequestException as exc:
+        raise BatchError(f"Network error calling Groq batch API: {exc}") from exc
+    if resp.status_code not in (200, 201):
+        raise BatchError(
+            f"Groq batch API error {resp.status_code}: {llm._extract_error_text(resp)}"
+        )
+    return resp
+
+
+# --------------------------------------------------------------------------- #
+# Building blocks
+# --------------------------------------------------------------------------- #
+def write_requests(
+    items: Mapping[str, str | list[dict[str, str]]],
+    path: str | Path,
+    *,
+    model: str | None = None,
+    temperature: float = 0.3,
+    max_tokens: int = 512,
+    system: str | None = None,
+) -> Path:
+    """Write one chat-completion request per item to a batch JSONL file."""
+    path = Path(path)
+    with path.open("w", encoding="utf-8") as fh:
+        for custom_id, messages in items.items():
+            line = {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model or llm._default_model(),
+                    "messages": llm._coerce_messages(messages, system),
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                },
+            }
+            fh.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return path
+
+
+def submit(path: str | Path, *, completion_window: str = "24h") -> str:
+    """Upload a request file and start a batch job; return the batch id."""
+    path = Path(path)
+    with path.open("rb") as fh:
+        upload = _request(
+            "POST",
+            "files",
+            data={"purpose": "batch"},
+            files={"file": (path.name, fh, "application/jsonl")},
+        ).json()
+    batch = _request(
+        "POST",
+        "batches",
+        json={
+            "input_file_id": upload["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": completion_window,
+        },
+    ).json()
+    return str(batch["id"])
+
+
+def wait(
+    batch_id: str, *, poll_interval: float = 30.0, timeout: float = 24 * 3600
+) -> dict[str, Any]:
+    """Poll a batch until it reaches a terminal state; return the batch object."""
+    deadline = time.monotonic() + timeout
+    while True:
+        batch = _request("GET", f"batches/{batch_id}").json()
+        status = batch.get("status")
+        if status in _TERMINAL_OK:
+            return batch
+        if status in _TERMINAL_FAILED:
+            raise BatchError(f"Batch {batch_id} {status}: {batch.get('errors')}")
+        if time.monotonic() + poll_interval > deadline:
+            raise BatchError(f"Batch {batch_id} still {status} after {timeout:.0f}s")
+        time.sleep(poll_interval)
+
+
+def _download(file_id: str | None) -> list[dict[str, Any]]:
+    if not file_id:
+        return []
+    text = _request("GET", f"files/{file_id}/content").text
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def collect(batch: Mapping[str, Any]) -> dict[str, BatchResult]:
+    """Download a finished batch's output/error files, keyed by custom_id."""
+    results: dict[str, BatchResult] = {}
+    for line in _download(batch.get("output_file_id")) + _download(
+        batch.get("error_file_id")
+    ):
+        cid = str(line.get("custom_id"))
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            error = line.get("error") or response.get("body")
+            results[cid] = BatchResult(cid, None, str(error))
+            continue
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            results[cid] = BatchResult(cid, None, f"Malformed result: {response}")
+        else:
+            results[cid] = BatchResult(cid, content)
+    return results
+
+
+# --------------------------------------------------------------------------- #
+# Public entry point
+# --------------------------------------------------------------------------- #
+def run_batch(
+    items: Mapping[str, str | list[dict[str, str]]],
+    *,
+    model: str | None = None,
+    temperature: float = 0.3,
+    max_tokens: int = 512,
+    system: str | None = None,
+    poll_interval: float = 30.0,
+    timeout: float = 24 * 3600,
+    use_cache: bool = True,
+) -> dict[str, BatchResult]:
+    """
+    Generate replies for many prompts through the Batch API.
+
+    *items* maps caller-chosen ids to a prompt string or message list, exactly
+    as accepted by ``chat_completion()``. Returns a ``BatchResult`` per id;
+    requests the provider dropped are reported as errors. Inputs larger than
+    one batch allows are split across several jobs.
+    """
+    model = model or llm._default_model()
+    results: dict[str, BatchResult] = {}
+    keys: dict[str, str] = {}
+    pending: dict[str, str | list[dict[str, str]]] = {}
+
+    for cid, messages in items.items():
+        if use_cache and llm_cache.is_enabled():
+            key = llm_cache.cache_key(
+                model=model,
+                messages=llm._coerce_messages(messages, system),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                base=llm._api_base(),
+            )
+            cached = llm_cache.get(key)
+            if cached is not None:
+                results[cid] = BatchResult(cid, cached)
+                continue
+            keys[cid] = key
+        pending[cid] = messages
+
+    ids = list(pending)
+    with tempfile.TemporaryDirectory(prefix="b3th-batch-") as tmp:
+        for start in range(0, len(ids), _MAX_LINES_PER_FILE):
+            chunk = {
+                cid: pending[cid] for cid in ids[start : start + _MAX_LINES_PER_FILE]
+            }
+            path = write_requests(
+                chunk,
+                Path(tmp, f"batch-{start // _MAX_LINES_PER_FILE}.jsonl"),
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                system=system,
+            )
+            batch = wait(submit(path), poll_interval=poll_interval, timeout=timeout)
+            got = collect(batch)
+            for cid in chunk:
+                res = got.get(cid) or BatchResult(cid, None, "missing from output")
+                results[cid] = res
+                if res.ok and cid in keys:
+                    llm_cache.put(keys[cid], res.content or "")
+
+    return {cid: results[cid] for cid in items}
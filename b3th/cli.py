@@ -5,13 +5,14 @@ Run `poetry run b3th --help` to see available commands.
 
 from __future__ import annotations
 
-import subprocess
 from pathlib import Path
 from typing import Optional
 
 import typer
 from dotenv import load_dotenv
 
+from . import git_utils, llm, llm_cache, telemetry
+
 # Early-load compatibility patch
 from ._compat import patch_click_make_metavar
 from .commit_message import CommitMessageError, generate_commit_message
@@ -22,7 +23,13 @@ from .gh_api import (
     create_draft_pull_request,
     create_pull_request,
 )
-from .git_utils import get_current_branch, has_merge_conflicts, is_git_repo
+from .git_utils import (
+    GIT,
+    GitError,
+    get_current_branch,
+    has_merge_conflicts,
+    is_git_repo,
+)
 from .pr_description import PRDescriptionError, generate_pr_description
 from .summarizer import summarize_commits
 
@@ -32,6 +39,9 @@ load_dotenv()  # auto-load .env before other imports
 
 app = typer.Typer(help="Generate AI-assisted commits, sync, and pull-requests.")
 
+# Global switches set by the app callback
+_STREAM = True
+
 # Default argument values as module-level constants
 DEFAULT_REPO = Path(".")
 DEFAULT_YES = False
@@ -71,6 +81,99 @@ APPLY_OPTION = typer.Option(
 MODEL_OPTION = typer.Option(
     DEFAULT_MODEL, "--model", "-m", help="LLM model ID passed through to the resolver."
 )
+MAX_IN_FLIGHT_OPTION = typer.Option(
+    None,
+    "--max-in-flight",
+    min=1,
+    help="Concurrent LLM calls (default: $B3TH_LLM_CONCURRENCY or 4).",
+)
+NO_STREAM_OPTION = typer.Option(
+    False,
+    "--no-stream",
+    help="Wait for the full LLM reply instead of printing tokens as they arrive.",
+)
+
+NO_CACHE_OPTION = typer.Option(
+    False,
+    "--no-cache",
+    help="Always ask the LLM; bypass the on-disk reply cache.",
+)
+HEDGE_AFTER_OPTION = typer.Option(
+    None,
+    "--hedge-after",
+    min=0.0,
+    help="Seconds to wait for the model before racing --hedge-model against it.",
+)
+HEDGE_MODEL_OPTION = typer.Option(
+    None,
+    "--hedge-model",
+    help="Faster model used for hedged requests (default: $B3TH_HEDGE_MODEL).",
+)
+
+TRACE_OPTION = typer.Option(
+    None,
+    "--trace",
+    dir_okay=False,
+    help="Append per-call telemetry (JSONL) to this file (default: $B3TH_TRACE).",
+)
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    no_stream: bool = NO_STREAM_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+    hedge_after: Optional[float] = HEDGE_AFTER_OPTION,
+    hedge_model: Optional[str] = HEDGE_MODEL_OPTION,
+    trace: Optional[Path] = TRACE_OPTION,
+) -> None:
+    """Generate AI-assisted commits, sync, and pull-requests."""
+    global _STREAM
+    _STREAM = not no_stream
+    llm_cache.set_enabled(False if no_cache else None)
+    llm.set_hedging(hedge_after, hedge_model)
+    telemetry.set_trace_path(trace)
+    # One repository probe per command, shared by every helper it calls
+    ctx.with_resource(git_utils.repo_scope())
+
+
+class _LiveEcho:
+    """
+    Token sink that prints LLM output as it streams in.
+
+    *header* is printed before the first token; ``started`` tells the caller
+    whether anything was shown (cached or non-streamed replies print nothing),
+    so it can fall back to echoing the parsed result.
+    """
+
+    def __init__(self, header: str | None = None) -> None:
+        self.header = header
+        self.started = False
+
+    def __call__(self, delta: str) -> None:
+        if not self.started:
+            self.started = True
+            if self.header is not None:
+                typer.echo(self.header)
+        typer.echo(delta, nl=False)
+
+    def live(self):
+        """Context manager routing LLM calls to this sink (no-op if disabled)."""
+        return llm.stream_to(self if _STREAM else None)
+
+    def finish(self) -> None:
+        """Terminate the streamed block with a newline."""
+        if self.started:
+            typer.echo()
+
+
+def _sync_step(args: list[str], repo: Path) -> int:
+    """Run one git step of `sync` in the terminal and return its exit code."""
+    try:
+        return GIT.run(args, cwd=repo, check=False, capture=False).returncode
+    except GitError as exc:  # timed out (B3TH_TIMEOUT_*) or could not start
+        typer.secho(str(exc), fg=typer.colors.RED)
+        return 1
 
 
 # sync  (stage → commit → push)
@@ -88,49 +191,54 @@ def sync(
         raise typer.Exit(1)
 
     # git add --all
-    res = subprocess.run(["git", "add", "--all"], cwd=repo)  # noqa: S603,S607
-    if res.returncode != 0:
+    code = _sync_step(["add", "--all"], repo)
+    if code != 0:
         typer.secho("git add failed.", fg=typer.colors.RED)
-        raise typer.Exit(res.returncode)
+        raise typer.Exit(code)
 
-    # Generate commit message
+    # Generate commit message (streamed to the terminal as it arrives)
+    echo = _LiveEcho("\nProposed commit message:")
     try:
-        subject, body = generate_commit_message(repo)
+        with echo.live():
+            subject, body = generate_commit_message(repo)
     except CommitMessageError as exc:
+        echo.finish()
         typer.secho(f"Error: {exc}", fg=typer.colors.RED)
         raise typer.Exit(1) from exc
 
-    typer.echo("\nProposed commit message:")
-    typer.echo(typer.style(subject, fg=typer.colors.GREEN, bold=True))
-    if body:
-        typer.echo("\n" + body)
+    if echo.started:
+        echo.finish()
+    else:
+        typer.echo("\nProposed commit message:")
+        typer.echo(typer.style(subject, fg=typer.colors.GREEN, bold=True))
+        if body:
+            typer.echo("\n" + body)
 
     if not yes and not typer.confirm("\nProceed with commit & push?"):
         typer.echo("Cancelled – nothing committed.")
         raise typer.Exit()
 
     # git commit
-    args: list[str] = ["git", "commit", "-m", subject]
+    args: list[str] = ["commit", "-m", subject]
     if body:
         args.extend(["-m", body])
 
-    res = subprocess.run(args, cwd=repo)  # noqa: S603,S607
-    if res.returncode != 0:
+    code = _sync_step(args, repo)
+    if code != 0:
         typer.secho("git commit failed.", fg=typer.colors.RED)
-        raise typer.Exit(res.returncode)
+        raise typer.Exit(code)
 
     # git push
     branch = get_current_branch(repo)
-    push_res = subprocess.run(
-        ["git", "push", "-u", "origin", "feat-x" if branch is None else branch],
-        cwd=repo,  # noqa: S603,S607
+    code = _sync_step(
+        ["push", "-u", "origin", "feat-x" if branch is None else branch], repo
     )
-    if push_res.returncode != 0:
+    if code != 0:
         typer.secho(
             "git push failed. Does 'origin' exist and is authentication set?",
             fg=typer.colors.RED,
         )
-        raise typer.Exit(push_res.returncode)
+        raise typer.Exit(code)
 
     typer.secho("💻 Synced! Commit pushed to origin.", fg=typer.colors.GREEN)
 
@@ -157,13 +265,35 @@ def stats(
         None,
         "--last",
         "-l",
-        help="Time-frame (e.g. 7d, 1m).",
+        help="Time-frame back from now (e.g. 7d, 1m), or several: 1d,7d,30d.",
     ),
+    by: Optional[str] = typer.Option(
+        None,
+        "--by",
+        "-b",
+        help="Break down by author, path (top-level directory), day or week.",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=0,
+        help="Scan history with N processes (0: one per CPU).",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print JSON."),
 ) -> None:
     """Show repository statistics."""
-    from .stats import print_stats  # local import to avoid CLI startup cost
+    from .stats import BY_CHOICES, print_stats  # local: avoid CLI startup cost
 
-    print_stats(repo, last=last)
+    if by is not None and by not in BY_CHOICES:
+        raise typer.BadParameter(
+            f"use one of: {', '.join(BY_CHOICES)}", param_hint="'--by'"
+        )
+    if by is not None and last is not None and "," in last:
+        raise typer.BadParameter(
+            "only one --last window with --by", param_hint="'--by'"
+        )
+    print_stats(repo, last=last, by=by, jobs=jobs, as_json=as_json)
 
 
 # summarize
@@ -173,8 +303,13 @@ def summarize(
     n: int = N_OPTION,
 ) -> None:
     """Summarize the last *n* commits."""
-    summary = summarize_commits(str(repo), n=n)
-    typer.echo(summary or "summarizer feature not implemented yet. 🚧")
+    echo = _LiveEcho()
+    with echo.live():
+        summary = summarize_commits(str(repo), n=n)
+    if echo.started:
+        echo.finish()
+    else:
+        typer.echo(summary or "summarizer feature not implemented yet. 🚧")
 
 
 # prdraft  – open a draft PR
@@ -189,15 +324,21 @@ def prdraft(
         typer.echo("Not inside a Git repository")
         raise typer.Exit(1)
 
+    echo = _LiveEcho("\nProposed draft PR:")
     try:
-        title, body = generate_pr_description(repo, base=base)
+        with echo.live():
+            title, body = generate_pr_description(repo, base=base)
     except PRDescriptionError as exc:
+        echo.finish()
         typer.secho(f"Error: {exc}", fg=typer.colors.RED)
         raise typer.Exit(1) from exc
 
-    typer.echo("\nProposed draft PR:")
-    typer.echo(typer.style(title, fg=typer.colors.GREEN, bold=True))
-    typer.echo("\n" + body)
+    if echo.started:
+        echo.finish()
+    else:
+        typer.echo("\nProposed draft PR:")
+        typer.echo(typer.style(title, fg=typer.colors.GREEN, bold=True))
+        typer.echo("\n" + body)
 
     if not yes and not typer.confirm("\nProceed to create *draft* PR on GitHub?"):
         typer.echo("Cancelled – no draft PR created.")
@@ -225,15 +366,21 @@ def prcreate(
         typer.echo("Not inside a Git repository")
         raise typer.Exit(1)
 
+    echo = _LiveEcho("\nProposed pull request:")
     try:
-        title, body = generate_pr_description(repo, base=base)
+        with echo.live():
+            title, body = generate_pr_description(repo, base=base)
     except PRDescriptionError as exc:
+        echo.finish()
         typer.secho(f"Error: {exc}", fg=typer.colors.RED)
         raise typer.Exit(1) from exc
 
-    typer.echo("\nProposed pull request:")
-    typer.echo(typer.style(title, fg=typer.colors.GREEN, bold=True))
-    typer.echo("\n" + body)
+    if echo.started:
+        echo.finish()
+    else:
+        typer.echo("\nProposed pull request:")
+        typer.echo(typer.style(title, fg=typer.colors.GREEN, bold=True))
+        typer.echo("\n" + body)
 
     if not yes and not typer.confirm("\nProceed to create PR on GitHub?"):
         typer.echo("Cancelled – no PR created.")
@@ -255,6 +402,7 @@ def resolve(  # noqa: D401
     repo: Path = REPO_ARG_READONLY,
     apply: bool = APPLY_OPTION,
     model: Optional[str] = MODEL_OPTION,
+    max_in_flight: Optional[int] = MAX_IN_FLIGHT_OPTION,
 ) -> None:
     """
     Generate merge-conflict resolutions using the configured LLM.
@@ -266,7 +414,7 @@ def resolve(  # noqa: D401
         raise typer.Exit()
 
     typer.echo("Detecting conflicts & asking Groq…")
-    out_paths = resolve_conflicts(repo, model=model)
+    out_paths = resolve_conflicts(repo, model=model, max_in_flight=max_in_flight)
 
     if not out_paths:
         typer.secho("No conflicts parsed — aborting.", fg=typer.colors.RED)
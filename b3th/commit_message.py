@@ -10,7 +10,7 @@ from __future__ import annotations
 import textwrap
 from pathlib import Path
 
-from . import git_utils, llm
+from . import git_utils, llm, prompt_budget
 
 
 class CommitMessageError(RuntimeError):
@@ -69,6 +69,13 @@ def generate_commit_message(
     if not diff.strip():
         raise CommitMessageError("No staged changes detected.")
 
+    # Keep huge diffs (vendored deps, regenerated lockfiles) inside the
+    # model's context window.
+    budget = prompt_budget.prompt_budget(
+        model, reply_tokens=max_tokens, overhead=_SYSTEM_PROMPT
+    )
+    diff = prompt_budget.fit_diff(diff, budget)
+
     try:
         response = llm.chat_completion(
             _build_messages(diff),
@@ -10,12 +10,15 @@ Credential precedence (highest → lowest):
 Supports:
 - GitHub token via env: GITHUB_TOKEN or GITHUB_PAT, or in TOML under [github].token
 - Groq API key via env: GROQ_API_KEY, or in TOML under [groq].api_key
+- Timeouts for external commands via env B3TH_TIMEOUT_<CLASS>, or in TOML
+  under [timeouts].<class> (see ``get_timeout``)
 """
 
 from __future__ import annotations
 
 import os
 from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -35,6 +38,24 @@ class ConfigError(RuntimeError):
     """Raised when a required configuration value is missing."""
 
 
+# Seconds each class of external command may run; None means no limit.
+# Every class is bounded by default so a stuck hook or credential prompt
+# cannot hang a CI runner; "none"/"off" opts out explicitly.
+#   read   – local git commands (status, diff, log, …)
+#   commit – git commands that run hooks or write the whole worktree
+#            (commit, merge, rebase, add, …)
+#   push   – git commands that talk to a remote (push, fetch, pull, …)
+#   gh     – GitHub API calls (REST or `gh api`)
+TIMEOUT_DEFAULTS: dict[str, float | None] = {
+    "read": 30.0,
+    "commit": 600.0,
+    "push": 600.0,
+    "gh": 30.0,
+}
+
+_NO_LIMIT = {"none", "off"}
+
+
 # --------------------------------------------------------------------------- #
 # Internal helpers
 # --------------------------------------------------------------------------- #
@@ -52,8 +73,18 @@ def _config_path() -> Path:
 def _load_config() -> Mapping[str, Any]:
     """Load the TOML config if it exists; otherwise return an empty mapping."""
     path = _config_path()
+    try:
+        stat = path.stat()
+    except OSError:
+        return {}
     if not path.is_file():
         return {}
+    # Parsed once per file version; every git call looks up its timeout.
+    return _parse_config(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _parse_config(path: Path, _mtime_ns: int, _size: int) -> Mapping[str, Any]:
     try:
         with path.open("rb") as fh:
             return tomllib.load(fh)
@@ -61,6 +92,11 @@ def _load_config() -> Mapping[str, Any]:
         return {}
 
 
+def clear_config_cache() -> None:
+    """Forget parsed config files (e.g. between tests)."""
+    _parse_config.cache_clear()
+
+
 def _from_toml(section: str, key: str) -> str | None:
     """Fetch a string value from the TOML config at [section].key."""
     cfg = _load_config()
@@ -149,3 +185,33 @@ def get_groq_key(required: bool = True) -> str | None:
             f"{_config_path()}."
         )
     return None
+
+
+def get_timeout(kind: str) -> float | None:
+    """
+    Return the timeout in seconds for a class of external commands.
+
+    Sources (in order): env B3TH_TIMEOUT_<KIND> → TOML [timeouts].<kind> →
+    ``TIMEOUT_DEFAULTS``. ``0``, ``none`` or ``off`` mean no limit; values
+    that aren't numbers are ignored.
+
+    Raises
+    ------
+    KeyError
+        If *kind* is not one of ``TIMEOUT_DEFAULTS``.
+    """
+    default = TIMEOUT_DEFAULTS[kind]
+    for raw in (
+        os.getenv(f"B3TH_TIMEOUT_{kind.upper()}"),
+        _from_toml("timeouts", kind),
+    ):
+        if raw is None or not raw.strip():
+            continue
+        if raw.strip().lower() in _NO_LIMIT:
+            return None
+        try:
+            seconds = float(raw)
+        except ValueError:
+            continue
+        return seconds if seconds > 0 else None
+    return default
@@ -6,28 +6,34 @@ Public API
 list_conflicted_files(repo)        -> list[Path]
 extract_conflict_hunks(path)       -> list[dict]
 build_resolution_prompt(repo)      -> str | None
-resolve_conflicts(repo, model=…)   -> list[Path] 
+resolve_conflicts(repo, model=…)   -> list[Path]
 """
 
 from __future__ import annotations
 
+import asyncio
 import re
 from pathlib import Path
 
-from .git_utils import _run_git  # low-level helper
-from .llm import chat_completion  # Groq wrapper
+from .git_utils import GitError, conflicted_files
+from .llm import achat_completion, gather_limited  # Groq wrapper
 
-# 1. Locate conflicted files
-_CONFLICT_MARKER = "<<<<<<< "  # Git always adds a space after <<<<<<<
 
+# 1. Locate conflicted files
+def list_conflicted_files(
+    repo: str | Path = ".", *, scan_markers: bool | None = None
+) -> list[Path]:
+    """
+    Return the files Git left unmerged (and that still exist in the tree).
 
-def list_conflicted_files(repo: str | Path = ".") -> list[Path]:
-    """Return a list of *tracked* files that still have conflict markers."""
+    With *scan_markers* (default: ``$B3TH_CONFLICT_MARKERS``) tracked files
+    containing conflict markers are added as well.
+    """
     try:
-        raw = _run_git(["grep", "-l", _CONFLICT_MARKER, "--", "."], cwd=repo)
-        return [Path(repo, p) for p in raw.splitlines()] if raw else []
-    except Exception:  # noqa: BLE001 – GitError / not-repo
+        names = conflicted_files(repo, scan_markers=scan_markers)
+    except GitError:  # not a repository
         return []
+    return [Path(repo, n) for n in names if Path(repo, n).is_file()]
 
 
 # 2. Parse hunks from a given file
@@ -96,31 +102,57 @@ def build_resolution_prompt(repo: str | Path = ".") -> str | None:
 
 
 # 4. NEW – Ask Groq & write <file>.resolved
+def _file_prompt(path: Path, hunks: list[dict[str, str]]) -> str:
+    """Build the per-file prompt (smaller ⇒ cheaper tokens)."""
+    prompt_lines = [_PROMPT_HEADER, f"## File: `{Path(path).name}`"]
+    for i, h in enumerate(hunks, 1):
+        prompt_lines.append(_format_hunk(i, h))
+    return "\n\n".join(prompt_lines)
+
+
 def resolve_conflicts(
     repo: str | Path = ".",
     *,
     model: str | None = None,
+    max_in_flight: int | None = None,
+    scan_markers: bool | None = None,
 ) -> list[Path]:
     """
     For every conflicted file in *repo* call the LLM and write `<file>.resolved`.
 
+    Files are sent to the LLM concurrently, at most *max_in_flight* at a time
+    (default ``B3TH_LLM_CONCURRENCY``), so wall-clock time tracks the slowest
+    file rather than the sum. If any call fails, the successful files are
+    still written before the first error is re-raised.
+
     Returns the list of generated `.resolved` paths.
     """
-    resolved_paths: list[Path] = []
-    for f in list_conflicted_files(repo):
+    jobs: list[tuple[Path, str]] = []
+    for f in list_conflicted_files(repo, scan_markers=scan_markers):
         hunks = extract_conflict_hunks(f)
-        if not hunks:
-            continue
+        if hunks:
+            jobs.append((f, _file_prompt(f, hunks)))
+    if not jobs:
+        return []
 
-        # Build per-file prompt (smaller ⇒ cheaper tokens)
-        prompt_lines = [_PROMPT_HEADER, f"## File: `{Path(f).name}`"]
-        for i, h in enumerate(hunks, 1):
-            prompt_lines.append(_format_hunk(i, h))
-        prompt = "\n\n".join(prompt_lines)
+    replies = asyncio.run(
+        gather_limited(
+            (achat_completion(prompt, model=model) for _f, prompt in jobs),
+            limit=max_in_flight,
+            return_exceptions=True,
+        )
+    )
 
-        merged_text: str = chat_completion(prompt, model=model)  # type: ignore[arg-type]
+    resolved_paths: list[Path] = []
+    first_error: BaseException | None = None
+    for (f, _prompt), merged_text in zip(jobs, replies):
+        if isinstance(merged_text, BaseException):
+            first_error = first_error or merged_text
+            continue
         out_path = f.with_suffix(f.suffix + ".resolved")
         Path(out_path).write_text(merged_text.rstrip() + "\n")
         resolved_paths.append(out_path)
 
+    if first_error is not None:
+        raise first_error
     return resolved_paths
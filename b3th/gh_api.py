@@ -13,14 +13,24 @@ import os
 import re
 import shutil
 import subprocess
+import time
 from collections.abc import Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 import requests
 
-from .config import ConfigError, get_github_token
-from .git_utils import get_current_branch, is_git_repo
+from . import telemetry
+from .config import ConfigError, get_github_token, get_timeout
+from .git_utils import (
+    GIT,
+    GitError,
+    get_current_branch,
+    is_git_repo,
+    scoped_repo_context,
+)
+from .process import run_process
 
 
 # Exceptions
@@ -32,17 +42,24 @@ class GitRepoError(RuntimeError):
     """Raised when local git operations fail."""
 
 
+@dataclass
+class GhCall:
+    """One GitHub API request, as reported to ``telemetry`` hooks."""
+
+    kind: ClassVar[str] = "gh"
+
+    path: str
+    transport: str  # "rest" (requests + token) or "cli" (`gh api`)
+    started: float = field(default_factory=time.time)  # epoch seconds
+    wall_s: float = 0.0
+    status: int | None = None  # HTTP status, or the exit code of `gh`
+    timeout_s: float | None = None
+    timed_out: bool = False
+
+
 # --------------------------------------------------------------------------- #
 # Executable resolvers (avoid S607 by using absolute paths)
 # --------------------------------------------------------------------------- #
-def _git_exe() -> str:
-    """Return absolute path to the git executable."""
-    path = shutil.which("git")
-    if not path:
-        raise GitRepoError("git executable not found in PATH")
-    return path
-
-
 def _gh_exe() -> str:
     """Return absolute path to the GitHub CLI executable."""
     path = shutil.which("gh")
@@ -55,16 +72,11 @@ def _gh_exe() -> str:
 # Internal: git helpers
 # --------------------------------------------------------------------------- #
 def _run_git(args: list[str], cwd: Path | str | None = None) -> str:
-    """Run `git <args>` and return stdout (strip newline)."""
-    result = subprocess.run(  # noqa: S603 (intentional external command)
-        [_git_exe(), *args],
-        cwd=cwd,
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise GitRepoError(result.stderr.strip() or f"git {' '.join(args)} failed")
-    return result.stdout.strip()
+    """Run `git <args>` via the shared runner and return stdout (strip newline)."""
+    try:
+        return GIT.output(args, cwd=cwd)
+    except GitError as exc:
+        raise GitRepoError(str(exc)) from exc
 
 
 def _slug_from_remote(url: str) -> str:
@@ -95,6 +107,9 @@ def _slug_from_remote(url: str) -> str:
 
 def _get_repo_slug(path: str | Path) -> str:
     """Return ``owner/repo`` for the given working tree."""
+    ctx = scoped_repo_context(path)
+    if ctx is not None and ctx.origin_url:
+        return _slug_from_remote(ctx.origin_url)
     remote_url = _run_git(["config", "--get", "remote.origin.url"], cwd=path)
     return _slug_from_remote(remote_url)
 
@@ -129,10 +144,24 @@ def _requests_post(path: str, payload: Mapping[str, Any], token: str | None) ->
     """POST using requests with optional PAT auth."""
     url = f"{_api_base().rstrip('/')}/{path.lstrip('/')}"
     headers = _auth_headers(token)
+    record = GhCall(path=path, transport="rest", timeout_s=get_timeout("gh"))
+    start = time.perf_counter()
     try:
-        resp = requests.post(url, headers=headers, json=payload, timeout=30)
+        resp = requests.post(
+            url, headers=headers, json=payload, timeout=record.timeout_s
+        )
+    except requests.Timeout as exc:
+        record.timed_out = True
+        raise GitHubAPIError(
+            f"GitHub did not answer within {record.timeout_s}s"
+        ) from exc
     except requests.RequestException as exc:
         raise GitHubAPIError(f"Network error calling GitHub: {exc}") from exc
+    else:
+        record.status = resp.status_code
+    finally:
+        record.wall_s = time.perf_counter() - start
+        telemetry.emit(record)
 
     if resp.status_code not in (200, 201):
         # Try to surface GitHub's message when possible
@@ -165,12 +194,22 @@ def _gh_cli_post(path: str, payload: Mapping[str, Any]) -> dict:
         "--input",
         "-",  # read JSON body from stdin
     ]
-    proc = subprocess.run(  # noqa: S603 (intentional external command)
-        cmd,
-        input=json.dumps(payload),
-        text=True,
-        capture_output=True,
-    )
+    record = GhCall(path=path, transport="cli", timeout_s=get_timeout("gh"))
+    start = time.perf_counter()
+    try:
+        proc = run_process(
+            cmd, input=json.dumps(payload), timeout=record.timeout_s, new_group=True
+        )
+    except subprocess.TimeoutExpired as exc:
+        record.timed_out = True
+        raise GitHubAPIError(
+            f"`gh api {path}` timed out after {record.timeout_s}s"
+        ) from exc
+    else:
+        record.status = proc.returncode
+    finally:
+        record.wall_s = time.perf_counter() - start
+        telemetry.emit(record)
     if proc.returncode != 0:
         raise GitHubAPIError(proc.stderr.strip() or f"`gh api {path}` failed")
     try:
@@ -0,0 +1,306 @@
+"""
+git_index.py – read-only parser for ``.git/index`` (versions 2, 3 and 4).
+
+    index = GitIndex.load(".")
+    index.paths        # every entry, in index order
+    index.unmerged()   # {path: {stage: oid}}
+
+The file is read through mmap; an entry is kept as its offset (in an
+``array``) plus its raw path rather than as a Python object, and
+``IndexEntry`` tuples are built only on request. Optional extensions are
+skipped, except the cache-tree root, which tells whether the index still
+matches a tree. Indexes this reader can't represent faithfully (split or
+sparse indexes, unknown required extensions, SHA-256 repositories) raise
+``IndexFormatError`` so callers can fall back to git.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+
+class IndexFormatError(RuntimeError):
+    """Raised when the index can't be parsed in-process."""
+
+
+_SIGNATURE = b"DIRC"
+_HEADER = struct.Struct(">4sII")  # signature, version, entry count
+# ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size, oid, flags
+_ENTRY = struct.Struct(">10I20sH")
+_MODE_FIELD, _SIZE_FIELD, _OID_FIELD, _FLAGS_FIELD = 6, 9, 10, 11
+_FLAGS = struct.Struct(">H")
+_FLAGS_OFFSET = _ENTRY.size - _FLAGS.size
+_OID_LEN = 20
+_OID_OFFSET = _FLAGS_OFFSET - _OID_LEN
+_TRAILER = 20  # SHA-1 checksum of everything before it
+
+_NAME_MASK = 0x0FFF
+_STAGE_MASK = 0x3000
+_EXTENDED = 0x4000
+
+
+class IndexEntry(NamedTuple):
+    """One entry of the index."""
+
+    path: str
+    oid: str
+    mode: int
+    stage: int  # 0 = merged; 1/2/3 = base/ours/theirs
+    size: int
+
+
+# --------------------------------------------------------------------------- #
+# Repository layout
+# --------------------------------------------------------------------------- #
+def find_repo(path: str | Path = ".") -> tuple[Path | None, Path] | None:
+    """
+    Return ``(worktree, git_dir)`` for *path* without running git.
+
+    *worktree* is ``None`` for a bare repository; the result is ``None``
+    when *path* is not inside a repository.
+    """
+    start = Path(path).resolve()
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return directory, dot_git
+        if dot_git.is_file():  # linked worktree / submodule: "gitdir: <path>"
+            text = dot_git.read_text(encoding="utf-8").strip()
+            if text.startswith("gitdir:"):
+                git_dir = (directory / text[len("gitdir:") :].strip()).resolve()
+                return directory, git_dir
+        if (directory / "objects").is_dir() and (directory / "HEAD").is_file():
+            return None, directory  # bare repository
+    return None
+
+
+def _varint(data: bytes | mmap.mmap, pos: int) -> tuple[int, int]:
+    """Decode the offset varint used by index v4 path compression."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+# --------------------------------------------------------------------------- #
+# Index
+# --------------------------------------------------------------------------- #
+class GitIndex:
+    """
+    Parsed contents of one index file (a snapshot; it never re-reads).
+
+    Parsing walks the entries once, keeping each entry's offset and raw
+    path; modes, sizes and object ids are read from the mapping on demand.
+    Use as a context manager (or call ``close``) to release the mapping.
+    """
+
+    def __init__(self, data: bytes | mmap.mmap) -> None:
+        if len(data) < _HEADER.size + _TRAILER:
+            raise IndexFormatError("index file too short")
+        signature, version, count = _HEADER.unpack_from(data, 0)
+        if signature != _SIGNATURE:
+            raise IndexFormatError("not an index file")
+        if version not in (2, 3, 4):
+            raise IndexFormatError(f"unsupported index version {version}")
+
+        self.version = version
+        self._data = data
+        self._offsets = array("Q")
+        self._raw_paths: list[bytes] = []
+        self._paths: list[str] | None = None
+        self._stages_seen = 0  # OR of every entry's stage bits
+        self.tree_oid: str | None = None  # cache-tree root, if still valid
+
+        end = self._read_entries(count)
+        self._read_extensions(end)
+
+    @classmethod
+    def load(cls, repo: str | Path = ".") -> GitIndex:
+        """Read the index of the repository containing *repo*."""
+        return cls.from_file(index_path(repo))
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> GitIndex:
+        """Read the index file at *path*."""
+        try:
+            with open(path, "rb") as fh:
+                data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:  # missing, unreadable or empty
+            raise IndexFormatError(f"cannot read {path}: {exc}") from exc
+        try:
+            return cls(data)
+        except (IndexError, struct.error) as exc:
+            data.close()
+            raise IndexFormatError(f"truncated index {path}") from exc
+        except IndexFormatError:
+            data.close()
+            raise
+
+    def close(self) -> None:
+        """Release the file mapping; the parsed paths stay usable."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self) -> GitIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- parsing ------------------------------------------------------------- #
+    def _read_entries(self, count: int) -> int:
+        # The hot loop: one flags read and one path slice per entry.
+        data = self._data
+        flags_at = _FLAGS.unpack_from
+        find = data.find
+        record = self._offsets.append
+        keep = self._raw_paths.append
+        v4 = self.version == 4
+        previous = b""
+        seen = 0
+        pos = _HEADER.size
+        for _ in range(count):
+            (flags,) = flags_at(data, pos + _FLAGS_OFFSET)
+            seen |= flags
+            record(pos)
+            name = pos + _ENTRY.size + (2 if flags & _EXTENDED else 0)
+            if v4:  # prefix-compressed path, no padding
+                strip, name = _varint(data, name)
+                end = find(b"\0", name)
+                path = previous[: len(previous) - strip] + data[name:end]
+                previous = path
+                next_pos = end + 1
+            else:
+                length = flags & _NAME_MASK
+                end = name + length if length < _NAME_MASK else find(b"\0", name)
+                path = data[name:end]
+                next_pos = pos + ((end - pos + 8) & ~7)  # 1-8 NULs pad to 8
+            if end < 0:
+                raise IndexFormatError("unterminated path in index")
+            keep(path)
+            pos = next_pos
+        self._stages_seen = seen & _STAGE_MASK
+        return pos
+
+    def _read_extensions(self, pos: int) -> None:
+        data = self._data
+        end = len(data) - _TRAILER
+        while pos + 8 <= end:
+            signature = bytes(data[pos : pos + 4])
+            (size,) = struct.unpack_from(">I", data, pos + 4)
+            body = pos + 8
+            if signature == b"TREE":
+                self.tree_oid = self._cache_tree_root(data, body)
+            elif not b"A" <= signature[:1] <= b"Z":
+                # Lower-case signatures are required extensions ("link" for
+                # split indexes, "sdir" for sparse ones): we can't ignore them.
+                name = signature.decode("ascii", "replace")
+                raise IndexFormatError(f"unsupported index extension {name!r}")
+            pos = body + size
+        if pos != end:
+            raise IndexFormatError("corrupt index extensions")
+
+    @staticmethod
+    def _cache_tree_root(data: bytes | mmap.mmap, pos: int) -> str | None:
+        """Return the root tree oid of the cache-tree, if it is valid."""
+        if data[pos] != 0:  # root entry has an empty path
+            return None
+        line_end = data.find(b"\n", pos)
+        count, _subtrees = data[pos + 1 : line_end].split(b" ")
+        if int(count) < 0:  # invalidated by a later `git add`
+            return None
+        return data[line_end + 1 : line_end + 1 + _OID_LEN].hex()
+
+    # -- queries ------------------------------------------------------------- #
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @property
+    def paths(self) -> list[str]:
+        """Entry paths (relative to the worktree root, ``/``-separated)."""
+        if self._paths is None:
+            self._paths = [
+                p.decode("utf-8", "surrogateescape") for p in self._raw_paths
+            ]
+        return self._paths
+
+    def _stage(self, i: int) -> int:
+        (flags,) = _FLAGS.unpack_from(self._data, self._offsets[i] + _FLAGS_OFFSET)
+        return (flags & _STAGE_MASK) >> 12
+
+    def oid(self, i: int) -> str:
+        """Hex object id of entry *i*."""
+        start = self._offsets[i] + _OID_OFFSET
+        return self._data[start : start + _OID_LEN].hex()
+
+    def entry(self, i: int) -> IndexEntry:
+        """Return entry *i* as an ``IndexEntry``."""
+        fields = _ENTRY.unpack_from(self._data, self._offsets[i])
+        return IndexEntry(
+            self.paths[i],
+            fields[_OID_FIELD].hex(),
+            fields[_MODE_FIELD],
+            (fields[_FLAGS_FIELD] & _STAGE_MASK) >> 12,
+            fields[_SIZE_FIELD],
+        )
+
+    def __iter__(self) -> Iterator[IndexEntry]:
+        return (self.entry(i) for i in range(len(self)))
+
+    def has_unmerged(self, prefix: str = "") -> bool:
+        """True if any entry (under *prefix*) is at a conflict stage."""
+        if not prefix:
+            return bool(self._stages_seen)
+        return bool(self.unmerged(prefix))
+
+    def unmerged(self, prefix: str = "") -> dict[str, dict[int, str]]:
+        """
+        Map each conflicted path to its stage blobs, like ``git ls-files -u``.
+
+        Only paths under *prefix* (``"dir/"``) are returned, relative to it.
+        """
+        out: dict[str, dict[int, str]] = {}
+        if not self._stages_seen:
+            return out
+        paths = self.paths
+        for i in range(len(self)):
+            stage = self._stage(i)
+            if stage and paths[i].startswith(prefix):
+                out.setdefault(paths[i][len(prefix) :], {})[stage] = self.oid(i)
+        return out
+
+
+def index_path(repo: str | Path = ".") -> Path:
+    """Return the index file git would use for *repo* (honours GIT_INDEX_FILE)."""
+    if env := os.getenv("GIT_INDEX_FILE"):
+        return Path(repo, env)
+    found = find_repo(repo)
+    if found is None:
+        raise IndexFormatError(f"{repo} is not a Git repository")
+    worktree, git_dir = found
+    if worktree is None:
+        raise IndexFormatError("bare repositories have no index")
+    if _uses_sha256(git_dir):
+        raise IndexFormatError("SHA-256 repositories are not supported")
+    return git_dir / "index"  # linked worktrees: their own git dir's index
+
+
+def _uses_sha256(git_dir: Path) -> bool:
+    common = git_dir
+    if (git_dir / "commondir").is_file():
+        common = git_dir / (git_dir / "commondir").read_text("utf-8").strip()
+    config = common / "config"
+    if not config.is_file():
+        return False
+    text = config.read_text("utf-8", "replace").lower().replace(" ", "")
+    return "objectformat=sha256" in text
@@ -3,45 +3,408 @@ Low-level helpers for interacting with Git.
 
 These utilities are deliberately minimal and shell out to the local `git`
 binary so that higher-level code can stay Python-only.
+
+Every git invocation goes through one ``GitRunner`` (the shared ``GIT``
+instance): a cached executable path, a fixed environment (``LC_ALL=C``,
+``GIT_OPTIONAL_LOCKS=0``, no pager), per-call timeouts, and a telemetry
+record (``kind: "git"``) with the duration and exit code of each call.
+Output that grows with history (``git log --numstat`` …) is streamed with
+``iter_git`` rather than buffered by ``run_git``. ``get_staged_diff`` scans
+``--numstat`` first and fetches only the patches worth reading, up to a
+byte budget (``DiffPolicy``).
+
+Index questions (unmerged stages, tracked files, "is anything staged?") are
+answered by parsing ``.git/index`` in-process (``git_index``) and fall back
+to git for index formats that parser doesn't cover.
+
+Object reads go through a long-lived ``git cat-file --batch`` process per
+repository (``read_object`` / ``read_many``), so reading many blobs or
+commits costs a pipe round-trip each instead of a fork/exec; with
+``B3TH_OBJECT_STORE=1`` they are served in-process by ``object_store`` when
+possible.
 """
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import os
 import shutil
+import signal
 import subprocess
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
 from pathlib import Path
+from typing import IO, ClassVar, NamedTuple
+
+from . import telemetry
+from .config import get_timeout
+from .git_index import GitIndex, IndexFormatError, find_repo, index_path
+from .process import astop, group_kwargs, run_process, stop
 
 
 class GitError(RuntimeError):
     """Raised when an underlying git command fails."""
 
 
-def _git_exe() -> str:
+# --------------------------------------------------------------------------- #
+# Git runner
+# --------------------------------------------------------------------------- #
+# Subcommands by timeout class (config.get_timeout); everything else is
+# "read". Network commands may also prompt for credentials and hook-running
+# ones for a signing passphrase; `add` hashes a whole (possibly huge)
+# worktree in `sync`.
+_PUSH_COMMANDS = frozenset({"push", "fetch", "pull", "clone", "ls-remote"})
+_COMMIT_COMMANDS = frozenset(
+    {"commit", "merge", "rebase", "am", "cherry-pick", "revert", "add"}
+)
+
+# Stable, parseable, non-blocking git: English messages, no index.lock
+# taken by read-only commands (status), no pager.
+_GIT_ENV = {
+    "LC_ALL": "C",
+    "GIT_OPTIONAL_LOCKS": "0",
+    "GIT_PAGER": "cat",
+    "PAGER": "cat",
+}
+
+_USE_DEFAULT: float = -1.0  # sentinel: pick the timeout from the subcommand
+
+_TRUTHY = {"1", "true", "yes"}  # accepted values for on/off env knobs
+
+_ITER_CHUNK = 64 * 1024  # bytes read per pipe read in GitRunner.stream
+
+_DEFAULT_GIT_CONCURRENCY = 8  # git processes in flight for GitRunner.arun
+
+
+def command_class(args: list[str]) -> str:
+    """Return the timeout class of `git <args>`: "read", "commit" or "push"."""
+    sub = args[0] if args else ""
+    if sub in _PUSH_COMMANDS:
+        return "push"
+    if sub in _COMMIT_COMMANDS:
+        return "commit"
+    return "read"
+
+
+def _timeout_for(args: list[str], timeout: float | None) -> float | None:
+    """Resolve the ``_USE_DEFAULT`` timeout from the subcommand's class."""
+    if timeout != _USE_DEFAULT:
+        return timeout
+    return get_timeout(command_class(args))
+
+
+def _own_group(args: list[str]) -> bool:
+    """
+    Whether `git <args>` runs in its own process group.
+
+    Its own group lets a timeout or Ctrl-C stop git's helpers too, but cuts
+    git off from the terminal; commands that may prompt there stay in the
+    terminal's group when there is a terminal.
     """
-    Return the absolute path to the `git` executable.
+    if command_class(args) == "read":
+        return True
+    return not (sys.stdin is not None and sys.stdin.isatty())
+
+
+def _git_concurrency() -> int:
+    try:
+        return max(1, int(os.getenv("B3TH_GIT_CONCURRENCY", _DEFAULT_GIT_CONCURRENCY)))
+    except ValueError:
+        return _DEFAULT_GIT_CONCURRENCY
+
+
+@dataclass
+class GitCall:
+    """One git invocation, as reported to ``telemetry`` hooks."""
+
+    kind: ClassVar[str] = "git"
 
-    Using an absolute path avoids Ruff's S607 warning about a partial
-    executable path, and is generally safer.
+    args: list[str]
+    cwd: str | None = None
+    started: float = field(default_factory=time.time)  # epoch seconds
+    wall_s: float = 0.0
+    returncode: int | None = None
+    timeout_s: float | None = None  # the limit applied (None: unbounded)
+    timed_out: bool = False
+
+
+class GitRunner:
     """
-    path = shutil.which("git")
-    if not path:
-        raise GitError("git executable not found in PATH")
-    return path
+    Single entry point for running git.
+
+    Resolves the executable once, runs every command with the same
+    environment, enforces a per-call timeout (by command class, see
+    ``config.get_timeout``), stops git together with its helpers on timeout
+    or Ctrl-C (``process``) and emits a ``GitCall`` record for each
+    invocation.
+    """
+
+    def __init__(self) -> None:
+        self._exe: str | None = None
+        self._slots: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def exe(self) -> str:
+        """Absolute path to `git` (resolved on first use, then cached)."""
+        if self._exe is None:
+            path = shutil.which("git")
+            if not path:
+                raise GitError("git executable not found in PATH")
+            self._exe = path
+        return self._exe
+
+    @staticmethod
+    def env() -> dict[str, str]:
+        """Return the environment git commands run with."""
+        return {**os.environ, **_GIT_ENV}
+
+    def run(
+        self,
+        args: list[str],
+        *,
+        cwd: Path | str | None = None,
+        timeout: float | None = _USE_DEFAULT,
+        check: bool = True,
+        capture: bool = True,
+        input: str | None = None,  # noqa: A002 (mirrors subprocess)
+    ) -> subprocess.CompletedProcess[str]:
+        """
+        Run `git <args>` and return the completed process.
+
+        With *check*, a non-zero exit raises ``GitError`` carrying stderr.
+        *capture* = False lets output go straight to the terminal (e.g. push
+        progress). A timeout always raises ``GitError``; Ctrl-C stops git
+        and re-raises ``KeyboardInterrupt``.
+        """
+        timeout = _timeout_for(args, timeout)
+        record = GitCall(
+            args=list(args), cwd=None if cwd is None else str(cwd), timeout_s=timeout
+        )
+        start = time.perf_counter()
+        try:
+            result = run_process(
+                [self.exe, *args],
+                cwd=cwd,
+                env=self.env(),
+                input=input,
+                capture=capture,
+                timeout=timeout,
+                new_group=_own_group(args),
+            )
+        except subprocess.TimeoutExpired as exc:
+            record.timed_out = True
+            raise GitError(f"git {' '.join(args)} timed out after {timeout}s") from exc
+        except OSError as exc:  # e.g. cwd does not exist
+            raise GitError(f"cannot run git {' '.join(args)}: {exc}") from exc
+        else:
+            record.returncode = result.returncode
+        finally:
+            record.wall_s = time.perf_counter() - start
+            telemetry.emit(record)
+
+        if check and result.returncode != 0:
+            stderr = (result.stderr or "").strip()
+            raise GitError(stderr or f"git {' '.join(args)} failed")
+        return result
+
+    def output(
+        self,
+        args: list[str],
+        *,
+        cwd: Path | str | None = None,
+        timeout: float | None = _USE_DEFAULT,
+    ) -> str:
+        """Run `git <args>` and return stripped stdout, raising GitError on failure."""
+        return (self.run(args, cwd=cwd, timeout=timeout).stdout or "").strip()
+
+    async def arun(
+        self,
+        args: list[str],
+        *,
+        cwd: Path | str | None = None,
+        timeout: float | None = _USE_DEFAULT,
+        check: bool = True,
+    ) -> subprocess.CompletedProcess[str]:
+        """
+        Async counterpart of ``run()`` (output is always captured).
+
+        Uses ``asyncio.create_subprocess_exec``, so independent queries can be
+        awaited together; at most ``B3TH_GIT_CONCURRENCY`` (default 8) git
+        processes per event loop run at once. Cancelling the call stops git
+        (and its process group) as Ctrl-C would.
+        """
+        timeout = _timeout_for(args, timeout)
+        new_group = _own_group(args)
+        async with self._async_slots():
+            record = GitCall(
+                args=list(args),
+                cwd=None if cwd is None else str(cwd),
+                timeout_s=timeout,
+            )
+            start = time.perf_counter()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    self.exe,
+                    *args,
+                    cwd=cwd,
+                    env=self.env(),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    **group_kwargs(new_group),
+                )
+                try:
+                    out, err = await asyncio.wait_for(proc.communicate(), timeout)
+                except BaseException as exc:  # timeout or cancellation
+                    sig = signal.SIGINT
+                    if isinstance(exc, asyncio.TimeoutError):
+                        sig = signal.SIGTERM
+                    await astop(proc, new_group=new_group, sig=sig)
+                    raise
+            except asyncio.TimeoutError as exc:
+                record.timed_out = True
+                raise GitError(
+                    f"git {' '.join(args)} timed out after {timeout}s"
+                ) from exc
+            except OSError as exc:
+                raise GitError(f"cannot run git {' '.join(args)}: {exc}") from exc
+            else:
+                record.returncode = proc.returncode
+            finally:
+                record.wall_s = time.perf_counter() - start
+                telemetry.emit(record)
+
+        stdout = out.decode("utf-8", "replace")
+        stderr = err.decode("utf-8", "replace")
+        if check and proc.returncode != 0:
+            raise GitError(stderr.strip() or f"git {' '.join(args)} failed")
+        return subprocess.CompletedProcess(
+            [self.exe, *args], proc.returncode or 0, stdout, stderr
+        )
+
+    def _async_slots(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; each asyncio.run() gets its own.
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(_git_concurrency())
+        return slots
+
+    def stream(
+        self,
+        args: list[str],
+        *,
+        cwd: Path | str | None = None,
+        sep: str = "\n",
+        input: str | None = None,  # noqa: A002 (mirrors subprocess)
+    ) -> Iterator[str]:
+        """
+        Run `git <args>` and yield its output one record at a time.
+
+        Records are split on *sep* (``"\n"``, or ``"\0"`` for ``-z``
+        output) and decoded as UTF-8, so memory stays bounded by the longest
+        record however much git prints. git blocks on the pipe while the
+        consumer is busy. *input* (e.g. revisions for ``--stdin``) is fed
+        from a side thread. A non-zero exit raises ``GitError`` (with
+        stderr) once the output is exhausted; closing the generator early
+        stops git. No timeout applies: the caller controls the pace.
+        """
+        record = GitCall(args=list(args), cwd=None if cwd is None else str(cwd))
+        new_group = _own_group(args)
+        start = time.perf_counter()
+        try:
+            proc = subprocess.Popen(  # noqa: S603 (intentional external command)
+                [self.exe, *args],
+                cwd=cwd,
+                env=self.env(),
+                stdin=None if input is None else subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                **group_kwargs(new_group),
+            )
+        except OSError as exc:
+            record.wall_s = time.perf_counter() - start
+            telemetry.emit(record)
+            raise GitError(f"cannot run git {' '.join(args)}: {exc}") from exc
+
+        # stderr is drained on the side so a chatty git can't fill that pipe
+        # and stall while we wait on stdout.
+        errors: deque[bytes] = deque(maxlen=64)
+        drain = threading.Thread(
+            target=lambda: errors.extend(iter(proc.stderr.readline, b"")),
+            daemon=True,
+        )
+        drain.start()
+        if input is not None:
+            threading.Thread(
+                target=_feed, args=(proc.stdin, input.encode()), daemon=True
+            ).start()
+        delimiter = sep.encode()
+        finished = False
+        try:
+            # Only newly read bytes (plus a delimiter's worth of overlap) are
+            # searched, and the buffer is trimmed only after a record ends,
+            # so a long record costs linear time however many reads it spans.
+            pending = bytearray()
+            while chunk := proc.stdout.read1(_ITER_CHUNK):
+                pos = max(0, len(pending) - len(delimiter) + 1)
+                pending += chunk
+                start = 0
+                while (end := pending.find(delimiter, pos)) != -1:
+                    yield pending[start:end].decode("utf-8", "replace")
+                    start = pos = end + len(delimiter)
+                if start:
+                    del pending[:start]
+            if pending:
+                yield pending.decode("utf-8", "replace")
+            finished = True
+        finally:
+            if not finished and proc.poll() is None:
+                stop(proc, new_group=new_group)  # consumer stopped early (or raised)
+            proc.stdout.close()
+            record.returncode = proc.wait()
+            drain.join()
+            proc.stderr.close()
+            record.wall_s = time.perf_counter() - start
+            telemetry.emit(record)
+
+        if record.returncode != 0:
+            stderr = b"".join(errors).decode("utf-8", "replace").strip()
+            raise GitError(stderr or f"git {' '.join(args)} failed")
+
+
+def _feed(pipe: IO[bytes], data: bytes) -> None:
+    """Write *data* to a child's stdin and close it (it may exit early)."""
+    try:
+        pipe.write(data)
+        pipe.close()
+    except (BrokenPipeError, ValueError):
+        pass
+
+
+# Process-wide runner used by every module
+GIT = GitRunner()
+
+
+def _git_exe() -> str:
+    """Return the absolute path to the `git` executable (cached)."""
+    return GIT.exe
 
 
 # Internal helper
 def _run_git(args: list[str], cwd: Path | str | None = None) -> str:
     """Run `git <args>` and return stdout, raising GitError on failure."""
-    result = subprocess.run(  # noqa: S603 (intentional external command)
-        [_git_exe(), *args],
-        cwd=cwd,
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
-    if result.returncode != 0:
-        raise GitError(result.stderr.strip() or f"git {' '.join(args)} failed")
-    return result.stdout.strip()
+    return GIT.output(args, cwd=cwd)
 
 
 # Public convenience wrapper
@@ -55,11 +418,168 @@ def run_git(args: list[str], cwd: Path | str | None = None) -> str:
     return _run_git(args, cwd=cwd)
 
 
+async def arun_git(args: list[str], cwd: Path | str | None = None) -> str:
+    """
+    Async ``run_git``: run `git <args>` and return stripped stdout.
+
+    Await several together (``asyncio.gather``) to overlap independent
+    queries; see ``GitRunner.arun`` for the concurrency cap.
+    """
+    return ((await GIT.arun(args, cwd=cwd)).stdout or "").strip()
+
+
+def iter_git(
+    args: list[str],
+    cwd: Path | str | None = None,
+    *,
+    sep: str = "\n",
+    input: str | None = None,  # noqa: A002 (mirrors subprocess)
+) -> Iterator[str]:
+    """
+    Stream `git <args>` output record by record (see ``GitRunner.stream``).
+
+    Use instead of ``run_git`` for output that grows with history size,
+    e.g. ``git log --numstat``.
+    """
+    return GIT.stream(args, cwd=cwd, sep=sep, input=input)
+
+
+# --------------------------------------------------------------------------- #
+# Repository context (probed once per command)
+# --------------------------------------------------------------------------- #
+@dataclass(frozen=True)
+class RepoContext:
+    """Facts about a working tree that stay fixed for one command."""
+
+    toplevel: Path
+    git_dir: Path
+    head: str | None  # None before the first commit
+    branch: str | None  # short name; None when HEAD is detached
+    upstream: str | None  # e.g. "origin/main"
+    origin_url: str | None
+
+
+def _probe_repo(path: str | Path) -> RepoContext:
+    """Collect a ``RepoContext`` with two git calls (three on an unborn branch)."""
+    lines = _run_git(
+        [
+            "rev-parse",
+            "--show-toplevel",
+            "--absolute-git-dir",
+            "--revs-only",  # drops HEAD silently before the first commit
+            "HEAD",
+            "--symbolic-full-name",
+            "HEAD",
+        ],
+        cwd=path,
+    ).splitlines()
+    toplevel, git_dir, *head_info = lines
+    head = ref = None
+    if len(head_info) == 2:
+        head, ref = head_info
+    else:  # unborn branch: HEAD names a branch that has no commit yet
+        ref = GIT.run(["symbolic-ref", "-q", "HEAD"], cwd=path, check=False)
+        ref = ref.stdout.strip() or None
+    branch = (
+        ref[len("refs/heads/") :] if ref and ref.startswith("refs/heads/") else None
+    )
+
+    config = GIT.run(
+        [
+            "config",
+            "-z",
+            "--get-regexp",
+            r"^(remote\.origin\.url|branch\..*\.(remote|merge))$",
+        ],
+        cwd=path,
+        check=False,  # exit 1: no such keys
+    ).stdout
+    settings = dict(
+        record.split("\n", 1) for record in config.split("\0") if "\n" in record
+    )
+    upstream = None
+    remote = settings.get(f"branch.{branch}.remote")
+    merge = settings.get(f"branch.{branch}.merge", "")
+    if branch and remote and merge:
+        merge = merge.removeprefix("refs/heads/")
+        upstream = merge if remote == "." else f"{remote}/{merge}"
+
+    return RepoContext(
+        toplevel=Path(toplevel),
+        git_dir=Path(git_dir),
+        head=head,
+        branch=branch,
+        upstream=upstream,
+        origin_url=settings.get("remote.origin.url"),
+    )
+
+
+_REPO_SCOPE: ContextVar[dict[Path, RepoContext] | None] = ContextVar(
+    "b3th_repo_scope", default=None
+)
+
+
+@contextmanager
+def repo_scope() -> Iterator[None]:
+    """
+    Memoize ``repo_context`` (and the helpers built on it) inside the block.
+
+    The CLI wraps each command in one scope, so checking the repository,
+    reading the branch and the origin URL costs one probe instead of a
+    git process per question. Nested scopes share the outer cache.
+    """
+    if _REPO_SCOPE.get() is not None:
+        yield
+        return
+    token = _REPO_SCOPE.set({})
+    try:
+        yield
+    finally:
+        _REPO_SCOPE.reset(token)
+
+
+def repo_context(path: str | Path = ".") -> RepoContext:
+    """
+    Return the ``RepoContext`` for *path* (memoized inside ``repo_scope``).
+
+    Raises ``GitError`` if *path* is not inside a working tree.
+    """
+    cache = _REPO_SCOPE.get()
+    if cache is None:
+        return _probe_repo(path)
+    key = Path(path).resolve()
+    if key not in cache:
+        cache[key] = _probe_repo(path)
+    return cache[key]
+
+
+def scoped_repo_context(path: str | Path = ".") -> RepoContext | None:
+    """Return ``repo_context(path)`` inside a ``repo_scope``, else ``None``."""
+    if _REPO_SCOPE.get() is None:
+        return None
+    return repo_context(path)
+
+
 # Public helpers
 def is_git_repo(path: str | Path = ".") -> bool:
     """Return True if *path* is inside a Git working tree."""
     try:
-        _run_git(["rev-parse", "--is-inside-work-tree"], cwd=path)
+        if _REPO_SCOPE.get() is not None:
+            repo_context(path)
+        else:
+            _run_git(["rev-parse", "--is-inside-work-tree"], cwd=path)
+        return True
+    except GitError:
+        return False
+
+
+async def ais_git_repo(path: str | Path = ".") -> bool:
+    """Async ``is_git_repo`` (the probe runs off the event loop in a scope)."""
+    try:
+        if _REPO_SCOPE.get() is not None:
+            await asyncio.to_thread(repo_context, path)
+        else:
+            await arun_git(["rev-parse", "--is-inside-work-tree"], cwd=path)
         return True
     except GitError:
         return False
@@ -73,6 +593,9 @@ def get_current_branch(path: str | Path = ".") -> str:
     using `git symbolic-ref`. If HEAD is detached, fall back to the abbreviated
     commit hash.
     """
+    ctx = scoped_repo_context(path)
+    if ctx is not None and ctx.branch:
+        return ctx.branch
     try:
         # Succeeds even before the first commit
         return _run_git(["symbolic-ref", "--quiet", "--short", "HEAD"], cwd=path)
@@ -81,49 +604,382 @@ def get_current_branch(path: str | Path = ".") -> str:
         return _run_git(["rev-parse", "--short", "HEAD"], cwd=path)
 
 
-def get_staged_diff(path: str | Path = ".") -> str:
+# --------------------------------------------------------------------------- #
+# Staged diff (numstat pre-scan, then a capped fetch)
+# --------------------------------------------------------------------------- #
+LOCKFILE_GLOBS: tuple[str, ...] = (
+    "*.lock",
+    "*-lock.json",
+    "*-lock.yaml",
+    "npm-shrinkwrap.json",
+    "go.sum",
+)
+GENERATED_GLOBS: tuple[str, ...] = (
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "*_pb2.py",
+    "*.pb.go",
+    "*.generated.*",
+    "vendor/*",
+    "node_modules/*",
+    "dist/*",
+    "build/*",
+)
+
+_PATHSPEC_CHARS = 30_000  # per fetch; stays under Windows' command-line limit
+_NULL_OID = "0" * 40
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_globs(name: str) -> tuple[str, ...]:
+    return tuple(g.strip() for g in os.getenv(name, "").split(",") if g.strip())
+
+
+def _matches(path: str, globs: tuple[str, ...]) -> bool:
+    name = path.rsplit("/", 1)[-1]
+    return any(fnmatch(path, g) or fnmatch(name, g) for g in globs)
+
+
+@dataclass(frozen=True)
+class DiffPolicy:
+    """
+    Which staged files ``get_staged_diff`` fetches, and how much of them.
+
+    ``DiffPolicy.from_env()`` (the default) reads ``B3TH_DIFF_MAX_BYTES``,
+    ``B3TH_DIFF_MAX_FILE_BYTES``, ``B3TH_DIFF_MAX_FILE_LINES`` and extra
+    comma-separated globs from ``B3TH_DIFF_GENERATED`` /
+    ``B3TH_DIFF_LOCKFILES``.
+    """
+
+    max_bytes: int = 1024 * 1024  # patch text fetched, all files together
+    max_file_bytes: int = 256 * 1024  # blob size past which a file is skipped
+    max_file_lines: int = 5_000  # added + deleted lines, likewise
+    generated: tuple[str, ...] = GENERATED_GLOBS
+    lockfiles: tuple[str, ...] = LOCKFILE_GLOBS
+
+    @classmethod
+    def from_env(cls) -> DiffPolicy:
+        return cls(
+            max_bytes=_env_int("B3TH_DIFF_MAX_BYTES", cls.max_bytes),
+            max_file_bytes=_env_int("B3TH_DIFF_MAX_FILE_BYTES", cls.max_file_bytes),
+            max_file_lines=_env_int("B3TH_DIFF_MAX_FILE_LINES", cls.max_file_lines),
+            generated=GENERATED_GLOBS + _env_globs("B3TH_DIFF_GENERATED"),
+            lockfiles=LOCKFILE_GLOBS + _env_globs("B3TH_DIFF_LOCKFILES"),
+        )
+
+    def skip_reason(self, entry: StagedFile) -> str | None:
+        """Return why *entry*'s patch should not be fetched, if it shouldn't."""
+        if entry.added is None:
+            return "binary"
+        if _matches(entry.path, self.lockfiles):
+            return "lockfile"
+        if _matches(entry.path, self.generated):
+            return "generated"
+        if entry.size > self.max_file_bytes:
+            return "oversized"
+        if entry.added + entry.deleted > self.max_file_lines:
+            return "oversized"
+        return None
+
+
+class StagedFile(NamedTuple):
+    """One file of the staged diff, as seen by the ``--numstat`` pre-scan."""
+
+    path: str
+    old_path: str  # differs from path for renames and copies
+    added: int | None  # None for binary files
+    deleted: int | None
+    size: int  # bytes of the larger blob (old or new side)
+    skip: str | None = None  # "binary", "lockfile", "generated", "oversized" …
+
+    def stat_line(self) -> str:
+        name = (
+            self.path
+            if self.old_path == self.path
+            else f"{self.old_path} => {self.path}"
+        )
+        if self.added is None:
+            return f"{name} | binary, {self.size} bytes (diff omitted)"
+        return f"{name} | +{self.added} -{self.deleted} (diff omitted: {self.skip})"
+
+
+def scan_staged(
+    path: str | Path = ".", policy: DiffPolicy | None = None
+) -> list[StagedFile]:
+    """
+    List the staged files with their line counts, sizes and skip reasons.
+
+    One streamed ``git diff --staged --raw --numstat -z`` plus one
+    pipelined ``cat-file --batch-check`` for blob sizes; no patch text is
+    produced.
+    """
+    policy = policy or DiffPolicy.from_env()
+    blobs: dict[str, tuple[str, str]] = {}  # path -> (old oid, new oid)
+    counts: list[tuple[str, str, int | None, int | None]] = []
+    args = ["diff", "--staged", "--raw", "--numstat", "-z", "--no-abbrev"]
+    records = iter_git(args, cwd=path, sep="\0")
+    for record in records:
+        if not record:
+            continue
+        if record.startswith(":"):  # ":<modes> <old> <new> <status>" then path(s)
+            _old_mode, _new_mode, old, new, status = record[1:].split()
+            name = next(records)
+            if status[0] in "RC":
+                name = next(records)
+            blobs[name] = (old, new)
+            continue
+        added, deleted, name = record.split("\t", 2)
+        old_name = name
+        if not name:  # rename/copy: source and destination follow
+            old_name, name = next(records), next(records)
+        if added == "-":
+            counts.append((name, old_name, None, None))
+        else:
+            counts.append((name, old_name, int(added), int(deleted)))
+
+    oids = {oid for pair in blobs.values() for oid in pair if oid != _NULL_OID}
+    info = read_many(oids, path, content=False) if oids else {}
+
+    def size(oid: str) -> int:
+        obj = info.get(oid)
+        return obj.size if obj is not None else 0
+
+    entries = []
+    for name, old_name, added, deleted in counts:
+        old, new = blobs.get(name, (_NULL_OID, _NULL_OID))
+        entry = StagedFile(name, old_name, added, deleted, max(size(old), size(new)))
+        entries.append(entry._replace(skip=policy.skip_reason(entry)))
+    return entries
+
+
+def _pathspec_batches(entries: list[StagedFile]) -> Iterator[list[str]]:
+    """Group literal pathspecs for *entries* into command-line-sized batches."""
+    batch: list[str] = []
+    used = 0
+    for entry in entries:
+        specs = [f":(literal){p}" for p in dict.fromkeys((entry.old_path, entry.path))]
+        cost = sum(len(s) + 1 for s in specs)
+        if batch and used + cost > _PATHSPEC_CHARS:
+            yield batch
+            batch, used = [], 0
+        batch.extend(specs)
+        used += cost
+    if batch:
+        yield batch
+
+
+def get_staged_diff(path: str | Path = ".", *, policy: DiffPolicy | None = None) -> str:
     """
     Return the unified diff of **staged** changes (index vs HEAD).
     An empty string means nothing is currently staged.
+
+    Binary, lockfile, generated and oversized files (see ``DiffPolicy``)
+    are listed as one-line stats instead of patches, and at most
+    ``policy.max_bytes`` of patch text is read: git's output is streamed and
+    the fetch stops at the budget, files past it becoming stat lines too.
     """
-    return _run_git(["diff", "--staged"], cwd=path)
+    if not has_staged_changes(path, fallback=False):
+        return ""  # known from the index alone: no git diff at all
+    policy = policy or DiffPolicy.from_env()
+    entries = scan_staged(path, policy)
+    wanted = [e for e in entries if e.skip is None]
+    omitted = len(wanted) < len(entries)
+
+    done: list[str] = []  # complete file sections
+    section: list[str] = []
+    sections = used = 0
+    over_budget = False
+    batches: Iterable[list[str]] = _pathspec_batches(wanted)
+    if not omitted:
+        batches = [[]] if wanted else []  # one plain `git diff --staged`
+    for specs in batches:
+        args = ["diff", "--staged", *(["--", *specs] if specs else [])]
+        with closing(iter_git(args, cwd=path)) as lines:
+            for line in lines:
+                if line.startswith("diff --git "):
+                    done.extend(section)
+                    section = []
+                    sections += 1
+                used += len(line.encode("utf-8", "replace")) + 1
+                if used > policy.max_bytes:
+                    over_budget = True
+                    break
+                section.append(line)
+        if over_budget:
+            sections -= 1  # the section in progress is dropped
+            break
+        done.extend(section)
+        section = []
+
+    cut = {e.path for e in wanted[sections:]} if over_budget else set()
+    stats = [
+        (e._replace(skip="byte budget") if e.path in cut else e).stat_line()
+        for e in entries
+        if e.skip is not None or e.path in cut
+    ]
+    return "\n".join([*stats, *done]).rstrip()
+
+
+# --------------------------------------------------------------------------- #
+# Index queries (in-process fast path, git as the fallback)
+# --------------------------------------------------------------------------- #
+# Parsing in Python beats spawning git only while the index is small: past
+# ~5k entries git's own (C) reader wins despite the fork/exec
+# (benchmarks/bench_git_index.py), so larger indexes go to git.
+INDEX_FAST_PATH_MAX_BYTES = 512 * 1024
+
+
+def _index_snapshot(path: str | Path) -> tuple[GitIndex, str] | None:
+    """
+    Parse the index of the repository containing *path* (``git_index``).
+
+    Returns the index and *path*'s prefix inside it (``"sub/dir/"``), or
+    ``None`` when git has to answer instead (no worktree, index larger than
+    ``INDEX_FAST_PATH_MAX_BYTES``, split/sparse or SHA-256 index,
+    unreadable file).
+    """
+    found = find_repo(path)
+    if found is None or found[0] is None:
+        return None
+    try:
+        index_file = index_path(path)
+        if index_file.stat().st_size > INDEX_FAST_PATH_MAX_BYTES:
+            return None
+        index = GitIndex.from_file(index_file)
+    except (IndexFormatError, OSError):
+        return None
+    prefix = Path(path).resolve().relative_to(found[0]).as_posix()
+    return index, "" if prefix == "." else prefix + "/"
+
+
+def has_staged_changes(path: str | Path = ".", *, fallback: bool = True) -> bool:
+    """
+    Return True if the index differs from HEAD.
+
+    Answered from the index's cache-tree when it is still valid (one
+    ``cat-file`` lookup of HEAD's tree), otherwise by
+    ``git diff --cached --quiet`` — or, with ``fallback=False``, by
+    assuming there may be changes, for callers that are about to diff
+    anyway.
+    """
+    snapshot = _index_snapshot(path)
+    tree_oid = None
+    if snapshot is not None:
+        with snapshot[0] as index:
+            tree_oid = index.tree_oid
+    if tree_oid is not None:
+        head_tree = cat_file(path).object_info("HEAD^{tree}")
+        if head_tree is not None:
+            return head_tree.oid != tree_oid
+    if not fallback:
+        return True
+    result = GIT.run(["diff", "--cached", "--quiet"], cwd=path, check=False)
+    if result.returncode > 1:
+        raise GitError(result.stderr.strip() or "git diff --cached failed")
+    return result.returncode == 1
 
 
 # helper: detect unresolved merge conflicts
-def has_merge_conflicts(path: str | Path = ".") -> bool:  # pragma: no cover
+def _marker_scan_enabled(flag: bool | None) -> bool:
+    if flag is not None:
+        return flag
+    return os.getenv("B3TH_CONFLICT_MARKERS", "").strip().lower() in _TRUTHY
+
+
+def unmerged_files(path: str | Path = ".") -> dict[str, dict[int, str]]:
+    """
+    Return the unmerged index entries under *path*.
+
+    Maps each conflicted path (relative to *path*) to its stage blobs,
+    ``{1: base, 2: ours, 3: theirs}``; a stage is absent when that side
+    added or deleted the file. Read from the index directly when possible,
+    else with ``git ls-files -u -z``; either way no worktree file is
+    touched.
+    """
+    snapshot = _index_snapshot(path)
+    if snapshot is not None:
+        index, prefix = snapshot
+        with index:
+            return index.unmerged(prefix)
+
+    entries: dict[str, dict[int, str]] = {}
+    for record in iter_git(["ls-files", "-u", "-z"], cwd=path, sep="\0"):
+        if not record:
+            continue
+        info, _, name = record.partition("\t")
+        _mode, oid, stage = info.split()
+        entries.setdefault(name, {})[int(stage)] = oid
+    return entries
+
+
+def files_with_markers(path: str | Path = ".") -> list[str]:
+    """
+    Return tracked files under *path* containing a ``<<<<<<<`` marker.
+
+    Scans every tracked file (``git grep``) and also matches files that
+    merely contain the string; only used as an opt-in fallback.
+    """
+    result = GIT.run(["grep", "-l", "<<<<<<< ", "--", "."], cwd=path, check=False)
+    if result.returncode > 1:  # 1 → no match
+        raise GitError(result.stderr.strip() or "git grep failed")
+    return result.stdout.splitlines()
+
+
+def conflicted_files(
+    path: str | Path = ".", *, scan_markers: bool | None = None
+) -> list[str]:
+    """
+    Return unmerged paths under *path*, plus (with *scan_markers*, default
+    ``$B3TH_CONFLICT_MARKERS``) tracked files containing conflict markers.
     """
-    Return ``True`` if the working tree under *path* contains any unresolved
-    merge conflicts.
+    names = list(unmerged_files(path))
+    if _marker_scan_enabled(scan_markers):
+        seen = set(names)
+        names.extend(n for n in files_with_markers(path) if n not in seen)
+    return names
+
+
+def has_merge_conflicts(
+    path: str | Path = ".", *, scan_markers: bool | None = None
+) -> bool:
+    """
+    Return ``True`` if the working tree under *path* has unresolved merge
+    conflicts.
 
     Detection strategy
     ------------------
-    • Use ``git grep -l "<<<<<<<"`` — Git writes this exact marker at the start
-      of the “ours” hunk whenever it cannot auto-merge.
-    • Exit-status semantics:
-
-        0 → at least one match (conflict present)
-        1 → no match (clean)
-        ≥2 → actual error → raise ``GitError``
+    • Git records every path it could not auto-merge as higher-stage
+      entries in the index; we read the index directly (or stop
+      ``git ls-files -u`` at its first line).
+    • With *scan_markers* (default: ``$B3TH_CONFLICT_MARKERS``) tracked files
+      are also grepped for ``<<<<<<<``, which catches conflicted files that
+      were staged by mistake at the cost of scanning the whole tree (and of
+      false positives from files that contain the marker legitimately).
 
     Raises
     ------
     GitError
-        If *git grep* fails for reasons other than “no match”.
+        If git fails (e.g. *path* is not a repository).
     """
-    result = subprocess.run(  # noqa: S603 (intentional external command)
-        [_git_exe(), "grep", "-l", "<<<<<<<", "--", "."],
-        cwd=path,
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
-
-    if result.returncode == 0:
-        return True  # conflict markers found
-    if result.returncode == 1:
-        return False  # no markers
-    # Anything else is a genuine error
-    raise GitError(result.stderr.strip() or "git grep failed")
+    snapshot = _index_snapshot(path)
+    if snapshot is not None:
+        index, prefix = snapshot
+        with index:
+            if index.has_unmerged(prefix):
+                return True
+    else:
+        args = ["ls-files", "-u", "-z"]
+        with closing(iter_git(args, cwd=path, sep="\0")) as entries:
+            if next(entries, ""):
+                return True
+    return _marker_scan_enabled(scan_markers) and bool(files_with_markers(path))
 
 
 # Helper: last-N commits
@@ -137,13 +993,28 @@ def get_last_commits(
         { "hash": <full>, "abbrev": <short>, "author": <name>,
           "date": <YYYY-MM-DD>, "subject": <message> }
     """
+    return _parse_commits(iter_git(_last_commits_args(n), cwd=path, sep="\0"))
+
+
+async def aget_last_commits(
+    path: str | Path = ".", n: int = 10
+) -> list[dict[str, str]]:
+    """Async ``get_last_commits`` (one buffered ``git log``; *n* is small)."""
+    out = await arun_git(_last_commits_args(n), cwd=path)
+    return _parse_commits(out.split("\0"))
+
+
+def _last_commits_args(n: int) -> list[str]:
     fmt = "%H%x1f%h%x1f%an%x1f%ad%x1f%s"
-    raw = _run_git(["log", f"-n{n}", "--date=short", f"--pretty={fmt}"], cwd=path)
+    return ["log", "-z", f"-n{n}", "--date=short", f"--pretty=format:{fmt}"]
+
+
+def _parse_commits(records: Iterable[str]) -> list[dict[str, str]]:
     commits: list[dict[str, str]] = []
-    for line in raw.splitlines():
-        if not line:
+    for record in records:
+        if not record:
             continue
-        full, short, author, date, subject = line.split("\x1f")
+        full, short, author, date, subject = record.split("\x1f")
         commits.append(
             {
                 "hash": full,
@@ -154,3 +1025,200 @@ def get_last_commits(
             }
         )
     return commits
+
+
+# --------------------------------------------------------------------------- #
+# Persistent object reader (git cat-file --batch)
+# --------------------------------------------------------------------------- #
+_CAT_FILE_CHUNK = 64  # requests written before reading replies (no pipe stall)
+
+
+class GitObject(NamedTuple):
+    """An object read from the repository's object database."""
+
+    oid: str
+    type: str  # "blob", "tree", "commit" or "tag"
+    size: int
+    data: bytes | None  # None when only the header was requested
+
+
+class CatFile:
+    """
+    Long-lived ``git cat-file --batch`` / ``--batch-check`` worker.
+
+    Each process is started lazily on first use, restarted once if it dies,
+    and stopped by ``close()``. Thread-safe; use ``cat_file(repo)`` to share
+    one instance per repository.
+    """
+
+    def __init__(self, repo: str | Path = ".") -> None:
+        self.repo = Path(repo)
+        self._procs: dict[str, subprocess.Popen[bytes]] = {}
+        self._lock = threading.Lock()
+
+    # -- process management -------------------------------------------------- #
+    def _proc(self, mode: str) -> subprocess.Popen[bytes]:
+        proc = self._procs.get(mode)
+        if proc is None or proc.poll() is not None:
+            proc = subprocess.Popen(  # noqa: S603 (intentional external command)
+                [GIT.exe, "cat-file", mode],
+                cwd=self.repo,
+                env=GIT.env(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self._procs[mode] = proc
+        return proc
+
+    def close(self) -> None:
+        """Stop the worker processes (they restart on the next read)."""
+        with self._lock:
+            procs, self._procs = list(self._procs.values()), {}
+        for proc in procs:
+            for stream in (proc.stdin, proc.stdout):
+                if stream is not None:
+                    stream.close()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    def __enter__(self) -> CatFile:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    # -- protocol ------------------------------------------------------------ #
+    @staticmethod
+    def _read_reply(out: IO[bytes], content: bool) -> GitObject | None:
+        header = out.readline()
+        if not header:
+            raise BrokenPipeError("git cat-file exited")
+        line = header.decode("utf-8", "replace").rstrip("\n")
+        # "<spec> missing" / "<spec> ambiguous": the spec may contain spaces
+        if line.rsplit(" ", 1)[-1] in ("missing", "ambiguous"):
+            return None
+        oid, kind, size_text = line.rsplit(" ", 2)
+        size = int(size_text)
+        data = None
+        if content:
+            data = out.read(size)
+            out.read(1)  # trailing LF
+        return GitObject(oid, kind, size, data)
+
+    def _batch(self, specs: list[str], content: bool) -> list[GitObject | None]:
+        for spec in specs:
+            if not spec or "\n" in spec:
+                raise GitError(f"invalid object name: {spec!r}")
+        mode = "--batch" if content else "--batch-check"
+        with self._lock:
+            restarted = False
+            while True:
+                proc = self._proc(mode)
+                stdin, stdout = proc.stdin, proc.stdout
+                if stdin is None or stdout is None:  # pragma: no cover
+                    raise GitError("git cat-file started without pipes")
+                results: list[GitObject | None] = []
+                try:
+                    for start in range(0, len(specs), _CAT_FILE_CHUNK):
+                        chunk = specs[start : start + _CAT_FILE_CHUNK]
+                        stdin.write("".join(f"{s}\n" for s in chunk).encode())
+                        stdin.flush()
+                        results.extend(self._read_reply(stdout, content) for _ in chunk)
+                    return results
+                except (OSError, ValueError) as exc:  # died or garbled output
+                    proc.kill()
+                    proc.wait()
+                    self._procs.pop(mode, None)
+                    if restarted:
+                        raise GitError(f"git cat-file failed: {exc}") from exc
+                    restarted = True
+
+    # -- public API ---------------------------------------------------------- #
+    def read_many(
+        self, specs: Iterable[str], *, content: bool = True
+    ) -> dict[str, GitObject | None]:
+        """
+        Read several objects in one pipelined round-trip.
+
+        *specs* are anything ``git cat-file`` accepts (oids, ``HEAD:path``,
+        ``:1:path`` …). Returns ``{spec: GitObject}``, with ``None`` for
+        missing objects. With ``content=False`` only type and size are read.
+        """
+        unique = list(dict.fromkeys(specs))
+        return dict(zip(unique, self._batch(unique, content)))
+
+    def read_object(self, spec: str) -> GitObject:
+        """Return one object, raising ``GitError`` if it does not exist."""
+        obj = self._batch([spec], True)[0]
+        if obj is None:
+            raise GitError(f"object not found: {spec}")
+        return obj
+
+    def object_info(self, spec: str) -> GitObject | None:
+        """Return type and size (``data`` is None) without reading content."""
+        return self._batch([spec], False)[0]
+
+
+_CAT_FILES: dict[Path, CatFile] = {}
+_CAT_FILES_LOCK = threading.Lock()
+
+
+def cat_file(path: str | Path = ".") -> CatFile:
+    """Return the shared ``CatFile`` worker for the repository at *path*."""
+    key = Path(path).resolve()
+    with _CAT_FILES_LOCK:
+        worker = _CAT_FILES.get(key)
+        if worker is None:
+            worker = _CAT_FILES[key] = CatFile(key)
+        return worker
+
+
+def close_cat_files() -> None:
+    """Shut down every shared ``cat-file`` worker (runs at exit)."""
+    with _CAT_FILES_LOCK:
+        workers = list(_CAT_FILES.values())
+        _CAT_FILES.clear()
+    for worker in workers:
+        worker.close()
+
+
+atexit.register(close_cat_files)
+
+
+def _use_object_store() -> bool:
+    return os.getenv("B3TH_OBJECT_STORE", "").strip().lower() in _TRUTHY
+
+
+def read_object(spec: str, path: str | Path = ".") -> GitObject:
+    """Read one object through the shared reader for *path*."""
+    obj = read_many([spec], path)[spec]
+    if obj is None:
+        raise GitError(f"object not found: {spec}")
+    return obj
+
+
+def read_many(
+    specs: Iterable[str], path: str | Path = ".", *, content: bool = True
+) -> dict[str, GitObject | None]:
+    """
+    Read many objects through the shared readers for *path*.
+
+    With ``B3TH_OBJECT_STORE=1`` full object ids are first looked up
+    in-process (``object_store``); everything else goes to ``git cat-file``.
+    """
+    unique = list(dict.fromkeys(specs))
+    found: dict[str, GitObject | None] = {}
+    if _use_object_store():
+        from . import object_store  # local import: it builds on this module
+
+        store = object_store.shared_store(path)
+        if store is not None:
+            found.update(store.read_many(unique, content=content))
+    rest = [spec for spec in unique if spec not in found]
+    if rest:
+        found.update(cat_file(path).read_many(rest, content=content))
+    return {spec: found[spec] for spec in unique}
@@ -3,16 +3,37 @@ Groq LLM wrapper.
 
 Call ``chat_completion()`` with either a prompt *string* or a full list of
 OpenAI-style message dicts; the helper will do the right thing.
+
+All calls share one keep-alive ``requests.Session`` for the lifetime of the
+process, so batch work (e.g. per-file conflict resolution) reuses warm
+TCP/TLS connections instead of paying a new handshake per request.
+
+Requests go out through a pluggable transport (``set_transport()``); see
+``b3th.transport`` for recording and replaying exchanges. Environment:
+
+    B3TH_LLM_RECORD=<file>   append every exchange to a JSONL cassette
+    B3TH_LLM_REPLAY=<file>   answer from a cassette instead of the network
+    B3TH_HEDGE_AFTER=<sec>   hedge slow calls after this many seconds …
+    B3TH_HEDGE_MODEL=<id>    … by racing this (faster) model
 """
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import json
 import os
+import threading
 import time
-from typing import Any
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from . import llm_cache, ratelimit, telemetry, transport
 from .config import ConfigError, get_groq_key
 
 
@@ -20,6 +41,93 @@ class LLMError(RuntimeError):
     """Raised when the Groq API returns an error or an unexpected payload."""
 
 
+T = TypeVar("T")
+
+_DEFAULT_MAX_IN_FLIGHT = 4  # concurrent LLM calls for fan-out workloads
+
+
+# --------------------------------------------------------------------------- #
+# Shared HTTP session
+# --------------------------------------------------------------------------- #
+_POOL_CONNECTIONS = 4  # distinct hosts kept warm (Groq + overrides)
+_POOL_MAXSIZE = 16  # concurrent keep-alive sockets per host
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                # Retries are handled by chat_completion(), not urllib3.
+                adapter = HTTPAdapter(
+                    pool_connections=_POOL_CONNECTIONS,
+                    pool_maxsize=_POOL_MAXSIZE,
+                    max_retries=0,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def close_session() -> None:
+    """Close the shared session and its pooled connections (runs at exit)."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+
+atexit.register(close_session)
+
+
+# --------------------------------------------------------------------------- #
+# Transport
+# --------------------------------------------------------------------------- #
+class _SessionTransport:
+    """Default transport: the shared pooled session."""
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return _session().post(url, **kwargs)
+
+
+_TRANSPORT: transport.Transport | None = None  # set_transport() override
+_ENV_TRANSPORT: tuple[tuple[str, str], transport.Transport] | None = None
+
+
+def set_transport(new: transport.Transport | None) -> transport.Transport | None:
+    """Send chat requests through *new* (``None`` → default); return the old one."""
+    global _TRANSPORT
+    old, _TRANSPORT = _TRANSPORT, new
+    return old
+
+
+def _transport() -> transport.Transport:
+    """Return the explicit transport, else one chosen by the environment."""
+    global _ENV_TRANSPORT
+    if _TRANSPORT is not None:
+        return _TRANSPORT
+    env = (os.getenv("B3TH_LLM_REPLAY", ""), os.getenv("B3TH_LLM_RECORD", ""))
+    if not any(env):
+        return _SessionTransport()
+    with _SESSION_LOCK:
+        if _ENV_TRANSPORT is None or _ENV_TRANSPORT[0] != env:
+            replay, record = env
+            chosen: transport.Transport = (
+                transport.ReplayTransport(replay)
+                if replay
+                else transport.RecordTransport(record, _SessionTransport())
+            )
+            _ENV_TRANSPORT = (env, chosen)
+        return _ENV_TRANSPORT[1]
+
+
 # --------------------------------------------------------------------------- #
 # Internal helpers
 # --------------------------------------------------------------------------- #
@@ -40,6 +148,41 @@ def _default_model() -> str:
     return os.getenv("GROQ_MODEL_ID", "llama-3.3-70b-versatile")
 
 
+def _max_in_flight() -> int:
+    """Return the fan-out concurrency cap (env ``B3TH_LLM_CONCURRENCY``)."""
+    try:
+        return max(1, int(os.getenv("B3TH_LLM_CONCURRENCY", _DEFAULT_MAX_IN_FLIGHT)))
+    except ValueError:
+        return _DEFAULT_MAX_IN_FLIGHT
+
+
+# Set by the CLI (--hedge-after/--hedge-model); None means "use the env".
+_HEDGE_OVERRIDE: tuple[float | None, str | None] = (None, None)
+
+
+def set_hedging(after: float | None, model: str | None) -> None:
+    """Override the hedging settings for this process (``None`` → use env)."""
+    global _HEDGE_OVERRIDE
+    _HEDGE_OVERRIDE = (after, model)
+
+
+def _hedge_settings(
+    primary: str, after: float | None, model: str | None
+) -> tuple[float, str] | None:
+    """Resolve (delay, hedge model) from arguments, overrides and env."""
+    if after is None:
+        after = _HEDGE_OVERRIDE[0]
+    if after is None:
+        try:
+            after = float(os.environ["B3TH_HEDGE_AFTER"])
+        except (KeyError, ValueError):
+            return None
+    model = model or _HEDGE_OVERRIDE[1] or os.getenv("B3TH_HEDGE_MODEL")
+    if after < 0 or not model or model == primary:
+        return None
+    return after, model
+
+
 def _extract_error_text(resp: requests.Response) -> str:
     try:
         data = resp.json()
@@ -56,9 +199,395 @@ def _extract_error_text(resp: requests.Response) -> str:
         return resp.text
 
 
+def _coerce_messages(
+    messages: str | list[dict[str, str]], system: str | None
+) -> list[dict[str, str]]:
+    """Return *messages* as an OpenAI-style list, with *system* prepended."""
+    # Coerce prompt into the required list-of-dicts format
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+
+    if system:
+        messages = [{"role": "system", "content": system}] + messages
+    return messages
+
+
+def _build_request(
+    messages: list[dict[str, str]],
+    *,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    stream: bool,
+) -> tuple[str, dict[str, str], dict[str, Any]]:
+    """Return ``(url, headers, payload)`` for a chat-completion request."""
+    url = f"{_api_base()}/openai/v1/chat/completions"
+    headers = {
+        "Authorization": f"Bearer {_api_key()}",
+        "Content-Type": "application/json",
+    }
+    payload: dict[str, Any] = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": stream,
+    }
+    return url, headers, payload
+
+
+def _estimate_tokens(payload: dict[str, Any]) -> int:
+    """Rough token cost of a request (≈4 chars/token prompt + reply budget)."""
+    chars = sum(len(str(m.get("content", ""))) for m in payload["messages"])
+    return chars // 4 + int(payload.get("max_tokens") or 0)
+
+
+def _post(
+    url: str,
+    headers: dict[str, str],
+    payload: dict[str, Any],
+    *,
+    timeout: int,
+    retries: int,
+    retry_budget: float,
+    record: telemetry.LLMCall | None = None,
+) -> requests.Response:
+    """
+    POST *payload* and return the 200 response.
+
+    Before each attempt the shared ``ratelimit.LIMITER`` may delay the call
+    when Groq's rate-limit headers say the budget is nearly spent. Transient
+    failures (network, HTTP 429/5xx) are retried up to *retries* times using
+    ``Retry-After`` when given, else jittered exponential backoff, but never
+    past *retry_budget* seconds in total.
+
+    The body is always fetched lazily (``stream=True``) so that *record*
+    gets a true time to first byte; callers read it via ``.json()`` or
+    ``_iter_sse_deltas()``.
+    """
+    cost = _estimate_tokens(payload)
+    record = record or telemetry.LLMCall(model=str(payload.get("model")))
+    deadline = time.monotonic() + retry_budget
+
+    def _sleep_within_budget(delay: float) -> bool:
+        if time.monotonic() + delay > deadline:
+            return False
+        time.sleep(delay)
+        return True
+
+    attempt = 0
+    while True:
+        attempt += 1
+        record.retries = attempt - 1
+        wait = ratelimit.LIMITER.reserve(tokens=cost)
+        if wait and not _sleep_within_budget(wait):
+            raise LLMError(
+                f"Groq rate limit: next slot in {wait:.1f}s exceeds the "
+                f"{retry_budget:.0f}s retry budget"
+            )
+        record.wait_s += wait
+        sent = time.perf_counter()
+        try:
+            resp = _transport().post(
+                url, headers=headers, json=payload, timeout=timeout, stream=True
+            )
+        except transport.TransportError as exc:
+            raise LLMError(str(exc)) from exc
+        except requests.RequestException as exc:
+            if attempt <= retries and _sleep_within_budget(
+                ratelimit.backoff_delay(attempt)
+            ):
+                continue
+            raise LLMError(f"Network error calling Groq: {exc}") from exc
+
+        record.ttfb_s = time.perf_counter() - sent
+        record.status = resp.status_code
+        ratelimit.LIMITER.update(resp.headers)
+        if resp.status_code == 200:
+            return resp
+
+        # Retry on transient errors
+        if resp.status_code in (429, 500, 502, 503, 504) and attempt <= retries:
+            delay = ratelimit.retry_after(resp.headers)
+            if delay is None:
+                delay = ratelimit.backoff_delay(attempt)
+            if time.monotonic() + delay <= deadline:
+                resp.close()
+                if resp.status_code == 429:
+                    # Hold back concurrent callers too; reserve() sleeps it out.
+                    ratelimit.LIMITER.pause(delay)
+                else:
+                    time.sleep(delay)
+                continue
+
+        # Non-retriable or out of retries
+        err_text = _extract_error_text(resp)
+        raise LLMError(f"Groq API error {resp.status_code}: {err_text}")
+
+
+def _iter_sse_deltas(
+    resp: requests.Response, record: telemetry.LLMCall | None = None
+) -> Iterator[str]:
+    """
+    Yield content deltas from an OpenAI-style ``text/event-stream`` body.
+
+    *record* gets the time to first token and the ``usage`` block, which
+    Groq sends with the last chunk (under ``x_groq``; OpenAI at top level).
+    """
+    done = False
+    try:
+        for raw in resp.iter_lines():
+            # Blank lines separate events; lines starting with ':' are comments.
+            # After [DONE] keep reading so the connection returns to the pool.
+            if done or not raw or not raw.startswith(b"data:"):
+                continue
+            data = raw[len(b"data:") :].strip()
+            if data == b"[DONE]":
+                done = True
+                continue
+            try:
+                event = json.loads(data)
+            except ValueError as exc:
+                raise LLMError(f"Malformed Groq stream event: {data!r}") from exc
+            if "error" in event:
+                raise LLMError(f"Groq stream error: {event['error']}")
+            try:
+                delta = event["choices"][0].get("delta") or {}
+            except (KeyError, IndexError, TypeError, AttributeError) as exc:
+                raise LLMError(f"Malformed Groq stream event: {event}") from exc
+            if record is not None:
+                record.add_usage(
+                    event.get("usage") or event.get("x_groq", {}).get("usage")
+                )
+            content = delta.get("content")
+            if content:
+                if record is not None and record.ttft_s is None:
+                    record.ttft_s = record.elapsed()
+                yield content
+    except requests.RequestException as exc:
+        raise LLMError(f"Network error while streaming from Groq: {exc}") from exc
+    finally:
+        resp.close()
+
+
+# --------------------------------------------------------------------------- #
+# Live token rendering
+# --------------------------------------------------------------------------- #
+_TOKEN_SINK: ContextVar[Callable[[str], None] | None] = ContextVar(
+    "b3th_token_sink", default=None
+)
+
+
+@contextmanager
+def stream_to(sink: Callable[[str], None] | None) -> Iterator[None]:
+    """
+    Route every ``chat_completion()`` made inside the block through the
+    streaming path, passing each content delta to *sink* as it arrives.
+
+    Lets the CLI render replies incrementally without the generators
+    (commit message, PR description, …) having to know about it.
+    """
+    token = _TOKEN_SINK.set(sink)
+    try:
+        yield
+    finally:
+        _TOKEN_SINK.reset(token)
+
+
+# --------------------------------------------------------------------------- #
+# Telemetry
+# --------------------------------------------------------------------------- #
+@contextmanager
+def _traced(record: telemetry.LLMCall) -> Iterator[telemetry.LLMCall]:
+    """Finish *record* (wall time, error) and emit it when the block exits."""
+    try:
+        yield record
+    except GeneratorExit:  # a stream closed early, e.g. it lost a hedge race
+        record.error = record.error or "cancelled"
+        raise
+    except BaseException as exc:
+        record.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        record.wall_s = record.elapsed()
+        telemetry.emit(record)
+
+
 # --------------------------------------------------------------------------- #
-# Public function
+# Hedging
 # --------------------------------------------------------------------------- #
+def _complete(
+    messages: list[dict[str, str]],
+    *,
+    model: str,
+    stream: bool,
+    sink: Callable[[str], None] | None,
+    claim: Callable[[], bool],
+    hedge: bool = False,
+    **request: Any,
+) -> str | None:
+    """
+    Run one chat completion; return its content, or None if it lost a race.
+
+    *claim* is asked before output is committed (the first streamed delta,
+    or the finished non-streamed reply); once it returns False the caller
+    has chosen another request, so a stream is closed and the result dropped.
+    """
+    streaming = stream or sink is not None
+    record = telemetry.LLMCall(model=model, stream=streaming, hedge=hedge)
+    if streaming:
+        parts: list[str] = []
+        with closing(
+            stream_chat_completion(messages, model=model, record=record, **request)
+        ) as deltas:
+            for delta in deltas:
+                if not parts and not claim():
+                    return None
+                parts.append(delta)
+                if sink is not None:
+                    sink(delta)
+        if not parts and not claim():
+            return None
+        return "".join(parts)
+
+    with _traced(record):
+        url, headers, payload = _build_request(
+            messages,
+            model=model,
+            temperature=request["temperature"],
+            max_tokens=request["max_tokens"],
+            stream=False,
+        )
+        resp = _post(
+            url,
+            headers,
+            payload,
+            timeout=request["timeout"],
+            retries=request["retries"],
+            retry_budget=request["retry_budget"],
+            record=record,
+        )
+        data = resp.json()
+        try:
+            content = data["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError) as exc:
+            raise LLMError(f"Malformed Groq response: {data}") from exc
+        record.add_usage(data.get("usage"))
+        if not claim():
+            record.error = "cancelled"
+            return None
+        return content
+
+
+def _hedged(
+    run: Callable[[str, Callable[[], bool]], str | None],
+    models: tuple[str, str],
+    after: float,
+) -> tuple[str, str]:
+    """
+    Race *models* through *run*; return ``(model, content)`` of the winner.
+
+    The primary starts at once; the hedge starts when the primary has not
+    claimed a result within *after* seconds, or as soon as it fails. The
+    first request to claim (first token when streaming, else a complete
+    reply) wins and the other is abandoned. If neither succeeds, the
+    primary's error is raised.
+    """
+    cond = threading.Condition()
+    winner: list[int] = []
+    results: dict[int, str] = {}
+    errors: dict[int, BaseException] = {}
+    started: list[int] = []
+
+    def claim(idx: int) -> bool:
+        with cond:
+            if not winner:
+                winner.append(idx)
+                cond.notify_all()
+            return winner[0] == idx
+
+    def worker(idx: int) -> None:
+        try:
+            content = run(models[idx], lambda: claim(idx))
+        except BaseException as exc:  # handed to the waiting caller
+            with cond:
+                errors[idx] = exc
+                cond.notify_all()
+            return
+        if content is not None:
+            with cond:
+                results[idx] = content
+                cond.notify_all()
+
+    def start(idx: int) -> None:
+        started.append(idx)
+        threading.Thread(
+            target=worker, args=(idx,), name=f"b3th-hedge-{idx}", daemon=True
+        ).start()
+
+    with cond:
+        start(0)
+        cond.wait_for(lambda: winner or errors, timeout=after)
+        if not winner:
+            start(1)
+        while True:
+            if winner and (winner[0] in results or winner[0] in errors):
+                idx = winner[0]
+                break
+            if not winner and len(errors) == len(started):
+                raise errors[0]
+            cond.wait()
+
+    if idx in errors:
+        raise errors[idx]
+    return models[idx], results[idx]
+
+
+# --------------------------------------------------------------------------- #
+# Public functions
+# --------------------------------------------------------------------------- #
+def stream_chat_completion(
+    messages: str | list[dict[str, str]],
+    *,
+    model: str | None = None,
+    temperature: float = 0.3,
+    max_tokens: int = 512,
+    system: str | None = None,
+    timeout: int = 30,
+    retries: int = 4,
+    retry_budget: float = 60.0,
+    record: telemetry.LLMCall | None = None,
+) -> Iterator[str]:
+    """
+    Stream a chat completion from Groq, yielding content deltas as they arrive.
+
+    Takes the same request arguments as ``chat_completion()`` (replies are
+    not cached). Transient errors are retried only until the response
+    starts; a failure mid-stream raises ``LLMError``. The call's telemetry
+    goes into *record* (a fresh one if omitted), emitted when the stream ends.
+    """
+    model = model or _default_model()
+    record = record or telemetry.LLMCall(model=model, stream=True)
+    with _traced(record):
+        url, headers, payload = _build_request(
+            _coerce_messages(messages, system),
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        resp = _post(
+            url,
+            headers,
+            payload,
+            timeout=timeout,
+            retries=retries,
+            retry_budget=retry_budget,
+            record=record,
+        )
+        yield from _iter_sse_deltas(resp, record)
+
+
 def chat_completion(
     messages: str | list[dict[str, str]],
     *,
@@ -68,7 +597,11 @@ def chat_completion(
     stream: bool = False,
     system: str | None = None,
     timeout: int = 30,
-    retries: int = 1,
+    retries: int = 4,
+    retry_budget: float = 60.0,
+    use_cache: bool = True,
+    hedge_after: float | None = None,
+    hedge_model: str | None = None,
 ) -> str:
     """
     Submit a chat-completion request to Groq and return the assistant's content.
@@ -85,62 +618,121 @@ def chat_completion(
     max_tokens
         Maximum tokens in the reply.
     stream
-        Whether to request a streaming response (this wrapper returns the full text).
+        Receive the reply as a server-sent event stream and assemble it
+        locally. Implied inside a ``stream_to()`` block, where each delta is
+        also handed to the active sink.
     system
         Optional system prompt to prepend.
     timeout
         Request timeout in seconds (per attempt).
     retries
-        Number of additional attempts on transient errors (HTTP 429/5xx).
+        Number of additional attempts on transient errors (network, HTTP
+        429/5xx). Waits honour ``Retry-After`` and otherwise use jittered
+        exponential backoff.
+    retry_budget
+        Upper bound in seconds on the total time spent waiting for retries
+        and client-side rate limiting.
+    use_cache
+        Serve identical requests from the on-disk reply cache (see
+        ``b3th.llm_cache``) and store fresh replies in it.
+    hedge_after
+        Seconds to wait for the primary model before racing *hedge_model*
+        against it (defaults: ``B3TH_HEDGE_AFTER`` / ``B3TH_HEDGE_MODEL``).
+        When streaming, the first model to send a token wins; otherwise the
+        first complete reply does. Hedging is off unless both are set.
+    hedge_model
+        Faster model used for the hedge request.
 
     Returns
     -------
     str
         The assistant's response content.
     """
-    # Coerce prompt into the required list-of-dicts format
-    if isinstance(messages, str):
-        messages = [{"role": "user", "content": messages}]
+    messages = _coerce_messages(messages, system)
+    model = model or _default_model()
 
-    if system:
-        messages = [{"role": "system", "content": system}] + messages
+    key: str | None = None
+    if use_cache and llm_cache.is_enabled():
+        key = llm_cache.cache_key(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            base=_api_base(),
+        )
+        cached = llm_cache.get(key)
+        if cached is not None:
+            hit = telemetry.LLMCall(model=model, stream=stream, cached=True)
+            hit.wall_s = hit.elapsed()
+            telemetry.emit(hit)
+            return cached
 
-    url = f"{_api_base()}/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {_api_key()}",
-        "Content-Type": "application/json",
-    }
-    payload: dict[str, Any] = {
-        "model": model or _default_model(),
-        "messages": messages,
+    sink = _TOKEN_SINK.get()
+    request = {
         "temperature": temperature,
         "max_tokens": max_tokens,
-        "stream": stream,  # we request it if asked, but still return a single string
+        "timeout": timeout,
+        "retries": retries,
+        "retry_budget": retry_budget,
     }
 
-    attempt = 0
-    while True:
-        attempt += 1
-        try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
-        except requests.RequestException as exc:
-            if attempt <= retries:
-                time.sleep(min(2**attempt, 8))  # simple backoff
-                continue
-            raise LLMError(f"Network error calling Groq: {exc}") from exc
+    def run(run_model: str, claim: Callable[[], bool]) -> str | None:
+        return _complete(
+            messages,
+            model=run_model,
+            stream=stream,
+            sink=sink,
+            claim=claim,
+            hedge=run_model != model,
+            **request,
+        )
 
-        if resp.status_code == 200:
-            data = resp.json()
-            try:
-                return data["choices"][0]["message"]["content"]
-            except (KeyError, IndexError, TypeError) as exc:
-                raise LLMError(f"Malformed Groq response: {data}") from exc
+    hedge = _hedge_settings(model, hedge_after, hedge_model)
+    if hedge is None:
+        content = run(model, lambda: True) or ""
+    else:
+        after, fast_model = hedge
+        # Whichever model answered, cache under the requested one: that is
+        # the key the same (hedged) call looks up next time.
+        _used, content = _hedged(run, (model, fast_model), after)
 
-        # Retry on transient errors
-        if resp.status_code in (429, 500, 502, 503, 504) and attempt <= retries:
-            time.sleep(min(2**attempt, 8))
-            continue
+    if key is not None:
+        llm_cache.put(key, content)
+    return content
 
-        # Non-retriable or out of retries
-        err_text = _extract_error_text(resp)
-        raise LLMError(f"Groq API error {resp.status_code}: {err_text}")
+
+# --------------------------------------------------------------------------- #
+# Async API
+# --------------------------------------------------------------------------- #
+async def achat_completion(messages: str | list[dict[str, str]], **kwargs: Any) -> str:
+    """
+    Async counterpart of ``chat_completion()``; accepts the same arguments.
+
+    The blocking call runs on a worker thread and shares the pooled session,
+    so many of these can be awaited together (see ``gather_limited()``).
+    """
+    return await asyncio.to_thread(chat_completion, messages, **kwargs)
+
+
+async def gather_limited(
+    aws: Iterable[Awaitable[T]],
+    *,
+    limit: int | None = None,
+    return_exceptions: bool = False,
+) -> list[T | BaseException]:
+    """
+    Await *aws* concurrently with at most *limit* in flight; keep input order.
+
+    *limit* defaults to ``B3TH_LLM_CONCURRENCY`` (4). With
+    *return_exceptions*, failures are returned in place of results instead of
+    being raised, like ``asyncio.gather``.
+    """
+    sem = asyncio.Semaphore(limit or _max_in_flight())
+
+    async def _bounded(aw: Awaitable[T]) -> T:
+        async with sem:
+            return await aw
+
+    return await asyncio.gather(
+        *(_bounded(aw) for aw in aws), return_exceptions=return_exceptions
+    )
@@ -0,0 +1,181 @@
+"""
+Content-addressed on-disk cache for LLM replies.
+
+Entries are keyed on a SHA-256 of the request (API base URL, model,
+messages, temperature, max_tokens) and stored as small JSON files under the
+XDG cache directory:
+
+    $XDG_CACHE_HOME/b3th/llm/<ab>/<sha256>.json   (default ~/.cache/…)
+
+Environment knobs:
+    B3TH_NO_CACHE=1             disable reads and writes
+    B3TH_CACHE_DIR=/path        override the cache directory
+    B3TH_CACHE_TTL=<seconds>    entry lifetime (default 7 days)
+    B3TH_CACHE_MAX_BYTES=<n>    size cap; least-recently-used entries go first
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+_DEFAULT_TTL = 7 * 24 * 3600  # seconds
+_DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Set by the CLI (--no-cache); None means "follow the environment".
+_ENABLED_OVERRIDE: bool | None = None
+
+# Approximate size of each cache directory this process has written to:
+# measured by the first eviction pass, then grown by every write, so the
+# directory is only rescanned when the cap may have been crossed.
+_APPROX_BYTES: dict[Path, int] = {}
+
+
+# --------------------------------------------------------------------------- #
+# Settings
+# --------------------------------------------------------------------------- #
+def _env_number(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def cache_dir() -> Path:
+    """Return the directory holding cached replies."""
+    if env_dir := os.getenv("B3TH_CACHE_DIR"):
+        return Path(env_dir).expanduser()
+    base = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "b3th" / "llm"
+
+
+def set_enabled(flag: bool | None) -> None:
+    """Force the cache on/off for this process (``None`` → use the env)."""
+    global _ENABLED_OVERRIDE
+    _ENABLED_OVERRIDE = flag
+
+
+def is_enabled() -> bool:
+    """Return True unless caching was disabled via CLI or ``B3TH_NO_CACHE``."""
+    if _ENABLED_OVERRIDE is not None:
+        return _ENABLED_OVERRIDE
+    return os.getenv("B3TH_NO_CACHE", "").strip().lower() not in {"1", "true", "yes"}
+
+
+# --------------------------------------------------------------------------- #
+# Keying & storage
+# --------------------------------------------------------------------------- #
+def cache_key(
+    *,
+    model: str,
+    messages: list[dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    base: str | None = None,
+) -> str:
+    """
+    Return the content address for a chat-completion request sent to the
+    API at *base* (so e.g. mock-server replies never answer real requests).
+    """
+    canonical = json.dumps(
+        {
+            "base": base,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return cache_dir() / key[:2] / f"{key}.json"
+
+
+def get(key: str) -> str | None:
+    """Return the cached reply for *key*, or None on a miss/expired entry."""
+    path = _entry_path(key)
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            entry: dict[str, Any] = json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+    ttl = _env_number("B3TH_CACHE_TTL", _DEFAULT_TTL)
+    if time.time() - float(entry.get("created", 0)) > ttl:
+        path.unlink(missing_ok=True)
+        return None
+
+    content = entry.get("content")
+    if not isinstance(content, str):
+        return None
+    try:
+        os.utime(path)  # mtime doubles as "last used" for LRU eviction
+    except OSError:
+        pass
+    return content
+
+
+def put(key: str, content: str) -> None:
+    """Store *content* under *key*, evicting when the size cap may be exceeded."""
+    path = _entry_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see partial files.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError:
+        return  # a cache that can't write is just a cache miss next time
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"created": time.time(), "content": content}, fh)
+            size = fh.tell()
+        os.replace(tmp, path)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+        return
+
+    max_bytes = _env_number("B3TH_CACHE_MAX_BYTES", _DEFAULT_MAX_BYTES)
+    root = cache_dir()
+    approx = _APPROX_BYTES.get(root)
+    if approx is None or approx + size > max_bytes:
+        evict(max_bytes)
+    else:
+        _APPROX_BYTES[root] = approx + size
+
+
+def evict(max_bytes: int) -> int:
+    """Delete least-recently-used entries until the cache fits *max_bytes*."""
+    root = cache_dir()
+    entries: list[tuple[float, int, Path]] = []
+    total = 0
+    for path in root.glob("*/*.json"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+
+    removed = 0
+    for _mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    _APPROX_BYTES[root] = total
+    return removed
+
+
+def clear() -> int:
+    """Remove every cached entry; return how many were deleted."""
+    return evict(0)
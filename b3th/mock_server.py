@@ -0,0 +1,423 @@
+"""
+Local stand-in for Groq's OpenAI-compatible API.
+
+Used by the test-suite and the scripts under ``benchmarks/`` to exercise the
+real HTTP path of ``b3th.llm`` (and the Batch API flow of ``b3th.batch``)
+without network access or API credits.
+
+Usage:
+    with MockGroqServer(reply="feat: add x") as srv:
+        os.environ["GROQ_API_BASE"] = srv.url
+        ...
+
+or standalone, for pointing the CLI at it:
+
+    python -m b3th.mock_server --port 8765 --latency 0.2 --token-rate 300
+    GROQ_API_BASE=http://127.0.0.1:8765 GROQ_API_KEY=x b3th summarize
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import re
+import socket
+import threading
+import time
+from collections.abc import Callable
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Union
+
+_API = "/openai/v1"
+_CHAT_PATH = f"{_API}/chat/completions"
+
+# A fixed reply, or a function computing one from the request payload.
+Reply = Union[str, Callable[[dict[str, Any]], str]]
+
+
+def _pieces(content: str) -> list[str]:
+    """Split *content* into the word-sized "tokens" the server emits."""
+    return re.findall(r"\S+\s*|\s+", content)
+
+
+def _usage(content: str) -> dict[str, int]:
+    words = len(content.split())
+    return {"prompt_tokens": 0, "completion_tokens": words, "total_tokens": words}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive between requests.
+    protocol_version = "HTTP/1.1"
+    server: _Server
+
+    def setup(self) -> None:  # one call per accepted TCP connection
+        super().setup()
+        # Headers and body go out as separate writes; without NODELAY,
+        # Nagle + delayed ACK would add ~40 ms to every keep-alive reply.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *_args: Any) -> None:  # keep test output quiet
+        return
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _read_form(self, raw: bytes) -> dict[str, bytes]:
+        """Parse a ``multipart/form-data`` body into {field name: bytes}."""
+        head = f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n"
+        msg = BytesParser(policy=HTTP).parsebytes(head.encode() + raw)
+        fields: dict[str, bytes] = {}
+        for part in msg.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if name:
+                fields[str(name)] = part.get_payload(decode=True) or b""
+        return fields
+
+    def _send_extra_headers(self) -> None:
+        for name, value in self.server.headers.items():
+            self.send_header(name, value)
+
+    def _send_json(
+        self, status: int, body: dict[str, Any], headers: dict[str, str] | None = None
+    ) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self._send_extra_headers()
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def _stream_reply(self, model: str, content: str) -> None:
+        """Send *content* as an SSE stream, one word (plus spacing) per event."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self._send_extra_headers()
+        self.end_headers()
+        for piece in _pieces(content):
+            self.server.pace(1)
+            event = {
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}}],
+            }
+            self._send_chunk(f"data: {json.dumps(event)}\n\n".encode())
+        # Like Groq, report usage on a final empty-delta chunk under x_groq.
+        final = {
+            "object": "chat.completion.chunk",
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "x_groq": {"usage": _usage(content)},
+        }
+        self._send_chunk(f"data: {json.dumps(final)}\n\n".encode())
+        self._send_chunk(b"data: [DONE]\n\n")
+        self._send_chunk(b"")  # terminating zero-length chunk
+
+    def _completion(self, payload: dict[str, Any], content: str) -> dict[str, Any]:
+        return {
+            "id": f"chatcmpl-{self.server.requests}",
+            "object": "chat.completion",
+            "model": payload.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": _usage(content),
+        }
+
+    def do_POST(self) -> None:  # noqa: N802 (http.server naming)
+        raw = self._read_body()
+        with self.server.lock:
+            self.server.requests += 1
+
+        if self.path not in (_CHAT_PATH, f"{_API}/files", f"{_API}/batches"):
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+
+        with self.server.lock:
+            failure = self.server.failures.pop(0) if self.server.failures else None
+        if failure is not None:
+            status, extra = failure
+            self._send_json(status, {"error": {"message": f"mock {status}"}}, extra)
+            return
+
+        if self.path == f"{_API}/files":
+            fields = self._read_form(raw)
+            self._send_json(200, self.server.add_file(fields.get("file", b"")))
+            return
+        try:
+            payload = json.loads(raw or b"{}")
+        except ValueError:
+            payload = {}
+        if self.path == f"{_API}/batches":
+            batch = self.server.create_batch(payload.get("input_file_id", ""))
+            status = 200 if batch else 404
+            self._send_json(status, batch or {"error": {"message": "no such file"}})
+            return
+
+        content = self.server.reply_for(payload)
+        time.sleep(self.server.latency)  # time to first token
+        if payload.get("stream"):
+            self._stream_reply(payload.get("model", "mock"), content)
+            return
+        self.server.pace(len(_pieces(content)))
+        self._send_json(200, self._completion(payload, content))
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+        with self.server.lock:
+            self.server.requests += 1
+        m = re.fullmatch(rf"{_API}/(batches|files)/([\w-]+)(/content)?", self.path)
+        if m and m.group(1) == "batches" and not m.group(3):
+            batch = self.server.poll_batch(m.group(2))
+            if batch is not None:
+                self._send_json(200, batch)
+                return
+        elif m and m.group(1) == "files" and m.group(3):
+            data = self.server.files.get(m.group(2))
+            if data is not None:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self._send_extra_headers()
+                self.end_headers()
+                self.wfile.write(data)
+                return
+        self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        reply: Reply,
+        *,
+        headers: dict[str, str],
+        batch_polls: int,
+        latency: float,
+        token_rate: float | None,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.reply = reply
+        self.headers = headers
+        self.batch_polls = batch_polls
+        self.latency = latency
+        self.token_rate = token_rate
+        self.failures: list[tuple[int, dict[str, str]]] = []
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self._ids = itertools.count(1)
+
+    def reply_for(self, payload: dict[str, Any]) -> str:
+        return self.reply(payload) if callable(self.reply) else self.reply
+
+    def pace(self, tokens: int) -> None:
+        """Sleep as long as generating *tokens* takes at ``token_rate``."""
+        if self.token_rate:
+            time.sleep(tokens / self.token_rate)
+
+    # -- Batch API ---------------------------------------------------------- #
+    def add_file(self, data: bytes) -> dict[str, Any]:
+        with self.lock:
+            file_id = f"file_{next(self._ids)}"
+            self.files[file_id] = data
+        return {"id": file_id, "object": "file", "bytes": len(data)}
+
+    def create_batch(self, input_file_id: str) -> dict[str, Any] | None:
+        with self.lock:
+            if input_file_id not in self.files:
+                return None
+            batch = {
+                "id": f"batch_{next(self._ids)}",
+                "object": "batch",
+                "input_file_id": input_file_id,
+                "status": "validating",
+                "output_file_id": None,
+                "error_file_id": None,
+                "_polls": 0,
+            }
+            self.batches[batch["id"]] = batch
+        return {k: v for k, v in batch.items() if not k.startswith("_")}
+
+    def poll_batch(self, batch_id: str) -> dict[str, Any] | None:
+        """Advance a batch one step; it completes after ``batch_polls`` polls."""
+        with self.lock:
+            batch = self.batches.get(batch_id)
+            if batch is None:
+                return None
+            batch["_polls"] += 1
+            if batch["status"] != "completed":
+                if batch["_polls"] <= self.batch_polls:
+                    batch["status"] = "in_progress"
+                else:
+                    self._run_batch(batch)
+            return {k: v for k, v in batch.items() if not k.startswith("_")}
+
+    def _run_batch(self, batch: dict[str, Any]) -> None:
+        """Answer every request line; failures go to a separate error file."""
+        out: list[str] = []
+        errors: list[str] = []
+        for line in self.files[batch["input_file_id"]].decode().splitlines():
+            if not line.strip():
+                continue
+            req = json.loads(line)
+            result: dict[str, Any] = {"custom_id": req.get("custom_id")}
+            try:
+                content = self.reply_for(req.get("body", {}))
+            except Exception as exc:  # noqa: BLE001 (reported per line)
+                result["error"] = {"code": "mock_error", "message": str(exc)}
+                errors.append(json.dumps(result))
+                continue
+            body = {
+                "object": "chat.completion",
+                "choices": [{"message": {"role": "assistant", "content": content}}],
+            }
+            result.update(response={"status_code": 200, "body": body}, error=None)
+            out.append(json.dumps(result))
+        for key, lines in (("output_file_id", out), ("error_file_id", errors)):
+            if lines:
+                file_id = f"file_{next(self._ids)}"
+                self.files[file_id] = ("\n".join(lines) + "\n").encode()
+                batch[key] = file_id
+        batch["status"] = "completed"
+
+
+class MockGroqServer:
+    """
+    Threaded HTTP server answering ``POST /openai/v1/chat/completions``,
+    either as one JSON body or, when the request sets ``stream``, as an SSE
+    stream of ``chat.completion.chunk`` events.
+
+    The Batch API subset used by ``b3th.batch`` is also served: ``/files``
+    uploads and downloads, ``/batches`` creation and polling. A batch reports
+    ``in_progress`` for *batch_polls* polls and then completes, running
+    *reply* over every line; a reply callable that raises produces a line in
+    the batch's error file.
+
+    Attributes
+    ----------
+    url
+        Base URL suitable for ``GROQ_API_BASE``.
+    requests
+        Number of requests served so far.
+    connections
+        Number of TCP connections accepted so far (keep-alive reuse shows up
+        as ``connections < requests``).
+
+    *headers* are added to every response (e.g. ``x-ratelimit-*``), and
+    ``fail_next()`` queues error replies to exercise retry paths. To model a
+    real provider, *latency* delays the first byte of each chat reply (in
+    seconds) and *token_rate* limits generation to that many words/second.
+    """
+
+    def __init__(
+        self,
+        reply: Reply = "mock reply",
+        *,
+        headers: dict[str, str] | None = None,
+        batch_polls: int = 1,
+        latency: float = 0.0,
+        token_rate: float | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self._server = _Server(
+            (host, port),
+            reply,
+            headers=dict(headers or {}),
+            batch_polls=batch_polls,
+            latency=latency,
+            token_rate=token_rate,
+        )
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="b3th-mock-groq", daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    @property
+    def connections(self) -> int:
+        return self._server.connections
+
+    def fail_next(self, *statuses: int, retry_after: str | None = None) -> None:
+        """Answer the next requests with these error statuses, in order."""
+        extra = {"retry-after": retry_after} if retry_after is not None else {}
+        with self._server.lock:
+            self._server.failures.extend((status, extra) for status in statuses)
+
+    def start(self) -> MockGroqServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> MockGroqServer:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the mock server in the foreground until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="python -m b3th.mock_server",
+        description="Local OpenAI-compatible stand-in for the Groq API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--reply", default="feat: mock change\n\n- mock bullet")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds before the first byte"
+    )
+    parser.add_argument(
+        "--token-rate", type=float, default=None, help="words per second"
+    )
+    args = parser.parse_args(argv)
+
+    srv = MockGroqServer(
+        args.reply,
+        latency=args.latency,
+        token_rate=args.token_rate,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Mock Groq API on {srv.url} (Ctrl-C to stop)", flush=True)
+    try:
+        srv._server.serve_forever()  # noqa: SLF001 (foreground, no thread)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv._server.server_close()  # noqa: SLF001
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,533 @@
+"""
+object_store.py – read-only, in-process access to a repository's objects.
+
+Reads loose objects (zlib) and packfiles (v2 ``.idx`` + ``.pack``, mapped
+with mmap), resolving OFS/REF deltas through a small LRU cache of delta
+bases, so reading an object costs no process at all:
+
+    with ObjectStore(".") as store:
+        obj = store.read("e69de29bb2d1d6434b8b29ae775ad8c2e48c5391")
+
+Only full SHA-1 object ids are handled. Anything else — revision syntax
+(``HEAD:path``), SHA-256 repositories, unknown index versions, corrupt
+data — raises ``ObjectStoreError`` or is skipped by ``read_many`` so the
+caller can fall back to ``git cat-file``.
+
+``git_utils.read_object`` / ``read_many`` use this reader first when
+``B3TH_OBJECT_STORE=1`` is set.
+"""
+
+from __future__ import annotations
+
+import atexit
+import mmap
+import re
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+
+from .git_index import find_repo
+from .git_utils import GitObject
+
+
+class ObjectStoreError(RuntimeError):
+    """Raised when an object cannot be read in-process."""
+
+
+_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+_TYPE_IDS = {name: num for num, name in _TYPES.items()}
+_OFS_DELTA, _REF_DELTA = 6, 7
+
+_IDX_MAGIC = b"\377tOc"
+_IDX_HEADER = 8 + 256 * 4  # magic, version, fan-out table
+_OID_RE = re.compile(r"[0-9a-f]{40}")
+
+_INFLATE_CHUNK = 64 * 1024
+_HEAD_CHUNK = 4096  # compressed bytes read to decode a header or delta sizes
+_MAX_DELTA_CHAIN = 10_000  # guards against cycles in corrupt packs
+_DEFAULT_CACHE_BYTES = 32 * 1024 * 1024  # delta-base cache budget
+
+
+# --------------------------------------------------------------------------- #
+# Repository layout
+# --------------------------------------------------------------------------- #
+def _git_dir(repo: Path) -> Path:
+    """Return the git directory for *repo* (handles worktrees and bare repos)."""
+    found = find_repo(repo)
+    if found is None:
+        raise ObjectStoreError(f"{repo} is not a Git repository")
+    return found[1]
+
+
+def _object_dirs(git_dir: Path) -> list[Path]:
+    """Return the object directory plus any alternates."""
+    common = git_dir
+    if (git_dir / "commondir").is_file():
+        rel = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+        common = (git_dir / rel).resolve()
+
+    config = common / "config"
+    text = config.read_text("utf-8", "replace") if config.is_file() else ""
+    if re.search(r"objectformat\s*=\s*sha256", text, re.IGNORECASE):
+        raise ObjectStoreError("SHA-256 repositories are not supported")
+
+    objects = common / "objects"
+    dirs = [objects]
+    alternates = objects / "info" / "alternates"
+    if alternates.is_file():
+        for line in alternates.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                dirs.append((objects / line).resolve())
+    return dirs
+
+
+# --------------------------------------------------------------------------- #
+# Encoding helpers
+# --------------------------------------------------------------------------- #
+def _inflate(buf: bytes | mmap.mmap, pos: int, size: int) -> bytes:
+    """Inflate the zlib stream at *pos*, expecting *size* bytes of output."""
+    inflater = zlib.decompressobj()
+    parts = []
+    # Deflate never grows data by more than a few bytes per 16 KiB block, so
+    # the first slice almost always holds the whole stream.
+    step = size + 64
+    while not inflater.eof:
+        chunk = buf[pos : pos + step]
+        if not chunk:
+            raise ObjectStoreError("truncated zlib stream")
+        parts.append(inflater.decompress(chunk))
+        pos += len(chunk)
+        step = _INFLATE_CHUNK
+    data = b"".join(parts)
+    if len(data) != size:
+        raise ObjectStoreError(f"expected {size} bytes, inflated {len(data)}")
+    return data
+
+
+def _inflate_head(buf: bytes | mmap.mmap, pos: int, limit: int) -> bytes:
+    """Inflate at most *limit* bytes from the start of the zlib stream at *pos*."""
+    return zlib.decompressobj().decompress(buf[pos : pos + _HEAD_CHUNK], limit)
+
+
+def _delta_size(delta: bytes, pos: int) -> tuple[int, int]:
+    """Decode a delta header size (little-endian base-128)."""
+    value = shift = 0
+    while True:
+        byte = delta[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild an object from its *base* and a git binary *delta*."""
+    base_size, pos = _delta_size(delta, 0)
+    result_size, pos = _delta_size(delta, pos)
+    if base_size != len(base):
+        raise ObjectStoreError("delta base size mismatch")
+
+    source = memoryview(base)  # slices without copying
+    out = bytearray()
+    end = len(delta)
+    while pos < end:
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:  # copy from base
+            offset = size = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += source[offset : offset + (size or 0x10000)]
+        elif op:  # insert literal bytes
+            out += delta[pos : pos + op]
+            pos += op
+        else:
+            raise ObjectStoreError("invalid delta opcode 0")
+
+    if len(out) != result_size:
+        raise ObjectStoreError("delta result size mismatch")
+    return bytes(out)
+
+
+# --------------------------------------------------------------------------- #
+# Packfiles
+# --------------------------------------------------------------------------- #
+def _map(path: Path) -> mmap.mmap:
+    with path.open("rb") as fh:
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _Pack:
+    """One ``pack-*.idx`` / ``pack-*.pack`` pair, memory-mapped."""
+
+    def __init__(self, idx_path: Path) -> None:
+        self.idx = _map(idx_path)
+        try:
+            self.data = _map(idx_path.with_suffix(".pack"))
+        except OSError:
+            self.idx.close()
+            raise
+        if self.idx[:4] != _IDX_MAGIC or struct.unpack_from(">I", self.idx, 4) != (2,):
+            self.close()
+            raise ObjectStoreError(f"unsupported pack index: {idx_path.name}")
+        if self.data[:4] != b"PACK":
+            self.close()
+            raise ObjectStoreError(f"not a packfile: {idx_path.name}")
+
+        self.fanout = struct.unpack_from(">256I", self.idx, 8)
+        count = self.fanout[255]
+        self._offsets = _IDX_HEADER + 24 * count  # after oids and CRCs
+        self._large = self._offsets + 4 * count
+
+    def close(self) -> None:
+        self.idx.close()
+        self.data.close()
+
+    def find(self, oid: bytes) -> int | None:
+        """Return the pack offset of *oid* (20 raw bytes), if present."""
+        first = oid[0]
+        lo = self.fanout[first - 1] if first else 0
+        hi = self.fanout[first]
+        idx = self.idx
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = _IDX_HEADER + 20 * mid
+            probe = idx[start : start + 20]
+            if probe < oid:
+                lo = mid + 1
+            elif probe > oid:
+                hi = mid
+            else:
+                return self._offset(mid)
+        return None
+
+    def _offset(self, i: int) -> int:
+        (offset,) = struct.unpack_from(">I", self.idx, self._offsets + 4 * i)
+        if offset & 0x80000000:  # index into the 64-bit offset table
+            pos = self._large + 8 * (offset & 0x7FFFFFFF)
+            (offset,) = struct.unpack_from(">Q", self.idx, pos)
+        return offset
+
+    def entry(self, offset: int) -> tuple[int, int, int]:
+        """Return ``(type, size, data position)`` of the entry at *offset*."""
+        data = self.data
+        byte = data[offset]
+        pos = offset + 1
+        kind, size, shift = (byte >> 4) & 7, byte & 0x0F, 4
+        while byte & 0x80:
+            byte = data[pos]
+            pos += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+        return kind, size, pos
+
+    def ofs_base(self, pos: int) -> tuple[int, int]:
+        """Decode an OFS_DELTA back-reference; return ``(distance, new pos)``."""
+        data = self.data
+        byte = data[pos]
+        pos += 1
+        distance = byte & 0x7F
+        while byte & 0x80:
+            byte = data[pos]
+            pos += 1
+            distance = ((distance + 1) << 7) | (byte & 0x7F)
+        return distance, pos
+
+
+# --------------------------------------------------------------------------- #
+# Object store
+# --------------------------------------------------------------------------- #
+class ObjectStore:
+    """
+    Read-only view of a repository's object database.
+
+    Thread-safe. New packs (after ``git gc`` or a fetch) are picked up on
+    the first miss; call ``close()`` (or use a ``with`` block) to unmap them.
+    """
+
+    def __init__(
+        self, repo: str | Path = ".", *, cache_bytes: int = _DEFAULT_CACHE_BYTES
+    ) -> None:
+        self.dirs = _object_dirs(_git_dir(Path(repo).resolve()))
+        self.cache_bytes = cache_bytes
+        self._packs: dict[Path, _Pack] = {}
+        self._cache: OrderedDict[tuple[int, int], tuple[int, bytes]] = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.RLock()
+        self._scan()
+
+    def close(self) -> None:
+        """Unmap every pack and drop the delta-base cache."""
+        with self._lock:
+            for pack in self._packs.values():
+                pack.close()
+            self._packs.clear()
+            self._cache.clear()
+            self._cached_bytes = 0
+
+    def __enter__(self) -> ObjectStore:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    # -- public API ---------------------------------------------------------- #
+    def read(self, oid: str) -> GitObject | None:
+        """
+        Return the object named by the 40-hex *oid*, or ``None`` if it is not
+        in this object database. Raises ``ObjectStoreError`` for anything
+        that needs git itself (non-oid specs, corrupt or unsupported data).
+        """
+        if not _OID_RE.fullmatch(oid):
+            raise ObjectStoreError(f"not a full object id: {oid!r}")
+        try:
+            with self._lock:
+                found = self._read(bytes.fromhex(oid))
+        except (IndexError, ValueError, OSError, struct.error, zlib.error) as exc:
+            raise ObjectStoreError(f"cannot read {oid}: {exc}") from exc
+        if found is None:
+            return None
+        kind, data = found
+        return GitObject(oid, _TYPES[kind], len(data), data)
+
+    def stat(self, oid: str) -> GitObject | None:
+        """
+        Like ``read`` but without the content (``data`` is ``None``): only
+        object headers (and the first bytes of deltas) are inflated, so the
+        size of a huge blob costs no more than that of a small one.
+        """
+        if not _OID_RE.fullmatch(oid):
+            raise ObjectStoreError(f"not a full object id: {oid!r}")
+        try:
+            with self._lock:
+                found = self._header(bytes.fromhex(oid))
+        except (IndexError, ValueError, OSError, struct.error, zlib.error) as exc:
+            raise ObjectStoreError(f"cannot read {oid}: {exc}") from exc
+        if found is None:
+            return None
+        kind, size = found
+        return GitObject(oid, _TYPES[kind], size, None)
+
+    def read_many(
+        self, specs: Iterable[str], *, content: bool = True
+    ) -> dict[str, GitObject]:
+        """
+        Read what can be read in-process; specs that are missing, not full
+        object ids or unreadable are left out for ``git cat-file``. With
+        ``content=False`` only types and sizes are read (see ``stat``).
+        """
+        lookup = self.read if content else self.stat
+        found: dict[str, GitObject] = {}
+        for spec in specs:
+            try:
+                obj = lookup(spec)
+            except ObjectStoreError:
+                continue
+            if obj is not None:
+                found[spec] = obj
+        return found
+
+    # -- lookup -------------------------------------------------------------- #
+    def _scan(self) -> None:
+        for objects in self.dirs:
+            for idx in sorted((objects / "pack").glob("pack-*.idx")):
+                if idx in self._packs or not idx.with_suffix(".pack").is_file():
+                    continue
+                try:
+                    self._packs[idx] = _Pack(idx)
+                except (ObjectStoreError, OSError, ValueError):
+                    continue  # unreadable pack: git will serve its objects
+
+    def _locate(self, oid: bytes) -> tuple[_Pack, int] | None:
+        for pack in self._packs.values():
+            offset = pack.find(oid)
+            if offset is not None:
+                return pack, offset
+        return None
+
+    def _read(self, oid: bytes) -> tuple[int, bytes] | None:
+        located = self._locate(oid)
+        if located is None:
+            loose = self._read_loose(oid.hex())
+            if loose is not None:
+                return loose
+            self._scan()  # maybe a pack appeared since we looked
+            located = self._locate(oid)
+            if located is None:
+                return None
+        return self._unpack(*located)
+
+    def _read_loose(self, hex_oid: str) -> tuple[int, bytes] | None:
+        for objects in self.dirs:
+            path = objects / hex_oid[:2] / hex_oid[2:]
+            try:
+                raw = zlib.decompress(path.read_bytes())
+            except FileNotFoundError:
+                continue
+            header, _, data = raw.partition(b"\0")
+            kind, _, size = header.decode("ascii").partition(" ")
+            if kind not in _TYPE_IDS or int(size) != len(data):
+                raise ObjectStoreError(f"corrupt loose object {hex_oid}")
+            return _TYPE_IDS[kind], data
+        return None
+
+    def _header(self, oid: bytes) -> tuple[int, int] | None:
+        """Return ``(type, size)`` of *oid* without inflating its content."""
+        located = self._locate(oid)
+        if located is None:
+            loose = self._loose_header(oid.hex())
+            if loose is not None:
+                return loose
+            self._scan()
+            located = self._locate(oid)
+            if located is None:
+                return None
+        pack, offset = located
+        kind, size, pos = pack.entry(offset)
+        if kind == _OFS_DELTA:
+            pos = pack.ofs_base(pos)[1]
+        elif kind == _REF_DELTA:
+            pos += 20
+        else:
+            return kind, size
+        # A delta starts with its base's size and then the result's size.
+        head = _inflate_head(pack.data, pos, 20)
+        result_size = _delta_size(head, _delta_size(head, 0)[1])[0]
+        return self._base_kind(pack, offset), result_size
+
+    def _base_kind(self, pack: _Pack, offset: int) -> int:
+        """Follow a delta chain through entry headers to the base's type."""
+        for _ in range(_MAX_DELTA_CHAIN):
+            kind, _size, pos = pack.entry(offset)
+            if kind == _OFS_DELTA:
+                offset -= pack.ofs_base(pos)[0]
+            elif kind == _REF_DELTA:
+                base_oid = bytes(pack.data[pos : pos + 20])
+                located = self._locate(base_oid)
+                if located is None:
+                    loose = self._loose_header(base_oid.hex())
+                    if loose is None:
+                        raise ObjectStoreError(f"missing delta base {base_oid.hex()}")
+                    return loose[0]
+                pack, offset = located
+            elif kind in _TYPES:
+                return kind
+            else:
+                raise ObjectStoreError(f"unknown pack entry type {kind}")
+        raise ObjectStoreError("delta chain too long")
+
+    def _loose_header(self, hex_oid: str) -> tuple[int, int] | None:
+        for objects in self.dirs:
+            path = objects / hex_oid[:2] / hex_oid[2:]
+            try:
+                with path.open("rb") as fh:
+                    head = _inflate_head(fh.read(_HEAD_CHUNK), 0, 64)
+            except FileNotFoundError:
+                continue
+            header, sep, _ = head.partition(b"\0")
+            kind, _, size = header.decode("ascii").partition(" ")
+            if not sep or kind not in _TYPE_IDS or not size.isdigit():
+                raise ObjectStoreError(f"corrupt loose object {hex_oid}")
+            return _TYPE_IDS[kind], int(size)
+        return None
+
+    # -- packs & deltas ------------------------------------------------------ #
+    def _unpack(self, pack: _Pack, offset: int) -> tuple[int, bytes]:
+        """Read the packed object at *offset*, applying its delta chain."""
+        chain: list[tuple[_Pack, int, int, int]] = []  # deltas, outermost first
+        base_key: tuple[int, int] | None = None
+        while True:
+            if len(chain) > _MAX_DELTA_CHAIN:
+                raise ObjectStoreError("delta chain too long")
+            key = (id(pack), offset)
+            cached = self._cache_get(key)
+            if cached is not None:
+                kind, data = cached
+                break
+            kind, size, pos = pack.entry(offset)
+            if kind == _OFS_DELTA:
+                distance, pos = pack.ofs_base(pos)
+                chain.append((pack, offset, pos, size))
+                offset -= distance
+                continue
+            if kind == _REF_DELTA:
+                base_oid = bytes(pack.data[pos : pos + 20])
+                chain.append((pack, offset, pos + 20, size))
+                located = self._locate(base_oid)
+                if located is None:
+                    loose = self._read_loose(base_oid.hex())
+                    if loose is None:
+                        raise ObjectStoreError(f"missing delta base {base_oid.hex()}")
+                    kind, data = loose
+                    break
+                pack, offset = located
+                continue
+            if kind not in _TYPES:
+                raise ObjectStoreError(f"unknown pack entry type {kind}")
+            data = _inflate(pack.data, pos, size)
+            base_key = key
+            break
+
+        for delta_pack, delta_offset, pos, size in reversed(chain):
+            if base_key is not None:
+                self._cache_put(base_key, kind, data)
+            data = apply_delta(data, _inflate(delta_pack.data, pos, size))
+            base_key = (id(delta_pack), delta_offset)
+        return kind, data
+
+    def _cache_get(self, key: tuple[int, int]) -> tuple[int, bytes] | None:
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+        return hit
+
+    def _cache_put(self, key: tuple[int, int], kind: int, data: bytes) -> None:
+        if key in self._cache or len(data) > self.cache_bytes // 4:
+            return
+        self._cache[key] = (kind, data)
+        self._cached_bytes += len(data)
+        while self._cached_bytes > self.cache_bytes:
+            _, (_, old) = self._cache.popitem(last=False)
+            self._cached_bytes -= len(old)
+
+
+# --------------------------------------------------------------------------- #
+# Shared stores
+# --------------------------------------------------------------------------- #
+_STORES: dict[Path, ObjectStore | None] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def shared_store(path: str | Path = ".") -> ObjectStore | None:
+    """Return the shared store for *path*, or ``None`` if it can't be opened."""
+    key = Path(path).resolve()
+    with _STORES_LOCK:
+        if key not in _STORES:
+            try:
+                _STORES[key] = ObjectStore(key)
+            except (ObjectStoreError, OSError):
+                _STORES[key] = None
+        return _STORES[key]
+
+
+def close_stores() -> None:
+    """Close every shared store (runs at exit)."""
+    with _STORES_LOCK:
+        stores = [s for s in _STORES.values() if s is not None]
+        _STORES.clear()
+    for store in stores:
+        store.close()
+
+
+atexit.register(close_stores)
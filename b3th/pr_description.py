@@ -7,12 +7,16 @@ Usage:
 
 from __future__ import annotations
 
-import subprocess
+import asyncio
 import textwrap
 from pathlib import Path
 
-from . import llm
-from .git_utils import GitError, is_git_repo
+from . import llm, prompt_budget
+from .git_utils import (  # noqa: F401 (GitError re-exported)
+    GitError,
+    ais_git_repo,
+    arun_git,
+)
 
 
 class PRDescriptionError(RuntimeError):
@@ -20,27 +24,37 @@ class PRDescriptionError(RuntimeError):
 
 
 # Internal git helpers
-def _run_git(args: list[str], cwd: Path | str | None = None) -> str:
-    """Run `git <args>` and return stdout (strip newline)."""
-    result = subprocess.run(  # noqa: S603,S607
-        ["git", *args],
-        cwd=cwd,
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise GitError(result.stderr.strip() or f"git {' '.join(args)} failed")
-    return result.stdout.strip()
-
-
-def _branch_diff(repo_path: str | Path, base: str) -> str:
+async def _branch_diff(repo_path: str | Path, base: str) -> str:
     """Return `git diff --stat` output between *base* and HEAD."""
-    return _run_git(["diff", "--stat", f"{base}..HEAD"], cwd=repo_path)
+    return await arun_git(["diff", "--stat", f"{base}..HEAD"], cwd=repo_path)
 
 
-def _commit_messages(repo_path: str | Path, base: str) -> str:
+async def _commit_messages(repo_path: str | Path, base: str) -> str:
     """Return one-line commit summaries between *base* and HEAD (oldest→newest)."""
-    return _run_git(["log", "--reverse", "--pretty=%s", f"{base}..HEAD"], cwd=repo_path)
+    args = ["log", "--reverse", "--pretty=%s", f"{base}..HEAD"]
+    return await arun_git(args, cwd=repo_path)
+
+
+async def _gather_inputs(repo_path: Path, base: str) -> tuple[str, str]:
+    """
+    Run the repository check, diff stat and commit log concurrently.
+
+    The three queries are independent, so this takes as long as the
+    slowest of them. Raises ``PRDescriptionError`` if *repo_path* is not a
+    repository, else the first ``GitError``.
+    """
+    is_repo, diff, commits = await asyncio.gather(
+        ais_git_repo(repo_path),
+        _branch_diff(repo_path, base),
+        _commit_messages(repo_path, base),
+        return_exceptions=True,
+    )
+    if is_repo is not True:
+        raise PRDescriptionError(f"{repo_path} is not a Git repository.")
+    for result in (diff, commits):
+        if isinstance(result, BaseException):
+            raise result
+    return diff, commits
 
 
 # Prompt helpers
@@ -100,16 +114,18 @@ def generate_pr_description(
     PRDescriptionError
         When the diff is empty or the LLM fails.
     """
-    repo_path = Path(repo_path)
-
-    if not is_git_repo(repo_path):
-        raise PRDescriptionError(f"{repo_path} is not a Git repository.")
-
-    diff = _branch_diff(repo_path, base)
+    diff, commits = asyncio.run(_gather_inputs(Path(repo_path), base))
     if not diff.strip():
         raise PRDescriptionError("No changes between HEAD and base branch.")
 
-    commits = _commit_messages(repo_path, base)
+    # Trim long branches to the model's context window; the stat summary
+    # line ("N files changed, …") is always kept.
+    budget = prompt_budget.prompt_budget(
+        model, reply_tokens=max_tokens, overhead=_SYSTEM_PROMPT
+    )
+    diff_budget, commits_budget = prompt_budget.share(budget, [diff, commits])
+    diff = prompt_budget.fit_lines(diff, diff_budget, keep_last=1)
+    commits = prompt_budget.fit_lines(commits, commits_budget)
 
     try:
         response = llm.chat_completion(
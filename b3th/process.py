@@ -0,0 +1,140 @@
+"""
+External processes that stop when asked to.
+
+``subprocess.run(timeout=…)`` kills only the direct child: a hung ``git
+push`` leaves its ``ssh`` / ``git-remote-https`` helper (or a hook's test
+suite) running, and Ctrl-C during a captured command relies on the child
+sharing the terminal's process group. ``run_process`` can start a command
+in its own process group and, on timeout or interrupt, signals the whole
+group: first politely (``SIGTERM`` on timeout, ``SIGINT`` on Ctrl-C, both of
+which git handles by removing its lock files), then ``SIGKILL`` after a
+short grace period.
+
+How long each class of command may run is ``config.get_timeout``'s job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import subprocess
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+_GRACE = 2.0  # seconds between the polite signal and SIGKILL
+
+_SIGKILL = getattr(signal, "SIGKILL", signal.SIGTERM)  # Windows has no SIGKILL
+
+
+def group_kwargs(new_group: bool) -> dict[str, Any]:
+    """``Popen`` keyword arguments that start the child in its own process group."""
+    if not new_group:
+        return {}
+    if os.name == "nt":  # pragma: no cover
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def signal_group(pid: int, sig: int, new_group: bool) -> None:
+    """Send *sig* to the group led by *pid* (or just *pid*); ignore if gone."""
+    try:
+        if new_group and os.name != "nt":
+            os.killpg(pid, sig)
+        else:
+            os.kill(pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def stop(
+    proc: subprocess.Popen[Any], *, new_group: bool, sig: int = signal.SIGTERM
+) -> None:
+    """
+    Stop *proc*: send *sig*, wait up to ``_GRACE`` seconds, then ``SIGKILL``.
+
+    With *new_group* the signals go to the whole process group, so helpers
+    git spawned are stopped too (the final ``SIGKILL`` sweeps any stragglers
+    even when git itself exited promptly).
+    """
+    if proc.poll() is None:
+        signal_group(proc.pid, sig, new_group)
+        try:
+            proc.wait(_GRACE)
+        except subprocess.TimeoutExpired:
+            pass
+    if new_group:
+        signal_group(proc.pid, _SIGKILL, new_group)
+    elif proc.poll() is None:
+        proc.kill()
+    proc.wait()
+
+
+async def astop(
+    proc: asyncio.subprocess.Process, *, new_group: bool, sig: int = signal.SIGTERM
+) -> None:
+    """Async counterpart of ``stop()`` for ``asyncio`` subprocesses."""
+    if proc.returncode is None:
+        signal_group(proc.pid, sig, new_group)
+        try:
+            await asyncio.wait_for(proc.wait(), _GRACE)
+        except asyncio.TimeoutError:
+            pass
+    if new_group:
+        signal_group(proc.pid, _SIGKILL, new_group)
+    elif proc.returncode is None:
+        proc.kill()
+    await proc.wait()
+
+
+def run_process(
+    cmd: Sequence[str],
+    *,
+    cwd: Path | str | None = None,
+    env: dict[str, str] | None = None,
+    input: str | None = None,  # noqa: A002 (mirrors subprocess)
+    capture: bool = True,
+    timeout: float | None = None,
+    new_group: bool = False,
+) -> subprocess.CompletedProcess[str]:
+    """
+    Run *cmd* like ``subprocess.run(..., text=True)`` and return the result.
+
+    On timeout the command (its whole process group with *new_group*) is
+    stopped and ``subprocess.TimeoutExpired`` is raised. On Ctrl-C it is
+    sent ``SIGINT`` and stopped before ``KeyboardInterrupt`` propagates, so
+    nothing is left running in the background.
+    """
+    pipe = subprocess.PIPE if capture else None
+    proc = subprocess.Popen(  # noqa: S603 (intentional external command)
+        list(cmd),
+        cwd=cwd,
+        env=env,
+        stdin=None if input is None else subprocess.PIPE,
+        stdout=pipe,
+        stderr=pipe,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        **group_kwargs(new_group),
+    )
+    try:
+        out, err = proc.communicate(input, timeout=timeout)
+    except BaseException as exc:
+        sig = signal.SIGTERM
+        if not isinstance(exc, subprocess.TimeoutExpired):
+            sig = signal.SIGINT  # Ctrl-C (or another interruption)
+        try:
+            stop(proc, new_group=new_group, sig=sig)
+        finally:
+            # Helpers outside the group may still hold the pipes open; don't
+            # wait for them to let go.
+            for stream in (proc.stdin, proc.stdout, proc.stderr):
+                if stream is not None:
+                    try:
+                        stream.close()
+                    except OSError:
+                        pass
+        raise
+    return subprocess.CompletedProcess(list(cmd), proc.returncode, out, err)
@@ -0,0 +1,260 @@
+"""
+Prompt token budgeting.
+
+Keeps LLM prompts inside the model's context window (and a cost cap) before
+they are sent:
+
+    budget = prompt_budget(model, reply_tokens=300, overhead=_SYSTEM_PROMPT)
+    diff = fit_diff(diff, budget)
+
+Token counts are estimated offline (no tokenizer download). ``fit_diff``
+ranks hunks by importance and reduces low-value or very large files to a
+one-line stat; ``fit_lines`` trims line-oriented text such as commit lists.
+
+Environment:
+    B3TH_PROMPT_MAX_TOKENS   hard cap on prompt tokens (default 24000)
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from fnmatch import fnmatch
+
+from . import git_utils, llm
+
+# Context windows (tokens) for models commonly used through Groq.
+MODEL_CONTEXT: dict[str, int] = {
+    "llama-3.3-70b-versatile": 131_072,
+    "llama-3.1-8b-instant": 131_072,
+    "llama3-70b-8192": 8_192,
+    "llama3-8b-8192": 8_192,
+    "gemma2-9b-it": 8_192,
+    "mixtral-8x7b-32768": 32_768,
+    "openai/gpt-oss-120b": 131_072,
+    "openai/gpt-oss-20b": 131_072,
+}
+_DEFAULT_CONTEXT = 8_192  # unknown models: assume a small window
+_DEFAULT_MAX_PROMPT = 24_000
+_SAFETY_MARGIN = 256  # estimator error + chat-format framing
+
+# A file bigger than this share of the budget is only kept if room remains.
+_LARGE_FILE_SHARE = 0.5
+
+# Files whose diffs rarely help explain a change.
+LOW_VALUE_GLOBS: tuple[str, ...] = (
+    *git_utils.LOCKFILE_GLOBS,
+    *git_utils.GENERATED_GLOBS,
+    "*.svg",
+)
+_DOC_GLOBS = ("*.md", "*.rst", "*.txt", "docs/*", "*.toml", "*.cfg", "*.ini")
+_TEST_GLOBS = ("tests/*", "test/*", "*_test.*", "test_*", "*.spec.*", "*.test.*")
+
+# Approximates BPE splitting: short letter runs, digit groups, single symbols.
+_TOKEN_RE = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|[^\sA-Za-z\d]")
+
+
+# --------------------------------------------------------------------------- #
+# Estimation & budgets
+# --------------------------------------------------------------------------- #
+def estimate_tokens(text: str) -> int:
+    """Return an offline estimate of how many tokens *text* costs."""
+    if not text:
+        return 0
+    return len(_TOKEN_RE.findall(text)) + text.count("\n")
+
+
+def context_window(model: str | None = None) -> int:
+    """Return the context size (tokens) for *model* (default model if None)."""
+    return MODEL_CONTEXT.get(model or llm._default_model(), _DEFAULT_CONTEXT)
+
+
+def prompt_budget(
+    model: str | None = None, *, reply_tokens: int, overhead: str = ""
+) -> int:
+    """
+    Return how many tokens the variable part of a prompt may use.
+
+    *overhead* is the fixed text sent alongside (system prompt, template).
+    """
+    try:
+        cap = int(os.getenv("B3TH_PROMPT_MAX_TOKENS", _DEFAULT_MAX_PROMPT))
+    except ValueError:
+        cap = _DEFAULT_MAX_PROMPT
+    room = context_window(model) - reply_tokens - _SAFETY_MARGIN
+    return max(0, min(room, cap) - estimate_tokens(overhead))
+
+
+# --------------------------------------------------------------------------- #
+# Line-oriented text
+# --------------------------------------------------------------------------- #
+def fit_lines(text: str, budget: int, *, keep_last: int = 0) -> str:
+    """
+    Trim *text* to *budget* tokens, dropping whole lines from the middle.
+
+    The first lines are kept greedily; the final *keep_last* lines (e.g. a
+    ``diff --stat`` summary) are always kept. A marker notes what was cut.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    lines = text.splitlines()
+    tail = lines[len(lines) - keep_last :] if keep_last else []
+    body = lines[: len(lines) - len(tail)]
+
+    used = sum(estimate_tokens(ln) + 1 for ln in tail) + 12  # + marker
+    kept: list[str] = []
+    for line in body:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    omitted = len(body) - len(kept)
+    return "\n".join([*kept, f"[… {omitted} more lines omitted]", *tail])
+
+
+# --------------------------------------------------------------------------- #
+# Unified diffs
+# --------------------------------------------------------------------------- #
+class _FileDiff:
+    """One ``diff --git`` section split into header and hunks."""
+
+    __slots__ = ("path", "header", "hunks", "additions", "deletions", "binary")
+
+    def __init__(self, text: str) -> None:
+        parts = re.split(r"(?m)^(?=@@)", text)
+        self.header = parts[0]
+        self.hunks = parts[1:]
+        m = re.match(r"diff --git a/(.*?) b/(.*)", text)
+        self.path = m.group(2) if m else text.splitlines()[0]
+        self.binary = "\nBinary files " in self.header or "GIT binary patch" in text
+        self.additions = self.deletions = 0
+        for hunk in self.hunks:
+            for line in hunk.splitlines():
+                if line.startswith("+"):
+                    self.additions += 1
+                elif line.startswith("-"):
+                    self.deletions += 1
+
+    def stat_line(self, reason: str) -> str:
+        if self.binary:
+            return f"{self.path} | binary (diff omitted: {reason})\n"
+        return (
+            f"{self.path} | +{self.additions} -{self.deletions} "
+            f"(diff omitted: {reason})\n"
+        )
+
+    def weight(self) -> int:
+        """Importance of this file's hunks: source > tests > docs > low-value."""
+        path = self.path
+
+        def matches(globs: tuple[str, ...]) -> bool:
+            name = path.rsplit("/", 1)[-1]
+            return any(fnmatch(path, g) or fnmatch(name, g) for g in globs)
+
+        if self.binary or matches(LOW_VALUE_GLOBS):
+            return 0
+        if matches(_TEST_GLOBS):
+            return 2
+        if matches(_DOC_GLOBS):
+            return 1
+        return 3
+
+
+def _split_files(diff: str) -> tuple[str, list[_FileDiff]]:
+    """Return (preamble, files) for a multi-file unified diff."""
+    chunks = re.split(r"(?m)^(?=diff --git )", diff)
+    preamble = "" if chunks[0].startswith("diff --git ") else chunks.pop(0)
+    return preamble, [_FileDiff(c) for c in chunks if c]
+
+
+def fit_diff(diff: str, budget: int) -> str:
+    """
+    Trim a unified *diff* to roughly *budget* tokens.
+
+    Low-value files (lockfiles, generated or vendored code, binaries) are
+    reduced to a stat line first. Remaining hunks are then admitted by
+    importance (source before tests before docs, smaller hunks first), with
+    files larger than half the budget considered last. Files keep their
+    original order; anything left out is summarised by a stat line or an
+    "omitted hunks" marker so the model still sees the change's extent.
+    """
+    if len(diff) <= budget or estimate_tokens(diff) <= budget:
+        return diff  # each char costs at most one token, so short diffs fit
+
+    preamble, files = _split_files(diff)
+    used = estimate_tokens(preamble)
+    chosen: list[set[int]] = [set() for _ in files]
+    header_paid = [False] * len(files)
+
+    # Every file is represented at least by its stat line.
+    for f in files:
+        used += estimate_tokens(f.stat_line("over budget"))
+
+    candidates: list[tuple[int, int, int, int]] = []  # (rank, cost, file, hunk)
+    for fi, f in enumerate(files):
+        weight = f.weight()
+        if weight == 0:
+            continue
+        file_cost = estimate_tokens(f.header) + sum(estimate_tokens(h) for h in f.hunks)
+        large = file_cost > budget * _LARGE_FILE_SHARE
+        for hi, hunk in enumerate(f.hunks):
+            # Lower rank sorts first: weight dominates, large files go last.
+            rank = (3 - weight) + (4 if large else 0)
+            candidates.append((rank, estimate_tokens(hunk), fi, hi))
+    candidates.sort()
+
+    for _rank, cost, fi, hi in candidates:
+        f = files[fi]
+        extra = cost
+        if not header_paid[fi]:
+            # Swap the stat line for the real header (+ omission marker).
+            extra += estimate_tokens(f.header) + 8
+            extra -= estimate_tokens(f.stat_line("over budget"))
+        if used + extra > budget:
+            continue
+        used += extra
+        header_paid[fi] = True
+        chosen[fi].add(hi)
+
+    out: list[str] = [preamble]
+    for fi, f in enumerate(files):
+        if not chosen[fi]:
+            reason = "low-value file" if f.weight() == 0 else "over budget"
+            out.append(f.stat_line(reason))
+            continue
+        out.append(f.header)
+        out.extend(h for hi, h in enumerate(f.hunks) if hi in chosen[fi])
+        skipped = len(f.hunks) - len(chosen[fi])
+        if skipped:
+            out.append(f"@@ [{skipped} more hunk(s) omitted] @@\n")
+
+    result = "".join(out)
+    if estimate_tokens(result) > budget:  # e.g. thousands of stat lines
+        result = fit_lines(result, budget)
+    return result
+
+
+def share(budget: int, texts: list[str]) -> list[int]:
+    """
+    Split *budget* between several prompt parts.
+
+    Parts that fit in an equal share keep their size; what they leave over is
+    divided among the larger ones.
+    """
+    needs = [estimate_tokens(t) for t in texts]
+    grants = [0] * len(texts)
+    pending = list(range(len(texts)))
+    left = budget
+    while pending:
+        fair = left // len(pending)
+        small = [i for i in pending if needs[i] <= fair]
+        if not small:
+            for i in pending:
+                grants[i] = fair
+            break
+        for i in small:
+            grants[i] = needs[i]
+            left -= needs[i]
+            pending.remove(i)
+    return grants
@@ -0,0 +1,144 @@
+"""
+Client-side rate limiting for Groq calls.
+
+Groq reports its limits on every response:
+
+    retry-after                     seconds to wait after a 429
+    x-ratelimit-limit-requests      requests per window (RPD)
+    x-ratelimit-remaining-requests
+    x-ratelimit-reset-requests      e.g. "2m59.56s"
+    x-ratelimit-limit-tokens        tokens per window (TPM)
+    x-ratelimit-remaining-tokens
+    x-ratelimit-reset-tokens        e.g. "7.66s"
+
+``RateLimiter`` turns each (limit, remaining, reset) triple into a token
+bucket holding *remaining* that refills at *limit* per reset period.
+Callers reserve capacity before sending, so when the budget runs low the
+client paces itself instead of running into a 429. One process-wide
+``LIMITER`` is shared by all threads (see ``llm.gather_limited``).
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from collections.abc import Mapping
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Parse Groq reset values ("1m2.5s", "250ms", "7.66s", "12") to seconds."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))  # bare number of seconds
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    return sum(float(n) * _UNIT_SECONDS[u] for n, u in parts)
+
+
+def retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the ``Retry-After`` delay in seconds, if the server sent one."""
+    return parse_duration(headers.get("retry-after"))
+
+
+def backoff_delay(attempt: int, *, base: float = 0.5, cap: float = 8.0) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(cap, base·2ⁿ)]."""
+    ceiling = min(cap, base * 2 ** max(attempt - 1, 0))
+    return random.uniform(0, ceiling)  # noqa: S311 (not crypto)
+
+
+class _Bucket:
+    """Token bucket whose level and refill rate come from response headers."""
+
+    def __init__(self) -> None:
+        self.capacity: float | None = None  # unknown until the first response
+        self.level = 0.0
+        self.rate: float | None = None  # units per second; None: unknown
+        self.stamp = time.monotonic()
+
+    def observe(
+        self, limit: float | None, remaining: float, reset: float | None, now: float
+    ) -> None:
+        self.capacity = max(limit or 0.0, remaining)
+        self.level = remaining
+        # The window refills the whole limit over one reset period, however
+        # full the bucket is right now.
+        if limit and reset and reset > 0:
+            self.rate = limit / reset
+        else:
+            self.rate = None
+        self.stamp = now
+
+    def reserve(self, cost: float, now: float) -> float:
+        """Take *cost* units; return how long to wait until they are available."""
+        if self.capacity is None or self.rate is None:
+            return 0.0  # no refill rate known: don't pace
+        cost = min(cost, self.capacity)  # a request can never need more
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+        self.stamp = now
+        self.level -= cost
+        if self.level >= 0:
+            return 0.0
+        return -self.level / self.rate
+
+
+class RateLimiter:
+    """Thread-safe request/token limiter fed by Groq's rate-limit headers."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets = {"requests": _Bucket(), "tokens": _Bucket()}
+        self._paused_until = 0.0
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Re-synchronise the buckets from a response's headers."""
+        now = time.monotonic()
+        with self._lock:
+            for name, bucket in self._buckets.items():
+                remaining = headers.get(f"x-ratelimit-remaining-{name}")
+                if remaining is None:
+                    continue
+                try:
+                    remaining_f = float(remaining)
+                    limit = headers.get(f"x-ratelimit-limit-{name}")
+                    limit_f = float(limit) if limit is not None else None
+                except ValueError:
+                    continue
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{name}"))
+                bucket.observe(limit_f, remaining_f, reset, now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for *seconds* (e.g. after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def reserve(self, *, tokens: float = 0.0) -> float:
+        """Reserve one request plus *tokens*; return the wait in seconds."""
+        now = time.monotonic()
+        with self._lock:
+            wait = max(0.0, self._paused_until - now)
+            wait = max(wait, self._buckets["requests"].reserve(1, now))
+            if tokens:
+                wait = max(wait, self._buckets["tokens"].reserve(tokens, now))
+        return wait
+
+    def reset(self) -> None:
+        """Forget everything learnt from headers."""
+        with self._lock:
+            self._buckets = {"requests": _Bucket(), "tokens": _Bucket()}
+            self._paused_until = 0.0
+
+
+# Process-wide limiter shared by every LLM call
+LIMITER = RateLimiter()
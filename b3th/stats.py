@@ -4,15 +4,28 @@ stats.py – Git statistics for a given time-frame.
 Example:
     stats = get_stats(".", last="7d")
     # -> {"commits": 14, "files": 6, "additions": 120, "deletions": 34}
+    get_breakdown(".", "author", last="7d")
+    # -> [{"key": "Ada", "commits": 9, "files": 4, ...}, ...]
+    get_stats_windows(".", ["1d", "7d", "30d"])
+    # -> {"1d": {"commits": 2, ...}, "7d": {...}, "30d": {...}}
 """
 
 from __future__ import annotations
 
+import json
 import re
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
 from datetime import datetime, timedelta
+from functools import partial
+from itertools import chain
 from pathlib import Path
 
-from .git_utils import is_git_repo, run_git
+from . import stats_index
+from .git_utils import is_git_repo, iter_git
+from .stats_columns import BY_CHOICES, Columns, breakdown
+from .stats_index import LOG_FORMAT, StatsIndex, StatsIndexError, iter_log
+from .stats_parallel import log_chunk, records_chunk, resolve_jobs, rev_list, scan
 
 
 class StatsError(RuntimeError):
@@ -20,8 +33,12 @@ class StatsError(RuntimeError):
 
 
 # Helpers
-def _parse_last(value: str | None) -> str | None:
-    """Convert '7d', '2w', '1m' to ISO date for `git --since`."""
+def _parse_last(value: str | None, now: datetime | None = None) -> datetime | None:
+    """
+    Convert '7d', '2w', '1m' to the start of that window: exactly that long
+    before *now*. (`git log --since YYYY-MM-DD`, used before the index,
+    meant the same: git takes a bare date at the current time of day.)
+    """
     if value is None:
         return None
 
@@ -35,66 +52,285 @@ def _parse_last(value: str | None) -> str | None:
         if unit == "d"
         else timedelta(weeks=amount) if unit == "w" else timedelta(days=30 * amount)
     )
-    return (datetime.now() - delta).strftime("%Y-%m-%d")
+    return (now or datetime.now()) - delta
 
 
 # Core API
 def get_stats(
-    repo_path: str | Path = ".", *, last: str | None = None
+    repo_path: str | Path = ".", *, last: str | None = None, jobs: int = 1
 ) -> dict[str, int]:
-    """Return commit count, unique files changed, insertions, deletions."""
+    """
+    Return commit count, unique files changed, insertions, deletions.
+
+    Answered from the repository's stats index (``stats_index``), which
+    first ingests any new commits; without the index (disabled, or the
+    repository is read-only) history is walked directly. *jobs* other than
+    1 generates numstat in that many processes (0: one per CPU).
+    """
     repo_path = Path(repo_path)
     if not is_git_repo(repo_path):
         raise StatsError(f"{repo_path} is not a Git repository")
 
-    since_arg = _parse_last(last)
-    log_range = ["--since", since_arg] if since_arg else []
+    since = _parse_last(last)
+    jobs = _check_jobs(jobs)
+    if stats_index.is_enabled():
+        try:
+            with StatsIndex.open(repo_path) as index:
+                index.update(jobs)
+                return index.totals(None if since is None else since.timestamp())
+        except StatsIndexError:
+            pass  # fall back to a direct walk
 
-    # commits
-    log_output = run_git(
-        ["log", "--all", "--oneline", *log_range, "--pretty=%h"], cwd=repo_path
-    )
-    commit_count = len(log_output.splitlines()) if log_output else 0
+    if jobs == 1:
+        return _merge([_count(_log(repo_path, since))])
+    shas = rev_list(repo_path, ["--all", *_since_args(since)])
+    return _merge(scan(_count_chunk, repo_path, shas, jobs))
+
+
+def get_breakdown(
+    repo_path: str | Path = ".",
+    by: str = "author",
+    *,
+    last: str | None = None,
+    jobs: int = 1,
+) -> list[dict[str, int | str]]:
+    """
+    Return ``get_stats`` totals per author, top-level directory, day or week
+    (see ``stats_columns.breakdown``), one dict per group with its ``key``.
+    """
+    repo_path = Path(repo_path)
+    if not is_git_repo(repo_path):
+        raise StatsError(f"{repo_path} is not a Git repository")
+    if by not in BY_CHOICES:
+        raise StatsError(f"Invalid --by value (use {', '.join(BY_CHOICES)})")
+
+    since = _parse_last(last)
+    jobs = _check_jobs(jobs)
+    if stats_index.is_enabled():
+        try:
+            with StatsIndex.open(repo_path) as index:
+                index.update(jobs)
+                cols = index.columns(None if since is None else since.timestamp())
+            return breakdown(cols, by)
+        except StatsIndexError:
+            pass  # fall back to a direct walk
+
+    if jobs == 1:
+        records: Iterable[str] = _log(repo_path, since)
+    else:
+        shas = rev_list(repo_path, ["--all", *_since_args(since)])
+        records = chain.from_iterable(scan(records_chunk, repo_path, shas, jobs))
+    return breakdown(Columns.from_log(records), by)
+
+
+def get_stats_windows(
+    repo_path: str | Path = ".",
+    lasts: Sequence[str] = ("1d", "7d", "30d", "90d"),
+    *,
+    jobs: int = 1,
+) -> dict[str, dict[str, int]]:
+    """
+    Return ``get_stats`` totals for several ``--last`` windows at once,
+    keyed by window, in the order given.
+
+    Without the index, history is walked once, back to the widest window;
+    each commit counts toward every window it falls in.
+    """
+    repo_path = Path(repo_path)
+    if not is_git_repo(repo_path):
+        raise StatsError(f"{repo_path} is not a Git repository")
+    if not lasts:
+        raise StatsError("No --last windows given")
+
+    now = datetime.now()
+    starts = {last: int(_parse_last(last, now).timestamp()) for last in lasts}
+    jobs = _check_jobs(jobs)
+    if stats_index.is_enabled():
+        try:
+            with StatsIndex.open(repo_path) as index:
+                index.update(jobs)
+                return {last: index.totals(start) for last, start in starts.items()}
+        except StatsIndexError:
+            pass  # fall back to a direct walk
+
+    bounds = sorted(set(starts.values()), reverse=True)  # narrowest first
+    since = datetime.fromtimestamp(bounds[-1])
+    if jobs == 1:
+        parts = [_count_windows(_log(repo_path, since), bounds)]
+    else:
+        shas = rev_list(repo_path, ["--all", *_since_args(since)])
+        chunk = partial(_count_windows_chunk, bounds=bounds)
+        parts = scan(chunk, repo_path, shas, jobs)
+    totals = dict(zip(bounds, _merge_windows(parts, bounds)))
+    return {last: totals[start] for last, start in starts.items()}
+
+
+def _check_jobs(jobs: int) -> int:
+    try:
+        return resolve_jobs(jobs)
+    except ValueError as exc:
+        raise StatsError("Invalid --jobs value (use 0 or more)") from exc
+
+
+def _since_args(since: datetime | None) -> list[str]:
+    return ["--since", since.strftime("%Y-%m-%d %H:%M:%S")] if since else []
 
-    if commit_count == 0:
-        return {"commits": 0, "files": 0, "additions": 0, "deletions": 0}
 
-    # numstat for file/line counts
-    numstat = run_git(
-        ["log", "--all", *log_range, "--pretty=tformat:", "--numstat"],
+def _log(repo_path: Path, since: datetime | None) -> Iterable[str]:
+    """Stream `git log --numstat -z` records in ``LOG_FORMAT``."""
+    # One history walk for everything; streamed, since history can be huge.
+    return iter_git(
+        ["log", "--all", *_since_args(since), "--numstat", "-z", LOG_FORMAT],
         cwd=repo_path,
+        sep="\0",
     )
 
-    files = set()
-    additions = deletions = 0
-    for line in numstat.splitlines():
-        add, delete, filename = line.split("\t")
-        numeric_add = add.isdigit()
-        numeric_del = delete.isdigit()
 
-        if numeric_add:
-            additions += int(add)
-        if numeric_del:
-            deletions += int(delete)
+def _count(records: Iterable[str]) -> tuple[int, set[str], int, int]:
+    """
+    Partial totals of a `git log --numstat -z` stream: commits, the set of
+    files changed, additions, deletions.
 
-        # Only count text files (numeric stats) toward unique file total
-        if numeric_add or numeric_del:
-            files.add(filename)
+    Binary files (no line counts) don't count as changed files.
+    """
+    commits = additions = deletions = 0
+    files: set[str] = set()
+    for _header, rows in iter_log(records):
+        commits += 1
+        for added, deleted, path in rows:
+            if added is not None:
+                additions += added
+            if deleted is not None:
+                deletions += deleted
+            # Only count text files (numeric stats) toward unique file total
+            if added is not None or deleted is not None:
+                files.add(path)
+    return commits, files, additions, deletions
 
+
+def _count_chunk(repo: str, shas: list[str]) -> tuple[int, set[str], int, int]:
+    """``stats_parallel`` chunk function: partial totals of *shas*."""
+    return _count(log_chunk(repo, shas))
+
+
+def _merge(partials: Iterable[tuple[int, set[str], int, int]]) -> dict[str, int]:
+    """Add up partial totals; a file changed in several parts counts once."""
+    commits = additions = deletions = 0
+    files: set[str] = set()
+    for part_commits, part_files, part_additions, part_deletions in partials:
+        commits += part_commits
+        files |= part_files
+        additions += part_additions
+        deletions += part_deletions
     return {
-        "commits": commit_count,
+        "commits": commits,
         "files": len(files),
         "additions": additions,
         "deletions": deletions,
     }
 
 
+_WindowParts = tuple[list[list[int]], dict[str, int]]
+
+
+def _count_windows(records: Iterable[str], bounds: list[int]) -> _WindowParts:
+    """
+    Partial totals for windows starting at *bounds* (newest first).
+
+    Each commit's commits/additions/deletions go to the narrowest window it
+    falls in (wider windows add them up later); for files, the time of each
+    path's latest text change is kept, which places it in every window.
+    """
+    sums = [[0, 0, 0] for _ in bounds]  # commits, additions, deletions
+    latest: dict[str, int] = {}
+    keys = [-bound for bound in bounds]  # ascending, for bisect
+    for header, rows in iter_log(records):
+        ts = int(header.split(" ", 2)[1])
+        window = bisect_left(keys, -ts)
+        if window == len(bounds):
+            continue  # older than the widest window
+        bucket = sums[window]
+        bucket[0] += 1
+        for added, deleted, path in rows:
+            if added is not None:
+                bucket[1] += added
+            if deleted is not None:
+                bucket[2] += deleted
+            if (added is not None or deleted is not None) and ts > latest.get(path, -1):
+                latest[path] = ts
+    return sums, latest
+
+
+def _count_windows_chunk(
+    repo: str, shas: list[str], *, bounds: list[int]
+) -> _WindowParts:
+    """``stats_parallel`` chunk function: window partials of *shas*."""
+    return _count_windows(log_chunk(repo, shas), bounds)
+
+
+def _merge_windows(
+    parts: Iterable[_WindowParts], bounds: list[int]
+) -> list[dict[str, int]]:
+    """Combine window partials into totals per window, narrowest first."""
+    sums = [[0, 0, 0] for _ in bounds]
+    latest: dict[str, int] = {}
+    for part_sums, part_latest in parts:
+        for total, part in zip(sums, part_sums):
+            for i, value in enumerate(part):
+                total[i] += value
+        for path, ts in part_latest.items():
+            if ts > latest.get(path, -1):
+                latest[path] = ts
+
+    result = []
+    commits = additions = deletions = 0
+    for bound, (part_commits, part_additions, part_deletions) in zip(bounds, sums):
+        commits += part_commits
+        additions += part_additions
+        deletions += part_deletions
+        result.append(
+            {
+                "commits": commits,
+                "files": sum(1 for ts in latest.values() if ts >= bound),
+                "additions": additions,
+                "deletions": deletions,
+            }
+        )
+    return result
+
+
 # CLI helper
 def print_stats(
-    repo_path: str | Path = ".", last: str | None = None
+    repo_path: str | Path = ".",
+    last: str | None = None,
+    by: str | None = None,
+    jobs: int = 1,
+    as_json: bool = False,
 ) -> None:  # pragma: no cover
-    """Pretty-print stats to stdout (used by `b3th stats`)."""
-    data = get_stats(repo_path, last=last)
+    """
+    Pretty-print stats to stdout (used by `b3th stats`). A comma-separated
+    *last* ("1d,7d,30d") prints one row per window.
+    """
+    data: object
+    if last is not None and "," in last:
+        lasts = [window.strip() for window in last.split(",")]
+        data = get_stats_windows(repo_path, lasts, jobs=jobs)
+        rows = [{"key": window, **totals} for window, totals in data.items()]
+        printer = partial(print_breakdown, rows, "window")
+    elif by is not None:
+        data = get_breakdown(repo_path, by, last=last, jobs=jobs)
+        printer = partial(print_breakdown, data, by)
+    else:
+        data = get_stats(repo_path, last=last, jobs=jobs)
+        printer = partial(_print_totals, data)
+
+    if as_json:
+        print(json.dumps(data, indent=2))
+    else:
+        printer()
+
+
+def _print_totals(data: dict[str, int]) -> None:
     if data["commits"] == 0:
         print("No commits in the specified range.")
         return
@@ -105,3 +341,31 @@ def print_stats(
         f"Additions:  +{data['additions']}\n"
         f"Deletions:  -{data['deletions']}"
     )
+
+
+def print_breakdown(rows: list[dict[str, int | str]], by: str) -> None:
+    """Print ``get_breakdown`` rows as an aligned table."""
+    if not rows:
+        print("No commits in the specified range.")
+        return
+
+    table = [(by.capitalize(), "Commits", "Files", "Additions", "Deletions")]
+    table += [
+        (
+            str(row["key"]),
+            str(row["commits"]),
+            str(row["files"]),
+            f"+{row['additions']}",
+            f"-{row['deletions']}",
+        )
+        for row in rows
+    ]
+    widths = [max(len(line[i]) for line in table) for i in range(len(table[0]))]
+    for line in table:
+        key, *numbers = line
+        print(
+            "  ".join(
+                [key.ljust(widths[0])]
+                + [n.rjust(w) for n, w in zip(numbers, widths[1:])]
+            ).rstrip()
+        )
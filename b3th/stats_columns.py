@@ -0,0 +1,232 @@
+"""
+Column store and group-by for ``stats`` breakdowns.
+
+Numstat rows are held as parallel ``array`` columns over interned ids, so
+millions of rows cost a few dozen bytes each rather than a tuple plus dict
+entries:
+
+    per row:     commit (index), path (id), added, deleted (-1: binary)
+    per commit:  committer time, author (id)
+    lookup:      path and author strings by id
+
+``breakdown()`` groups them by author, top-level directory, day or week
+(UTC). With NumPy installed the group-by is vectorised (``unique`` /
+``bincount`` over the columns); without it, one loop over the arrays does
+the same work.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # optional: the pure-Python group-by is used instead
+    np = None  # type: ignore[assignment]
+
+from .stats_index import iter_log
+
+BY_CHOICES = ("author", "path", "day", "week")
+
+_DAY = 86_400
+_EPOCH = date(1970, 1, 1)  # a Thursday; weeks start on Monday
+_ROOT = "."  # bucket for files at the top level of the repository
+
+
+class Columns:
+    """Numstat rows of a set of commits, column by column."""
+
+    def __init__(self) -> None:
+        # per commit (indexed by commit id; ``commits`` lists those included)
+        self.ts = array("q")
+        self.author = array("q")
+        self.commits = array("q")
+        # per numstat row
+        self.row_commit = array("q")
+        self.row_path = array("q")
+        self.added = array("q")
+        self.deleted = array("q")
+        # interned strings
+        self.paths: list[str] = []
+        self.authors: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.row_commit)
+
+    @classmethod
+    def from_log(cls, records: Iterable[str]) -> Columns:
+        """Build columns from a `git log --numstat -z` stream in ``LOG_FORMAT``."""
+        cols = cls()
+        path_ids: dict[str, int] = {}
+        author_ids: dict[str, int] = {}
+        for header, rows in iter_log(records):
+            _sha, ts, author = header.split(" ", 2)
+            commit = len(cols.ts)
+            cols.commits.append(commit)
+            cols.ts.append(int(ts))
+            author_id = author_ids.get(author)
+            if author_id is None:
+                author_id = author_ids[author] = len(cols.authors)
+                cols.authors.append(author)
+            cols.author.append(author_id)
+            for added, deleted, path in rows:
+                path_id = path_ids.get(path)
+                if path_id is None:
+                    path_id = path_ids[path] = len(cols.paths)
+                    cols.paths.append(path)
+                cols.row_commit.append(commit)
+                cols.row_path.append(path_id)
+                cols.added.append(-1 if added is None else added)
+                cols.deleted.append(-1 if deleted is None else deleted)
+        return cols
+
+
+# --------------------------------------------------------------------------- #
+# Group keys
+# --------------------------------------------------------------------------- #
+def _day_label(day: int) -> str:
+    return (_EPOCH + timedelta(days=day)).isoformat()
+
+
+def _week_label(week: int) -> str:
+    monday = _EPOCH + timedelta(days=week * 7 - 3)
+    year, number, _ = monday.isocalendar()
+    return f"{year}-W{number:02d}"
+
+
+def _top_level(path: str) -> str:
+    head, sep, _rest = path.partition("/")
+    return head if sep else _ROOT
+
+
+def _commit_keys(cols: Columns, by: str) -> tuple[list[int], list[str]] | None:
+    """Per-commit group key ids and their labels (None when grouping rows)."""
+    if by == "author":
+        return list(cols.author), list(cols.authors)
+    if by == "path":
+        return None
+    days = [ts // _DAY for ts in cols.ts]
+    buckets = days if by == "day" else [(day + 3) // 7 for day in days]
+    label = _day_label if by == "day" else _week_label
+    values = sorted({buckets[c] for c in cols.commits})
+    ids = {value: i for i, value in enumerate(values)}
+    return [ids.get(b, -1) for b in buckets], [label(v) for v in values]
+
+
+def _path_keys(cols: Columns) -> tuple[list[int], list[str]]:
+    """Per-path group key ids (top-level directory) and their labels."""
+    labels: list[str] = []
+    ids: dict[str, int] = {}
+    keys = []
+    for path in cols.paths:
+        top = _top_level(path)
+        if top not in ids:
+            ids[top] = len(labels)
+            labels.append(top)
+        keys.append(ids[top])
+    return keys, labels
+
+
+# --------------------------------------------------------------------------- #
+# Group-by
+# --------------------------------------------------------------------------- #
+def breakdown(cols: Columns, by: str) -> list[dict[str, int | str]]:
+    """
+    Return per-group totals: ``key``, ``commits``, ``files``, ``additions``,
+    ``deletions``.
+
+    Counts follow ``get_stats``: binary files add no lines and don't count as
+    changed files; grouping by path counts a commit once per top-level
+    directory it touched. Periods come out in time order, authors and
+    directories by lines changed (most first).
+    """
+    if by not in BY_CHOICES:
+        raise ValueError(f"cannot group by {by!r} (choose from {BY_CHOICES})")
+    commit_keys = _commit_keys(cols, by)
+    if commit_keys is None:
+        keys, labels = _path_keys(cols)
+    else:
+        keys, labels = commit_keys
+    if not labels:
+        return []
+    group = _group_numpy if np is not None else _group_python
+    totals = group(cols, keys, len(labels), by_row=commit_keys is None)
+
+    result = [
+        {
+            "key": labels[k],
+            "commits": commits,
+            "files": files,
+            "additions": additions,
+            "deletions": deletions,
+        }
+        for k, (commits, files, additions, deletions) in enumerate(totals)
+        if commits
+    ]
+    if by in ("author", "path"):
+        result.sort(key=lambda r: (-(r["additions"] + r["deletions"]), r["key"]))
+    return result
+
+
+def _group_python(
+    cols: Columns, keys: list[int], n: int, *, by_row: bool
+) -> list[tuple[int, int, int, int]]:
+    commits = [0] * n
+    additions = [0] * n
+    deletions = [0] * n
+    width = max(len(cols.paths), 1)
+    files: set[int] = set()  # key * width + path
+    touched: set[int] = set()  # commit * n + key (grouping rows by path)
+    if not by_row:
+        for c in cols.commits:
+            commits[keys[c]] += 1
+    for c, p, a, d in zip(cols.row_commit, cols.row_path, cols.added, cols.deleted):
+        if by_row:
+            k = keys[p]
+            touched.add(c * n + k)
+        else:
+            k = keys[c]
+        if a >= 0 or d >= 0:
+            files.add(k * width + p)
+            additions[k] += max(a, 0)
+            deletions[k] += max(d, 0)
+    file_counts = [0] * n
+    for pair in files:
+        file_counts[pair // width] += 1
+    for pair in touched:
+        commits[pair % n] += 1
+    return list(zip(commits, file_counts, additions, deletions))
+
+
+def _group_numpy(
+    cols: Columns, keys: list[int], n: int, *, by_row: bool
+) -> list[tuple[int, int, int, int]]:
+    key_of = np.asarray(keys, dtype=np.int64)
+    row_commit = np.frombuffer(cols.row_commit, dtype=np.int64)
+    row_path = np.frombuffer(cols.row_path, dtype=np.int64)
+    added = np.frombuffer(cols.added, dtype=np.int64)
+    deleted = np.frombuffer(cols.deleted, dtype=np.int64)
+
+    if by_row:
+        row_key = key_of[row_path] if len(row_path) else row_path
+        pairs = np.unique(row_commit * n + row_key)
+        commits = np.bincount(pairs % n, minlength=n)
+    else:
+        row_key = key_of[row_commit] if len(row_commit) else row_commit
+        included = np.frombuffer(cols.commits, dtype=np.int64)
+        commits = np.bincount(key_of[included], minlength=n)
+
+    text = (added >= 0) | (deleted >= 0)
+    key_text = row_key[text]
+    width = max(len(cols.paths), 1)
+    files = np.bincount(
+        np.unique(key_text * width + row_path[text]) // width, minlength=n
+    )
+    additions = np.bincount(key_text, np.maximum(added[text], 0), minlength=n)
+    deletions = np.bincount(key_text, np.maximum(deleted[text], 0), minlength=n)
+    return [
+        (int(c), int(f), int(a), int(d))
+        for c, f, a, d in zip(commits, files, additions, deletions)
+    ]
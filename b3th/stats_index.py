@@ -0,0 +1,450 @@
+"""
+Persistent, incremental index of per-commit numstat rows for ``stats``.
+
+The index is a SQLite file in the repository's (common) git directory:
+
+    .git/b3th/stats.sqlite
+
+It holds one row per commit reachable from any ref (hash, committer time,
+author) and one row per file each commit touched (lines added/deleted,
+``NULL`` for binary files), plus the ref tips it was built from. ``update()``
+ingests only commits that aren't indexed yet, by walking
+``git log <new tips> --not <indexed tips>``. When a previously indexed
+commit is no longer reachable from any ref (rebase, force-push, deleted
+branch), the index is dropped and rebuilt, so it always describes exactly
+what ``git log --all`` would. Queries are then range scans over committer
+time: ``totals(since=…)``, or ``columns(since=…)`` for breakdowns.
+
+Environment knobs:
+    B3TH_STATS_INDEX=0    don't use (or create) the index; ``stats`` walks
+                          history directly
+"""
+
+from __future__ import annotations
+
+import os
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+try:
+    import sqlite3
+except ImportError:  # pragma: no cover - Python built without sqlite
+    sqlite3 = None  # type: ignore[assignment]
+
+from .git_utils import GIT, GitError, iter_git, run_git
+
+if TYPE_CHECKING:
+    from .stats_columns import Columns
+
+SCHEMA_VERSION = "2"
+
+# Starts each commit's header record in the -z log stream. numstat records
+# start with a digit or "-", so it can't be mistaken for one.
+COMMIT_MARKER = "@"
+
+# Pretty format of the header: marker, full hash, committer timestamp,
+# author name (after .mailmap).
+LOG_FORMAT = f"--pretty=tformat:{COMMIT_MARKER}%H %ct %aN"
+
+_BUSY_TIMEOUT = 60.0  # seconds to wait for another process's update
+_BATCH = 10_000  # rows buffered per table before they are inserted
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE tips (sha TEXT PRIMARY KEY);
+CREATE TABLE commits (
+    id INTEGER PRIMARY KEY,
+    sha TEXT NOT NULL UNIQUE,
+    ts INTEGER NOT NULL,
+    author_id INTEGER NOT NULL
+);
+CREATE INDEX commits_ts ON commits (ts);
+CREATE TABLE authors (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE paths (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE);
+CREATE TABLE numstat (
+    commit_id INTEGER NOT NULL,
+    path_id INTEGER NOT NULL,
+    added INTEGER,
+    deleted INTEGER
+);
+CREATE INDEX numstat_commit ON numstat (commit_id);
+"""
+
+_TABLES = ("meta", "tips", "commits", "authors", "paths", "numstat")
+
+
+class StatsIndexError(RuntimeError):
+    """Raised when the stats index cannot be opened or updated."""
+
+
+# --------------------------------------------------------------------------- #
+# Log parsing
+# --------------------------------------------------------------------------- #
+def iter_log(
+    records: Iterable[str],
+) -> Iterator[tuple[str, list[tuple[int | None, int | None, str]]]]:
+    """
+    Group a `git log --numstat -z` stream into ``(header, rows)`` per commit.
+
+    Records are NUL-separated: a commit header (``COMMIT_MARKER`` + the
+    pretty format), then one ``added<TAB>deleted<TAB>path`` record per file
+    (the first one preceded by a newline). Renames and copies leave *path*
+    empty and put the old and new paths in the next two records; rows carry
+    the new path. Rows are ``(added, deleted, path)``, with ``None`` counts
+    for binary files.
+    """
+    header: str | None = None
+    rows: list[tuple[int | None, int | None, str]] = []
+    records = iter(records)
+    for record in records:
+        record = record.lstrip("\n")
+        if not record:
+            continue
+        if record.startswith(COMMIT_MARKER):
+            if header is not None:
+                yield header, rows
+            header, rows = record[len(COMMIT_MARKER) :], []
+            continue
+
+        add, delete, path = record.split("\t", 2)
+        if not path:  # rename/copy: old path, then new path
+            next(records, None)
+            path = next(records, "")
+        rows.append(
+            (
+                int(add) if add.isdigit() else None,
+                int(delete) if delete.isdigit() else None,
+                path,
+            )
+        )
+    if header is not None:
+        yield header, rows
+
+
+# --------------------------------------------------------------------------- #
+# Index
+# --------------------------------------------------------------------------- #
+def is_enabled() -> bool:
+    """Return False when sqlite is missing or ``B3TH_STATS_INDEX`` is off."""
+    if sqlite3 is None:  # pragma: no cover
+        return False
+    flag = os.getenv("B3TH_STATS_INDEX", "1").strip().lower()
+    return flag not in {"0", "false", "no"}
+
+
+def index_path(repo: str | Path = ".") -> Path:
+    """Return where the index for *repo* lives (shared by all worktrees)."""
+    common = run_git(["rev-parse", "--git-common-dir"], cwd=repo)
+    return Path(repo, common).resolve() / "b3th" / "stats.sqlite"
+
+
+class StatsIndex:
+    """
+    An open stats index for one repository.
+
+    Use as a context manager; ``update()`` brings it in line with the refs,
+    ``totals()`` answers range queries.
+    """
+
+    def __init__(self, repo: str | Path, db: sqlite3.Connection) -> None:
+        self.repo = Path(repo)
+        self._db = db
+
+    @classmethod
+    def open(cls, repo: str | Path = ".") -> StatsIndex:
+        """
+        Open (creating if needed) the index for *repo*.
+
+        A file that isn't a usable index (corrupt, or written by another
+        schema version) is replaced. Raises ``StatsIndexError`` when the
+        index can't be created, e.g. in a read-only repository.
+        """
+        try:
+            path = index_path(repo)
+            path.parent.mkdir(parents=True, exist_ok=True)
+        except (GitError, OSError) as exc:
+            raise StatsIndexError(f"cannot create the stats index: {exc}") from exc
+
+        for attempt in range(2):
+            try:
+                db = sqlite3.connect(path, timeout=_BUSY_TIMEOUT, isolation_level=None)
+            except sqlite3.Error as exc:
+                raise StatsIndexError(f"cannot open {path}: {exc}") from exc
+            try:
+                _ensure_schema(db)
+            except sqlite3.DatabaseError as exc:
+                db.close()
+                if attempt or isinstance(exc, sqlite3.OperationalError):
+                    raise StatsIndexError(f"cannot use {path}: {exc}") from exc
+                path.unlink(missing_ok=True)  # not a database: start over
+                continue
+            return cls(repo, db)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> StatsIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ #
+    # Ingestion
+    # ------------------------------------------------------------------ #
+    def update(self, jobs: int = 1) -> int:
+        """
+        Index the commits added since the last update; return how many.
+
+        Runs in one write transaction, so concurrent updates of the same
+        index wait for each other instead of ingesting commits twice. With
+        *jobs* other than 1, numstat is generated by a process pool
+        (``stats_parallel``).
+        """
+        db = self._db
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            # Read the tips under the write lock: tips stored by an update
+            # that finished meanwhile must not look like dropped history.
+            tips = _ref_tips(self.repo)
+            old = {sha for (sha,) in db.execute("SELECT sha FROM tips")}
+            if old - tips and _rewritten(self.repo, old - tips, tips):
+                for table in _TABLES[1:]:
+                    db.execute(f"DELETE FROM {table}")  # noqa: S608 (fixed names)
+                old = set()
+            added = self._ingest(tips - old, old, jobs) if tips - old else 0
+            db.execute("DELETE FROM tips")
+            db.executemany("INSERT INTO tips VALUES (?)", ((sha,) for sha in tips))
+            db.execute("COMMIT")
+        except BaseException as exc:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            if isinstance(exc, sqlite3.Error):
+                raise StatsIndexError(f"cannot update the stats index: {exc}") from exc
+            raise
+        return added
+
+    def _ingest(self, new: set[str], old: set[str], jobs: int) -> int:
+        revs = "".join(f"{sha}\n" for sha in sorted(new))
+        revs += "".join(f"^{sha}\n" for sha in sorted(old))
+        records: Iterable[str]
+        if jobs == 1:
+            records = iter_git(
+                ["log", "--stdin", "--numstat", "-z", LOG_FORMAT],
+                cwd=self.repo,
+                sep="\0",
+                input=revs,
+            )
+        else:
+            from .stats_parallel import records_chunk, rev_list, scan
+
+            shas = rev_list(self.repo, ["--stdin"], input=revs)
+            chunks = scan(records_chunk, self.repo, shas, jobs)
+            records = chain.from_iterable(chunks)
+
+        db = self._db
+        path_ids = dict(db.execute("SELECT path, id FROM paths"))
+        author_ids = dict(db.execute("SELECT name, id FROM authors"))
+        (next_commit,) = db.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM commits"
+        ).fetchone()
+        commits: list[tuple[int, str, int, int]] = []
+        new_paths: list[tuple[int, str]] = []
+        new_authors: list[tuple[int, str]] = []
+        numstat: list[tuple[int, int, int | None, int | None]] = []
+
+        def flush() -> None:
+            db.executemany("INSERT INTO commits VALUES (?, ?, ?, ?)", commits)
+            db.executemany("INSERT INTO authors VALUES (?, ?)", new_authors)
+            db.executemany("INSERT INTO paths VALUES (?, ?)", new_paths)
+            db.executemany("INSERT INTO numstat VALUES (?, ?, ?, ?)", numstat)
+            for rows in (commits, new_authors, new_paths, numstat):
+                rows.clear()
+
+        # Rows go to the database in batches, so memory stays flat however
+        # much history is new.
+        count = 0
+        for header, rows in iter_log(records):
+            sha, ts, author = header.split(" ", 2)
+            author_id = author_ids.get(author)
+            if author_id is None:
+                author_id = author_ids[author] = len(author_ids) + 1
+                new_authors.append((author_id, author))
+            commit_id = next_commit + count
+            count += 1
+            commits.append((commit_id, sha, int(ts), author_id))
+            for added, deleted, path in rows:
+                path_id = path_ids.get(path)
+                if path_id is None:
+                    path_id = path_ids[path] = len(path_ids) + 1
+                    new_paths.append((path_id, path))
+                numstat.append((commit_id, path_id, added, deleted))
+            if len(numstat) >= _BATCH or len(commits) >= _BATCH:
+                flush()
+        flush()
+        return count
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+    def totals(self, since: float | None = None) -> dict[str, int]:
+        """
+        Return commit, file and line totals for commits at or after *since*.
+
+        *since* is a Unix timestamp compared with the committer date, as
+        ``git log --since`` does; ``None`` covers all history.
+        """
+        bound = -(2**62) if since is None else int(since)
+        ((commits,),) = self._db.execute(
+            "SELECT COUNT(*) FROM commits WHERE ts >= ?", (bound,)
+        )
+        ((files, additions, deletions),) = self._db.execute(
+            """
+            SELECT COUNT(DISTINCT n.path_id),
+                   COALESCE(SUM(n.added), 0),
+                   COALESCE(SUM(n.deleted), 0)
+            FROM numstat AS n JOIN commits AS c ON c.id = n.commit_id
+            WHERE c.ts >= ? AND (n.added IS NOT NULL OR n.deleted IS NOT NULL)
+            """,
+            (bound,),
+        )
+        return {
+            "commits": commits,
+            "files": files,
+            "additions": additions,
+            "deletions": deletions,
+        }
+
+    def columns(self, since: float | None = None) -> Columns:
+        """
+        Load the rows of commits at or after *since* as ``stats_columns``
+        columns (commit, path and author ids are the index's own).
+        """
+        from .stats_columns import Columns
+
+        bound = -(2**62) if since is None else int(since)
+        db = self._db
+        cols = Columns()
+        cols.paths = _by_id(db.execute("SELECT id, path FROM paths"))
+        cols.authors = _by_id(db.execute("SELECT id, name FROM authors"))
+        ((size,),) = db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM commits")
+        cols.ts = array("q", bytes(8 * size))
+        cols.author = array("q", bytes(8 * size))
+        for commit, ts, author in db.execute(
+            "SELECT id, ts, author_id FROM commits WHERE ts >= ? ORDER BY id",
+            (bound,),
+        ):
+            cols.commits.append(commit)
+            cols.ts[commit] = ts
+            cols.author[commit] = author
+        rows = db.execute(
+            """
+            SELECT n.commit_id, n.path_id,
+                   COALESCE(n.added, -1), COALESCE(n.deleted, -1)
+            FROM numstat AS n JOIN commits AS c ON c.id = n.commit_id
+            WHERE c.ts >= ?
+            """,
+            (bound,),
+        )
+        for commit, path, added, deleted in rows:
+            cols.row_commit.append(commit)
+            cols.row_path.append(path)
+            cols.added.append(added)
+            cols.deleted.append(deleted)
+        return cols
+
+
+def _by_id(rows: Iterable[tuple[int, str]]) -> list[str]:
+    """Turn ``(id, value)`` rows with ids from 1 into a list indexed by id."""
+    values = [""]
+    for row_id, value in rows:
+        values.extend([""] * (row_id + 1 - len(values)))
+        values[row_id] = value
+    return values
+
+
+def _schema_version(db: sqlite3.Connection) -> str | None:
+    try:
+        row = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    except sqlite3.OperationalError as exc:
+        if "no such table" not in str(exc):
+            raise
+        return None
+    return None if row is None else row[0]
+
+
+def _ensure_schema(db: sqlite3.Connection) -> None:
+    """Create the tables, or recreate them if written by another version."""
+    if _schema_version(db) == SCHEMA_VERSION:
+        return
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        if _schema_version(db) != SCHEMA_VERSION:  # another process may have won
+            for table in _TABLES:
+                db.execute(f"DROP TABLE IF EXISTS {table}")  # noqa: S608
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    db.execute(statement)
+            db.execute("INSERT INTO meta VALUES ('version', ?)", (SCHEMA_VERSION,))
+        db.execute("COMMIT")
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+
+
+def _ref_tips(repo: Path) -> set[str]:
+    """Return the commits `git log --all` starts from (refs and HEAD, peeled)."""
+    out = run_git(
+        [
+            "for-each-ref",
+            "--format=%(objecttype) %(objectname) %(*objecttype) %(*objectname)",
+        ],
+        cwd=repo,
+    )
+    tips = set()
+    nested = []  # tags of tags: %(*…) peels only one level
+    for line in out.splitlines():
+        kind, sha, peeled_kind, peeled = (line.split(" ") + ["", ""])[:4]
+        if kind == "commit":
+            tips.add(sha)
+        elif peeled_kind == "commit":
+            tips.add(peeled)
+        elif peeled_kind == "tag":
+            nested.append(peeled)
+    if nested:
+        peeled_out = GIT.run(
+            ["cat-file", "--batch-check=%(objectname) %(objecttype)"],
+            cwd=repo,
+            input="".join(f"{sha}^{{commit}}\n" for sha in nested),
+        ).stdout
+        for line in peeled_out.splitlines():
+            sha, _, kind = line.rpartition(" ")
+            if kind == "commit":
+                tips.add(sha)
+    head = GIT.run(
+        ["rev-parse", "-q", "--verify", "HEAD^{commit}"], cwd=repo, check=False
+    )
+    if head.returncode == 0 and head.stdout.strip():
+        tips.add(head.stdout.strip())
+    return tips
+
+
+def _rewritten(repo: Path, dropped: set[str], tips: set[str]) -> bool:
+    """
+    True if history reachable from the *dropped* tips was rewritten or deleted.
+
+    A tip that moved forward (or a branch merged before deletion) leaves
+    nothing behind; anything else means indexed commits are gone from
+    `git log --all` (or their objects are, after gc).
+    """
+    revs = "".join(f"{sha}\n" for sha in dropped)
+    revs += "".join(f"^{sha}\n" for sha in tips)
+    try:
+        left = GIT.run(["rev-list", "--stdin", "-n", "1"], cwd=repo, input=revs)
+    except GitError:  # a dropped tip's objects are gone
+        return True
+    return bool(left.stdout.strip())
@@ -0,0 +1,115 @@
+"""
+Parallel history scan for ``stats`` (``--jobs``).
+
+A single `git log --numstat` spends its time generating diffs, one commit
+after another, on one core. With ``jobs > 1`` the commits to scan are
+listed first (`git rev-list`, which is cheap), cut into contiguous chunks,
+and each chunk is run through
+
+    git log --no-walk=unsorted --stdin --numstat -z <LOG_FORMAT>
+
+in a pool of worker processes. Each commit's numstat is its diff against its
+first parent, as in a full walk, so the chunks together produce exactly the
+rows of one `git log` over the same commits. Workers return whatever the
+caller's chunk function computes (raw records for the index, partial totals
+for a direct walk), in chunk order; merging is up to the caller.
+
+Results are handed over as they complete, with at most two chunks per
+worker in flight, and a chunk is at most ``MAX_CHUNK`` commits: the parent
+holds a bounded slice of history however long it is. Small scans stay
+in-process: a chunk is at least ``MIN_CHUNK`` commits.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TypeVar
+
+from .git_utils import iter_git
+from .stats_index import LOG_FORMAT
+
+T = TypeVar("T")
+
+MIN_CHUNK = 500  # commits; below this a worker costs more than it saves
+MAX_CHUNK = 5_000  # commits; bounds what one result holds in the parent
+_CHUNKS_PER_JOB = 4  # smaller chunks even out slow (large-diff) stretches
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Map ``--jobs`` to a process count: 0 means one per CPU."""
+    if jobs < 0:
+        raise ValueError(f"jobs must be >= 0, not {jobs}")
+    return jobs or os.cpu_count() or 1
+
+
+def rev_list(
+    repo: Path | str,
+    args: list[str],
+    *,
+    input: str | None = None,  # noqa: A002 (mirrors subprocess)
+) -> list[str]:
+    """Full hashes of the commits `git rev-list <args>` selects."""
+    return [sha for sha in iter_git(["rev-list", *args], cwd=repo, input=input) if sha]
+
+
+def log_chunk(repo: Path | str, shas: list[str]) -> Iterator[str]:
+    """Stream the `git log --numstat -z` records of exactly *shas*."""
+    if not shas:
+        return iter(())  # an empty --stdin would mean HEAD
+    return iter_git(
+        ["log", "--no-walk=unsorted", "--stdin", "--numstat", "-z", LOG_FORMAT],
+        cwd=repo,
+        sep="\0",
+        input="".join(f"{sha}\n" for sha in shas),
+    )
+
+
+def records_chunk(repo: str, shas: list[str]) -> list[str]:
+    """Chunk function returning the raw records (for ``stats_index``)."""
+    return list(log_chunk(repo, shas))
+
+
+def scan(
+    fn: Callable[[str, list[str]], T],
+    repo: Path | str,
+    shas: list[str],
+    jobs: int,
+) -> Iterator[T]:
+    """
+    Yield ``fn(repo, chunk)`` for consecutive chunks of *shas*, in order,
+    computed by up to *jobs* worker processes. *fn* must be a module-level
+    function (or a ``functools.partial`` of one).
+    """
+    jobs = resolve_jobs(jobs)
+    chunks = _chunks(shas, jobs)
+    if jobs == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield fn(str(repo), chunk)
+        return
+
+    workers = min(jobs, len(chunks))
+    # spawn: workers must not inherit the parent's threads or open pipes.
+    context = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(workers, mp_context=context)
+    try:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(fn, str(repo), chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)  # also when the caller stops early
+
+
+def _chunks(shas: list[str], jobs: int) -> list[list[str]]:
+    count = 1 if jobs == 1 else min(jobs * _CHUNKS_PER_JOB, len(shas) // MIN_CHUNK)
+    count = max(count, -(-len(shas) // MAX_CHUNK), 1)
+    size = max(1, -(-len(shas) // count))
+    return [shas[i : i + size] for i in range(0, len(shas), size)]
@@ -6,11 +6,12 @@ Step 6: send commit list to Groq and return a natural-language paragraph.
 
 from __future__ import annotations
 
+import asyncio
 import textwrap
 from pathlib import Path
 
-from . import llm
-from .git_utils import get_last_commits, is_git_repo
+from . import llm, prompt_budget
+from .git_utils import GitError, aget_last_commits, ais_git_repo
 
 
 class SummarizerError(RuntimeError):
@@ -23,6 +24,22 @@ def _commits_markdown(commits: list[dict]) -> str:
     return "\n".join(f"* {c['date']}  {c['abbrev']}  {c['subject']}" for c in commits)
 
 
+async def _gather_commits(repo_path: Path, n: int) -> list[dict]:
+    """Check the repository and read its log concurrently."""
+    is_repo, commits = await asyncio.gather(
+        ais_git_repo(repo_path),
+        aget_last_commits(repo_path, n),
+        return_exceptions=True,
+    )
+    if is_repo is not True:
+        raise SummarizerError(f"{repo_path} is not a Git repository")
+    if isinstance(commits, GitError):  # e.g. no commits yet
+        return []
+    if isinstance(commits, BaseException):
+        raise commits
+    return commits
+
+
 def prepare_commits_for_llm(repo_path: str | Path = ".", n: int = 10) -> str:
     """
     Return a Markdown bullet list of the last *n* commits.
@@ -31,11 +48,7 @@ def prepare_commits_for_llm(repo_path: str | Path = ".", n: int = 10) -> str:
     ------
     SummarizerError
     """
-    repo_path = Path(repo_path)
-    if not is_git_repo(repo_path):
-        raise SummarizerError(f"{repo_path} is not a Git repository")
-
-    commits = get_last_commits(repo_path, n)
+    commits = asyncio.run(_gather_commits(Path(repo_path), n))
     if not commits:
         raise SummarizerError("No commits found.")
 
@@ -43,6 +56,7 @@ def prepare_commits_for_llm(repo_path: str | Path = ".", n: int = 10) -> str:
 
 
 # Public API
+_MAX_TOKENS = 150
 _SYSTEM_PROMPT = (
     "You are a helpful assistant who summarises Git commit history. "
     "Given a bullet list of commits (newest last), produce ONE paragraph "
@@ -59,6 +73,10 @@ def summarize_commits(
     Return an LLM-generated paragraph summarising the last *n* commits.
     """
     bullet_list = prepare_commits_for_llm(repo_path, n)
+    budget = prompt_budget.prompt_budget(
+        model, reply_tokens=_MAX_TOKENS, overhead=_SYSTEM_PROMPT
+    )
+    bullet_list = prompt_budget.fit_lines(bullet_list, budget)
 
     messages = [
         {"role": "system", "content": _SYSTEM_PROMPT},
@@ -76,7 +94,9 @@ def summarize_commits(
         },
     ]
     try:
-        summary = llm.chat_completion(messages, model=model or None, max_tokens=150)
+        summary = llm.chat_completion(
+            messages, model=model or None, max_tokens=_MAX_TOKENS
+        )
     except llm.LLMError as exc:
         raise SummarizerError(str(exc)) from exc
 
@@ -0,0 +1,133 @@
+"""
+Per-call telemetry.
+
+Every LLM request made through ``b3th.llm`` produces one ``LLMCall`` record
+(wall time, time to first byte/token, token usage, retries, HTTP status,
+model). Records go to registered hooks and, optionally, to a JSONL trace:
+
+    remove = telemetry.add_hook(lambda rec: print(rec.model, rec.wall_s))
+    ...
+    remove()
+
+Environment:
+    B3TH_TRACE=<file>   append every record to this JSONL file
+                        (the CLI's ``--trace`` option overrides it)
+
+Each trace line is the record's fields plus ``"kind"`` (e.g. ``"llm"``),
+so other record types can share one file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ClassVar
+
+Hook = Callable[[Any], None]
+
+_HOOKS: list[Hook] = []
+_LOCK = threading.Lock()
+
+# Set by the CLI (--trace); None means "follow the environment".
+_TRACE_OVERRIDE: Path | None = None
+
+
+@dataclass
+class LLMCall:
+    """One chat-completion request (a cache hit counts as a request)."""
+
+    kind: ClassVar[str] = "llm"
+
+    model: str
+    stream: bool = False
+    hedge: bool = False  # sent as the hedge for a slower primary
+    cached: bool = False
+    started: float = field(default_factory=time.time)  # epoch seconds
+    wall_s: float = 0.0
+    ttfb_s: float | None = None  # response headers of the final attempt
+    ttft_s: float | None = None  # first content token (streaming only)
+    wait_s: float = 0.0  # time held back by client-side rate limiting
+    status: int | None = None
+    retries: int = 0
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    total_tokens: int | None = None
+    error: str | None = None
+    _t0: float = field(default_factory=time.perf_counter, repr=False)
+
+    def elapsed(self) -> float:
+        """Seconds since the record was created."""
+        return time.perf_counter() - self._t0
+
+    def add_usage(self, usage: Any) -> None:
+        """Copy an OpenAI-style ``usage`` block, if the response had one."""
+        if not isinstance(usage, dict):
+            return
+        self.prompt_tokens = usage.get("prompt_tokens", self.prompt_tokens)
+        self.completion_tokens = usage.get("completion_tokens", self.completion_tokens)
+        self.total_tokens = usage.get("total_tokens", self.total_tokens)
+
+
+# --------------------------------------------------------------------------- #
+# Hooks & trace file
+# --------------------------------------------------------------------------- #
+def add_hook(hook: Hook) -> Callable[[], None]:
+    """Call *hook* with every record; return a function that unregisters it."""
+    with _LOCK:
+        _HOOKS.append(hook)
+    return lambda: remove_hook(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    """Stop calling *hook* (no-op if it isn't registered)."""
+    with _LOCK:
+        if hook in _HOOKS:
+            _HOOKS.remove(hook)
+
+
+def set_trace_path(path: str | Path | None) -> None:
+    """Force the JSONL trace file for this process (``None`` → use the env)."""
+    global _TRACE_OVERRIDE
+    _TRACE_OVERRIDE = Path(path) if path else None
+
+
+def trace_path() -> Path | None:
+    """Return the active trace file, if any."""
+    if _TRACE_OVERRIDE is not None:
+        return _TRACE_OVERRIDE
+    env = os.getenv("B3TH_TRACE")
+    return Path(env).expanduser() if env else None
+
+
+def to_dict(record: Any) -> dict[str, Any]:
+    """Return *record* as a JSON-ready dict with its ``kind`` first."""
+    data = {k: v for k, v in asdict(record).items() if not k.startswith("_")}
+    return {"kind": record.kind, **data}
+
+
+def emit(record: Any) -> None:
+    """Hand *record* to every hook and append it to the trace file."""
+    with _LOCK:
+        hooks = list(_HOOKS)
+    for hook in hooks:
+        try:
+            hook(record)
+        except Exception:  # noqa: BLE001,S112 (telemetry must not break calls)
+            continue
+
+    path = trace_path()
+    if path is None:
+        return
+    line = json.dumps(to_dict(record), ensure_ascii=False)
+    try:
+        with _LOCK:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+    except OSError:
+        pass  # an unwritable trace must not fail the command
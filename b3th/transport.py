@@ -0,0 +1,160 @@
+"""
+Record/replay transports for ``b3th.llm``.
+
+A transport is anything with the ``post()`` signature of
+``requests.Session.post`` as used by ``llm``; the default one sends requests
+through the shared pooled session. These two wrap or replace it:
+
+    RecordTransport(path, inner)   forward to *inner*, append each exchange
+                                   to a JSONL cassette at *path*
+    ReplayTransport(path)          answer from a cassette, no network at all
+
+Select them with ``llm.set_transport()`` or, for whole CLI runs, via
+``B3TH_LLM_RECORD=<file>`` / ``B3TH_LLM_REPLAY=<file>``.
+
+Cassette entries are keyed on the endpoint path and the JSON payload, so a
+recording made against api.groq.com replays against any ``GROQ_API_BASE``.
+Request headers (the API key) are never written. Identical requests replay
+their recorded responses in order, so a 429-then-200 sequence reproduces
+the retry path.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Protocol
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Describe the original wire format; the recorded body is already decoded.
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class TransportError(RuntimeError):
+    """Raised when a cassette is unreadable or lacks a recorded response."""
+
+
+class Transport(Protocol):
+    def post(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str],
+        json: dict[str, Any],
+        timeout: float,
+        stream: bool = False,
+    ) -> requests.Response: ...
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def request_key(url: str, payload: dict[str, Any]) -> str:
+    """Return the cassette key for a request (path + canonical payload)."""
+    canonical = _dumps({"path": urlsplit(url).path, "payload": payload})
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def make_response(
+    url: str, status: int, headers: dict[str, str], body: bytes
+) -> requests.Response:
+    """Build a fully-read ``requests.Response`` from recorded parts."""
+    resp = requests.Response()
+    resp.url = url
+    resp.status_code = status
+    resp.headers = CaseInsensitiveDict(headers)
+    resp.encoding = "utf-8"
+    resp._content = body  # iter_lines()/json() read from here  # noqa: SLF001
+    resp._content_consumed = True  # noqa: SLF001
+    return resp
+
+
+class RecordTransport:
+    """Forward requests to *inner* and append every exchange to *path*."""
+
+    def __init__(self, path: str | Path, inner: Transport) -> None:
+        self.path = Path(path)
+        self.inner = inner
+        self._lock = threading.Lock()
+
+    def post(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str],
+        json: dict[str, Any],  # noqa: A002 (mirrors requests)
+        timeout: float,
+        stream: bool = False,
+    ) -> requests.Response:
+        resp = self.inner.post(
+            url, headers=headers, json=json, timeout=timeout, stream=stream
+        )
+        # Reading the body ends live streaming for this call; the returned
+        # response replays the same bytes to the caller.
+        body = resp.content
+        kept = {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS}
+        entry = {
+            "key": request_key(url, json),
+            "request": {"path": urlsplit(url).path, "payload": json},
+            "response": {
+                "status": resp.status_code,
+                "headers": kept,
+                "body_b64": base64.b64encode(body).decode("ascii"),
+            },
+        }
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(_dumps(entry) + "\n")
+        return make_response(url, resp.status_code, kept, body)
+
+
+class ReplayTransport:
+    """Serve responses recorded by ``RecordTransport``; never touch the network."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        try:
+            with self.path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]].append(entry["response"])
+        except (OSError, ValueError, KeyError) as exc:
+            raise TransportError(f"Cannot load cassette {self.path}: {exc}") from exc
+
+    def post(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str],  # noqa: ARG002
+        json: dict[str, Any],  # noqa: A002 (mirrors requests)
+        timeout: float,  # noqa: ARG002
+        stream: bool = False,  # noqa: ARG002
+    ) -> requests.Response:
+        key = request_key(url, json)
+        with self._lock:
+            queue = self._entries.get(key)
+            if not queue:
+                raise TransportError(
+                    f"No recorded response in {self.path} for "
+                    f"{urlsplit(url).path} (model {json.get('model')!r})"
+                )
+            # Keep the last response so repeated runs keep replaying it.
+            recorded = queue.popleft() if len(queue) > 1 else queue[0]
+        return make_response(
+            url,
+            int(recorded["status"]),
+            recorded.get("headers") or {},
+            base64.b64decode(recorded["body_b64"]),
+        )
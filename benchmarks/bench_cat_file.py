@@ -0,0 +1,75 @@
+"""
+Benchmark: one ``git cat-file -p`` process per object vs. the persistent
+``git_utils.CatFile`` worker.
+
+Reads every blob at HEAD of the repository given (default: this checkout).
+
+    poetry run python benchmarks/bench_cat_file.py [REPO] -n 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import time
+
+from b3th import git_utils
+
+
+def _blob_oids(repo: str, limit: int) -> list[str]:
+    out = git_utils.run_git(["ls-tree", "-r", "HEAD"], cwd=repo)
+    oids = [line.split()[2] for line in out.splitlines() if " blob " in line]
+    return (oids * (limit // max(len(oids), 1) + 1))[:limit]
+
+
+def _per_process(repo: str, oids: list[str]) -> list[float]:
+    git = git_utils._git_exe()
+    samples = []
+    for oid in oids:
+        start = time.perf_counter()
+        subprocess.run(  # noqa: S603
+            [git, "cat-file", "-p", oid], cwd=repo, capture_output=True, check=True
+        )
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _worker(repo: str, oids: list[str]) -> list[float]:
+    samples = []
+    with git_utils.CatFile(repo) as cf:
+        cf.read_object(oids[0])  # start the process outside the timing
+        for oid in oids:
+            start = time.perf_counter()
+            cf.read_object(oid)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> float:
+    mean_us = statistics.mean(samples) * 1e6
+    p50_us = statistics.median(samples) * 1e6
+    print(f"{label:<12} mean {mean_us:9.1f} µs  p50 {p50_us:9.1f} µs")
+    return mean_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("repo", nargs="?", default=".")
+    parser.add_argument("-n", type=int, default=500, help="objects to read")
+    args = parser.parse_args()
+
+    oids = _blob_oids(args.repo, args.n)
+    before = _report("per-process", _per_process(args.repo, oids))
+    after = _report("worker", _worker(args.repo, oids))
+
+    with git_utils.CatFile(args.repo) as cf:
+        start = time.perf_counter()
+        cf.read_many(oids)
+        batched = (time.perf_counter() - start) / len(oids) * 1e6
+    print(f"{'read_many':<12} mean {batched:9.1f} µs")
+    print(f"speed-up     {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: the full ``b3th summarize`` path, offline and reproducible.
+
+Builds a throwaway repository, then times the CLI (git, prompt building,
+HTTP, SSE parsing, rendering) three ways:
+
+    mock      against the local mock server with provider-like latency
+    record    the same, saving exchanges to a cassette
+    replay    from the cassette: no sockets, isolates client-side overhead
+
+    poetry run python benchmarks/bench_cli_offline.py -n 20 --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from b3th import llm, transport
+from b3th.cli import app
+from b3th.mock_server import MockGroqServer
+
+
+def _make_repo(root: Path, commits: int = 20) -> None:
+    def git(*args: str) -> None:
+        subprocess.run(  # noqa: S603
+            ["git", *args], cwd=root, check=True, capture_output=True  # noqa: S607
+        )
+
+    git("init", "-q")
+    git("config", "user.email", "bench@example.com")
+    git("config", "user.name", "bench")
+    for i in range(commits):
+        (root / f"f{i}.txt").write_text(f"{i}\n")
+        git("add", ".")
+        git("commit", "-qm", f"feat: change {i}")
+
+
+def _time_cli(repo: Path, n: int) -> list[float]:
+    runner = CliRunner()
+    samples: list[float] = []
+    for _ in range(n):
+        start = time.perf_counter()
+        result = runner.invoke(app, ["summarize", str(repo)])
+        samples.append(time.perf_counter() - start)
+        if result.exit_code != 0:
+            raise SystemExit(result.output)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    mean_ms = statistics.mean(samples) * 1000
+    p50_ms = statistics.median(samples) * 1000
+    print(f"{label:<8} mean {mean_ms:8.2f} ms  p50 {p50_ms:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", type=int, default=20, help="runs per mode")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--token-rate", type=float, default=300.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+    os.environ["B3TH_NO_CACHE"] = "1"
+    reply = "- " + " ".join(f"word{i}" for i in range(60))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp, "repo")
+        repo.mkdir()
+        _make_repo(repo)
+        cassette = Path(tmp, "cassette.jsonl")
+
+        with MockGroqServer(
+            reply, latency=args.latency, token_rate=args.token_rate
+        ) as srv:
+            os.environ["GROQ_API_BASE"] = srv.url
+            _report("mock", _time_cli(repo, args.n))
+            recorder = transport.RecordTransport(cassette, llm._SessionTransport())
+            llm.set_transport(recorder)
+            _report("record", _time_cli(repo, 1))
+
+        llm.set_transport(transport.ReplayTransport(cassette))
+        _report("replay", _time_cli(repo, args.n))
+        llm.set_transport(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: listing the index with `git ls-files` vs. the in-process
+``git_index`` parser.
+
+Builds throw-away repositories whose index holds N entries (all pointing at
+the empty blob, so no worktree files are needed) and times both ways of
+answering "which paths are tracked?" and "is anything unmerged?" for each
+size; git_utils only takes the in-process path below the crossover.
+
+    poetry run python benchmarks/bench_git_index.py -n 1000 10000 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+
+from b3th import git_utils
+from b3th.git_index import GitIndex
+
+
+def _build(repo: str, n: int, version: int) -> None:
+    git_utils.run_git(["init", "-q"], cwd=repo)
+    blob = git_utils.GIT.run(
+        ["hash-object", "-w", "--stdin"], cwd=repo, input=""
+    ).stdout.strip()
+    lines = "".join(
+        f"100644 {blob}\tsrc/pkg{i // 1000:04d}/module_{i % 1000:03d}.py\n"
+        for i in range(n)
+    )
+    git_utils.GIT.run(["update-index", "--index-info"], cwd=repo, input=lines)
+    git_utils.run_git(["update-index", "--index-version", str(version)], cwd=repo)
+
+
+def _best(fn: Callable[[], object], rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _run(repo: str, rounds: int) -> dict[str, float]:
+    def ls_files() -> list[str]:
+        return git_utils.run_git(["ls-files", "-z"], cwd=repo).split("\0")
+
+    def paths() -> list[str]:
+        with GitIndex.load(repo) as index:
+            return index.paths
+
+    def ls_unmerged() -> bool:
+        return bool(git_utils.run_git(["ls-files", "-u"], cwd=repo))
+
+    def has_unmerged() -> bool:
+        with GitIndex.load(repo) as index:
+            return index.has_unmerged()
+
+    cases = {
+        "ls-files -z": ls_files,
+        "GitIndex.paths": paths,
+        "ls-files -u": ls_unmerged,
+        "GitIndex.has_unmerged": has_unmerged,
+    }
+    return {label: _best(fn, rounds) for label, fn in cases.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "-n", type=int, nargs="+", default=[1000, 10_000, 500_000], help="entries"
+    )
+    parser.add_argument("--version", type=int, default=2, choices=(2, 3, 4))
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    for n in args.n:
+        with tempfile.TemporaryDirectory() as repo:
+            _build(repo, n, args.version)
+            results = _run(repo, args.rounds)
+        print(f"{n} entries, index v{args.version}")
+        for label, seconds in results.items():
+            print(f"  {label:<22} {seconds * 1e3:8.2f} ms")
+        listing = results["ls-files -z"] / results["GitIndex.paths"]
+        conflicts = results["ls-files -u"] / results["GitIndex.has_unmerged"]
+        print(f"  speed-up: listing {listing:.1f}x, conflict check {conflicts:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
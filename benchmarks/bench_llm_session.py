@@ -0,0 +1,75 @@
+"""
+Benchmark: pooled keep-alive session vs. a fresh connection per LLM call.
+
+Runs ``llm.chat_completion`` against the local mock Groq server and compares
+it with the previous behaviour (bare ``requests.post`` per attempt).
+
+    poetry run python benchmarks/bench_llm_session.py -n 200
+
+The mock server speaks plain HTTP, so the numbers only include the TCP
+handshake; against the real endpoint each new connection also pays a TLS
+handshake, so the savings there are larger.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from unittest.mock import patch
+
+import requests
+
+from b3th import llm
+from b3th.mock_server import MockGroqServer
+
+
+def _time_calls(n: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(n):
+        start = time.perf_counter()
+        llm.chat_completion("ping", model="bench")
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+class _FreshConnection:
+    """Mimic the old behaviour: a new connection for every request."""
+
+    def post(self, *args, **kwargs):
+        return requests.post(*args, **kwargs)  # noqa: S113 (timeout in kwargs)
+
+
+def _report(label: str, samples: list[float], conns: int) -> float:
+    mean_ms = statistics.mean(samples) * 1000
+    p50_ms = statistics.median(samples) * 1000
+    print(f"{label:<12} mean {mean_ms:7.3f} ms  p50 {p50_ms:7.3f} ms  conns {conns}")
+    return mean_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", type=int, default=200, help="calls per mode")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+    with MockGroqServer(reply="ok") as srv:
+        os.environ["GROQ_API_BASE"] = srv.url
+
+        with patch.object(llm, "_session", lambda: _FreshConnection()):
+            fresh = _time_calls(args.n)
+        fresh_conns = srv.connections
+
+        llm.close_session()
+        _time_calls(1)  # warm the pool
+        pooled = _time_calls(args.n)
+        pooled_conns = srv.connections - fresh_conns
+
+    before = _report("per-call", fresh, fresh_conns)
+    after = _report("pooled", pooled, pooled_conns)
+    print(f"saved        {before - after:7.3f} ms per call")
+
+
+if __name__ == "__main__":
+    main()
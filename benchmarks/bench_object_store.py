@@ -0,0 +1,80 @@
+"""
+Benchmark: reading objects through git (per-process and the cat-file worker)
+vs. the in-process ``object_store`` reader.
+
+Reads objects of the repository given (default: this checkout); point it at
+a large, packed repository to see delta resolution costs.
+
+    poetry run python benchmarks/bench_object_store.py [REPO] -n 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import subprocess
+import time
+
+from b3th import git_utils, object_store
+
+
+def _oids(repo: str, limit: int) -> list[str]:
+    out = git_utils.run_git(
+        ["cat-file", "--batch-all-objects", "--batch-check=%(objectname)"], cwd=repo
+    )
+    oids = out.split()
+    random.Random(0).shuffle(oids)  # noqa: S311 (no favourable pack order)
+    return oids[:limit]
+
+
+def _per_process(repo: str, oids: list[str]) -> float:
+    git = git_utils._git_exe()
+    start = time.perf_counter()
+    for oid in oids:
+        subprocess.run(  # noqa: S603
+            [git, "cat-file", "-p", oid], cwd=repo, capture_output=True, check=True
+        )
+    return time.perf_counter() - start
+
+
+def _worker(repo: str, oids: list[str]) -> float:
+    with git_utils.CatFile(repo) as cf:
+        cf.read_object(oids[0])  # start the process outside the timing
+        start = time.perf_counter()
+        cf.read_many(oids)
+        return time.perf_counter() - start
+
+
+def _in_process(repo: str, oids: list[str]) -> float:
+    with object_store.ObjectStore(repo) as store:
+        start = time.perf_counter()
+        found = store.read_many(oids)
+        elapsed = time.perf_counter() - start
+    if len(found) != len(oids):
+        print(f"  ({len(oids) - len(found)} objects would fall back to git)")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("repo", nargs="?", default=".")
+    parser.add_argument("-n", type=int, default=2000, help="objects to read")
+    parser.add_argument(
+        "--skip-per-process", action="store_true", help="omit the slowest variant"
+    )
+    args = parser.parse_args()
+
+    oids = _oids(args.repo, args.n)
+    results = {}
+    if not args.skip_per_process:
+        results["per-process"] = _per_process(args.repo, oids)
+    results["cat-file"] = _worker(args.repo, oids)
+    results["in-process"] = _in_process(args.repo, oids)
+
+    for label, seconds in results.items():
+        print(f"{label:<12} {seconds / len(oids) * 1e6:9.1f} µs/object")
+    print(f"speed-up vs cat-file  {results['cat-file'] / results['in-process']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: ``stats.get_stats`` (one ``git log --numstat -z`` pass) vs. the
+previous two-pass version (``git log --pretty=%h`` to count commits, then a
+second ``git log --numstat`` walk for files and lines), and the persistent
+``stats_index`` (first build, then a query with nothing new to ingest),
+plus ``get_breakdown`` (per author and per week) from the warm index, and
+the one-pass walk split over ``--jobs`` processes (``stats_parallel``).
+
+Builds a throw-away repository with N linear commits via ``git fast-import``
+(each commit rewrites one of 1000 small files) and times each.
+
+    poetry run python benchmarks/bench_stats.py -n 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from collections.abc import Callable
+
+from b3th import git_utils, stats
+
+
+def _build(repo: str, n: int) -> None:
+    git_utils.run_git(["init", "-q"], cwd=repo)
+    chunks = []
+    for i in range(1, n + 1):
+        msg = f"commit {i}\n"
+        content = f"{i}\n"
+        chunks.append(
+            f"commit refs/heads/main\nmark :{i}\n"
+            f"committer Bench <bench@example.com> {1_600_000_000 + i} +0000\n"
+            f"data {len(msg)}\n{msg}"
+            + (f"from :{i - 1}\n" if i > 1 else "")
+            + f"M 100644 inline src/pkg{i % 100:02d}/mod{i % 1000:03d}.py\n"
+            f"data {len(content)}\n{content}\n"
+        )
+    git_utils.GIT.run(["fast-import", "--quiet"], cwd=repo, input="".join(chunks))
+    git_utils.run_git(["symbolic-ref", "HEAD", "refs/heads/main"], cwd=repo)
+
+
+def _two_pass(repo: str) -> dict[str, int]:
+    """The previous implementation, kept here for comparison."""
+    commits = sum(
+        1
+        for line in git_utils.iter_git(
+            ["log", "--all", "--oneline", "--pretty=%h"], cwd=repo
+        )
+        if line
+    )
+    files = set()
+    additions = deletions = 0
+    for line in git_utils.iter_git(
+        ["log", "--all", "--pretty=tformat:", "--numstat"], cwd=repo
+    ):
+        if not line:
+            continue
+        add, delete, filename = line.split("\t")
+        if add.isdigit():
+            additions += int(add)
+        if delete.isdigit():
+            deletions += int(delete)
+        if add.isdigit() or delete.isdigit():
+            files.add(filename)
+    return {
+        "commits": commits,
+        "files": len(files),
+        "additions": additions,
+        "deletions": deletions,
+    }
+
+
+def _best(fn: Callable[[], object], rounds: int) -> tuple[float, object]:
+    times, result = [], None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", type=int, default=100_000, help="commits")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as repo:
+        start = time.perf_counter()
+        _build(repo, args.n)
+        print(f"built {args.n} commits in {time.perf_counter() - start:.1f}s")
+        two, old = _best(lambda: _two_pass(repo), args.rounds)
+        os.environ["B3TH_STATS_INDEX"] = "0"
+        one, new = _best(lambda: stats.get_stats(repo), args.rounds)
+        par, split = _best(lambda: stats.get_stats(repo, jobs=args.jobs), args.rounds)
+        os.environ["B3TH_STATS_INDEX"] = "1"
+        build, _ = _best(lambda: stats.get_stats(repo), 1)
+        warm, indexed = _best(lambda: stats.get_stats(repo), args.rounds)
+        by = {
+            key: _best(lambda key=key: stats.get_breakdown(repo, key), args.rounds)[0]
+            for key in ("author", "week")
+        }
+
+    for other in (new, split, indexed):
+        if other != old:
+            raise SystemExit(f"results differ: {old} vs {other}")
+    print(f"two passes (%h, then --numstat)  {two:8.2f} s")
+    print(f"one pass (--numstat -z)          {one:8.2f} s   {two / one:.2f}x")
+    print(f"{f'one pass, --jobs {args.jobs}':<33}{par:8.2f} s   {two / par:.2f}x")
+    print(f"index, first build               {build:8.2f} s")
+    print(f"index, up to date                {warm:8.2f} s   {two / warm:.0f}x")
+    for key, seconds in by.items():
+        print(f"{f'breakdown by {key}, index':<33}{seconds:8.2f} s")
+    print(new)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Shared fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_llm_cache(monkeypatch, tmp_path_factory):
+    """Give every test its own empty LLM reply cache."""
+    from b3th import llm_cache
+
+    monkeypatch.setenv("B3TH_CACHE_DIR", str(tmp_path_factory.mktemp("llm-cache")))
+    monkeypatch.delenv("B3TH_NO_CACHE", raising=False)
+    llm_cache.set_enabled(None)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rate_limiter():
+    """Don't let rate-limit state learnt in one test throttle the next."""
+    from b3th import ratelimit
+
+    ratelimit.LIMITER.reset()
+    yield
+    ratelimit.LIMITER.reset()
+
+
+@pytest.fixture(autouse=True)
+def _no_hedging(monkeypatch):
+    """Hedging is opt-in; keep a developer's B3TH_HEDGE_* out of the tests."""
+    from b3th import llm
+
+    monkeypatch.delenv("B3TH_HEDGE_AFTER", raising=False)
+    monkeypatch.delenv("B3TH_HEDGE_MODEL", raising=False)
+    llm.set_hedging(None, None)
+
+
+@pytest.fixture(autouse=True)
+def _no_trace(monkeypatch):
+    """Don't append test calls to a developer's B3TH_TRACE file."""
+    from b3th import telemetry
+
+    monkeypatch.delenv("B3TH_TRACE", raising=False)
+    telemetry.set_trace_path(None)
+
+
+@pytest.fixture(autouse=True)
+def _default_timeouts(monkeypatch):
+    """Keep a developer's B3TH_TIMEOUT_* out of the tests."""
+    from b3th import config
+
+    for kind in config.TIMEOUT_DEFAULTS:
+        monkeypatch.delenv(f"B3TH_TIMEOUT_{kind.upper()}", raising=False)
+    config.clear_config_cache()
+
+
+@pytest.fixture()
+def async_stub():
+    """Factory for async git-helper stubs that return a fixed value."""
+
+    def make(value):
+        async def stub(*_a):
+            return value
+
+        return stub
+
+    return make
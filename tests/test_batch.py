@@ -0,0 +1,94 @@
+"""
+Tests for b3th.batch against the local mock server's Batch API endpoints.
+"""
+
+import json
+
+import pytest
+
+from b3th import batch, llm, llm_cache
+from b3th.mock_server import MockGroqServer
+
+
+def _echo(payload):
+    """Reply with the upper-cased user prompt; prompts saying 'fail' error out."""
+    prompt = payload["messages"][-1]["content"]
+    if "fail" in prompt:
+        raise ValueError("bad prompt")
+    return prompt.upper()
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    with MockGroqServer(reply=_echo, batch_polls=2) as srv:
+        monkeypatch.setenv("GROQ_API_KEY", "test_key")
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        llm.close_session()
+        yield srv
+    llm.close_session()
+
+
+def test_write_requests_jsonl(tmp_path, monkeypatch):
+    monkeypatch.setenv("GROQ_MODEL", "m")
+    path = batch.write_requests({"a": "hi"}, tmp_path / "in.jsonl", system="sys")
+    (line,) = path.read_text().splitlines()
+    req = json.loads(line)
+    assert req["custom_id"] == "a"
+    assert req["url"] == "/v1/chat/completions"
+    assert req["body"]["messages"] == [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "hi"},
+    ]
+
+
+def test_run_batch_maps_results_to_ids(server):
+    results = batch.run_batch({"x": "one", "y": "two"}, poll_interval=0)
+    assert list(results) == ["x", "y"]
+    assert results["x"] == batch.BatchResult("x", "ONE")
+    assert results["y"].content == "TWO"
+
+
+def test_run_batch_reports_per_item_errors(server):
+    results = batch.run_batch({"ok": "fine", "bad": "fail me"}, poll_interval=0)
+    assert results["ok"].ok
+    assert not results["bad"].ok
+    assert "bad prompt" in results["bad"].error
+
+
+def test_run_batch_uses_cache(server):
+    batch.run_batch({"x": "one"}, poll_interval=0)
+    served = server.requests
+    results = batch.run_batch({"again": "one"}, poll_interval=0)
+    assert results["again"].content == "ONE"
+    assert server.requests == served  # nothing submitted
+    # The batch reply is shared with chat_completion's cache.
+    assert llm.chat_completion("one") == "ONE"
+    assert server.requests == served
+
+
+def test_run_batch_without_cache_submits(server):
+    llm_cache.set_enabled(False)
+    batch.run_batch({"x": "one"}, poll_interval=0)
+    served = server.requests
+    batch.run_batch({"x": "one"}, poll_interval=0)
+    assert server.requests > served
+
+
+def test_run_batch_splits_large_inputs(server, monkeypatch):
+    monkeypatch.setattr(batch, "_MAX_LINES_PER_FILE", 2)
+    results = batch.run_batch({str(i): f"p{i}" for i in range(5)}, poll_interval=0)
+    assert [r.content for r in results.values()] == [f"P{i}" for i in range(5)]
+    assert len(server._server.batches) == 3
+
+
+def test_wait_times_out(server, tmp_path):
+    path = batch.write_requests({"x": "one"}, tmp_path / "in.jsonl")
+    batch_id = batch.submit(path)
+    with pytest.raises(batch.BatchError, match="still in_progress"):
+        batch.wait(batch_id, poll_interval=10, timeout=1)
+
+
+def test_upload_error_is_batch_error(server):
+    server.fail_next(500)
+    with pytest.raises(batch.BatchError, match="500"):
+        batch.run_batch({"x": "one"}, poll_interval=0)
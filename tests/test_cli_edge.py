@@ -17,7 +17,7 @@ def test_sync_commit_message_error(monkeypatch, tmp_path: Path):
 
     # git add succeeds so we reach the generator error
     monkeypatch.setattr(
-        "b3th.cli.subprocess.run",
+        "b3th.git_utils.run_process",
         lambda *a, **k: SimpleNamespace(returncode=0),
         raising=True,
     )
@@ -48,7 +48,7 @@ def test_sync_git_commit_failure(monkeypatch, tmp_path: Path):
         calls["n"] += 1
         return SimpleNamespace(returncode=0 if calls["n"] == 1 else 1)
 
-    monkeypatch.setattr("b3th.cli.subprocess.run", fake_run, raising=True)
+    monkeypatch.setattr("b3th.git_utils.run_process", fake_run, raising=True)
 
     res = runner.invoke(app, ["sync", str(repo), "-y"])
     assert res.exit_code != 0
@@ -67,6 +67,7 @@ def test_sync_git_push_failure(monkeypatch, tmp_path: Path):
 
     # add -> 0, commit -> 0, push -> 1
     def fake_run(args, **kwargs):
+        args = ["git", *args[1:]]  # argv[0] is the resolved git path
         if args[:3] == ["git", "add", "--all"]:
             return SimpleNamespace(returncode=0)
         if args[:2] == ["git", "commit"]:
@@ -75,7 +76,7 @@ def test_sync_git_push_failure(monkeypatch, tmp_path: Path):
             return SimpleNamespace(returncode=1)
         return SimpleNamespace(returncode=0)
 
-    monkeypatch.setattr("b3th.cli.subprocess.run", fake_run, raising=True)
+    monkeypatch.setattr("b3th.git_utils.run_process", fake_run, raising=True)
 
     res = runner.invoke(app, ["sync", str(repo), "-y"])
     assert res.exit_code != 0
@@ -16,10 +16,11 @@ def test_sync_cancel(monkeypatch, tmp_path: Path):
     calls = []
 
     def fake_run(args, **kwargs):
+        args = ["git", *args[1:]]  # argv[0] is the resolved git path
         calls.append(args)
         return SimpleNamespace(returncode=0)
 
-    monkeypatch.setattr("b3th.cli.subprocess.run", fake_run, raising=True)
+    monkeypatch.setattr("b3th.git_utils.run_process", fake_run, raising=True)
     monkeypatch.setattr("b3th.cli.typer.confirm", lambda *_: False, raising=True)
 
     res = runner.invoke(app, ["sync", str(repo)])
@@ -37,7 +38,7 @@ def test_sync_git_add_failure(monkeypatch, tmp_path: Path):
     def fake_run(args, **kwargs):
         return SimpleNamespace(returncode=1)
 
-    monkeypatch.setattr("b3th.cli.subprocess.run", fake_run, raising=True)
+    monkeypatch.setattr("b3th.git_utils.run_process", fake_run, raising=True)
 
     res = runner.invoke(app, ["sync", str(repo), "-y"])
     assert res.exit_code != 0
@@ -111,12 +112,30 @@ def test_commit_deprecated_alias(monkeypatch, tmp_path: Path):
     calls = []
 
     def fake_run(args, **kwargs):
+        args = ["git", *args[1:]]  # argv[0] is the resolved git path
         calls.append(args)
         return SimpleNamespace(returncode=0)
 
-    monkeypatch.setattr("b3th.cli.subprocess.run", fake_run, raising=True)
+    monkeypatch.setattr("b3th.git_utils.run_process", fake_run, raising=True)
 
     res = runner.invoke(app, ["commit", str(repo), "-y"])
     assert res.exit_code == 0
     assert "deprecated" in res.output.lower()
     assert ["git", "push", "-u", "origin", "feat-x"] in calls
+
+
+def test_commands_run_inside_a_repo_scope(monkeypatch, tmp_path: Path):
+    """Every command shares one memoized RepoContext per repository."""
+    from b3th import git_utils
+
+    scoped = []
+
+    def fake_summary(*_a, **_k):
+        scoped.append(git_utils._REPO_SCOPE.get() is not None)
+        return "ok"
+
+    monkeypatch.setattr("b3th.cli.summarize_commits", fake_summary, raising=True)
+    result = runner.invoke(app, ["summarize", str(tmp_path)])
+    assert result.exit_code == 0
+    assert scoped == [True]
+    assert git_utils._REPO_SCOPE.get() is None  # closed with the command
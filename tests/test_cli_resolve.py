@@ -55,3 +55,19 @@ def test_resolve_apply_overwrites(monkeypatch, tmp_path: Path):
     assert orig.read_text() == "merged\n"
     # *.resolved removed
     assert not resolved_path.exists()
+
+
+def test_resolve_passes_max_in_flight(monkeypatch, tmp_path: Path):
+    repo = tmp_path / "r3"
+    repo.mkdir()
+    monkeypatch.setattr("b3th.cli.has_merge_conflicts", lambda *_: True, raising=True)
+    seen = {}
+
+    def fake_resolve(_repo, **kwargs):
+        seen.update(kwargs)
+        return []
+
+    monkeypatch.setattr("b3th.cli.resolve_conflicts", fake_resolve, raising=True)
+
+    runner.invoke(app, ["resolve", str(repo), "--max-in-flight", "8"])
+    assert seen["max_in_flight"] == 8
@@ -0,0 +1,74 @@
+"""Tests for incremental (streamed) rendering of LLM output in the CLI."""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from typer.testing import CliRunner
+
+from b3th import llm
+from b3th.cli import app
+
+runner = CliRunner()
+
+
+def _fake_stream(*_a, **_k):
+    yield "feat: "
+    yield "greet"
+
+
+def test_sync_streams_commit_message(monkeypatch, tmp_path: Path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    monkeypatch.setattr("b3th.cli.is_git_repo", lambda *_: True, raising=True)
+    monkeypatch.setattr(
+        "b3th.git_utils.run_process",
+        lambda *a, **k: SimpleNamespace(returncode=0),
+        raising=True,
+    )
+    monkeypatch.setattr(llm, "stream_chat_completion", _fake_stream, raising=True)
+    monkeypatch.setattr(
+        "b3th.cli.generate_commit_message",
+        lambda *_: (llm.chat_completion("diff"), ""),
+        raising=True,
+    )
+    monkeypatch.setattr("b3th.cli.typer.confirm", lambda *_: False, raising=True)
+
+    res = runner.invoke(app, ["sync", str(repo)])
+    assert res.exit_code == 0
+    assert "Proposed commit message:\nfeat: greet\n" in res.output
+    # Streamed text is not echoed a second time
+    assert res.output.count("feat: greet") == 1
+
+
+def test_summarize_streams_tokens(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(llm, "stream_chat_completion", _fake_stream, raising=True)
+    monkeypatch.setattr(
+        "b3th.cli.summarize_commits",
+        lambda *_a, **_k: llm.chat_completion("commits"),
+        raising=True,
+    )
+
+    res = runner.invoke(app, ["summarize", str(tmp_path)])
+    assert res.exit_code == 0
+    assert res.output == "feat: greet\n"
+
+
+def test_no_stream_flag_prints_parsed_result(monkeypatch, tmp_path: Path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    def no_stream(*_a, **_k):
+        raise AssertionError("streaming path used despite --no-stream")
+
+    monkeypatch.setattr("b3th.cli.is_git_repo", lambda *_: True, raising=True)
+    monkeypatch.setattr(llm, "stream_chat_completion", no_stream, raising=True)
+    monkeypatch.setattr(
+        "b3th.cli.generate_pr_description",
+        lambda *_a, **_k: ("add api", "Body"),
+        raising=True,
+    )
+    monkeypatch.setattr("b3th.cli.typer.confirm", lambda *_: False, raising=True)
+
+    res = runner.invoke(app, ["--no-stream", "prdraft", str(repo)])
+    assert res.exit_code == 0
+    assert "Proposed draft PR:\nadd api\n\nBody" in res.output
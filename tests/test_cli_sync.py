@@ -32,10 +32,11 @@ def test_sync_full_flow(monkeypatch, tmp_path: Path):
     calls = []
 
     def fake_run(args, **kwargs):
+        args = ["git", *args[1:]]  # argv[0] is the resolved git path
         calls.append(args)
         return SimpleNamespace(returncode=0)
 
-    monkeypatch.setattr("b3th.cli.subprocess.run", fake_run, raising=True)
+    monkeypatch.setattr("b3th.git_utils.run_process", fake_run, raising=True)
 
     result = runner.invoke(app, ["sync", str(repo), "-y"])
     assert result.exit_code == 0
@@ -50,3 +51,29 @@ def test_sync_full_flow(monkeypatch, tmp_path: Path):
         "add friendly greeting",
     ] in calls
     assert ["git", "push", "-u", "origin", "feat-x"] in calls
+
+
+def test_sync_reports_push_timeout(monkeypatch, tmp_path: Path):
+    """A push that hits B3TH_TIMEOUT_PUSH fails cleanly instead of hanging."""
+    import subprocess
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    monkeypatch.setattr("b3th.cli.is_git_repo", lambda _: True, raising=True)
+    monkeypatch.setattr("b3th.cli.get_current_branch", lambda _: "feat-x", raising=True)
+    monkeypatch.setattr(
+        "b3th.cli.generate_commit_message", lambda *_: ("feat: x", ""), raising=True
+    )
+    monkeypatch.setenv("B3TH_TIMEOUT_PUSH", "7")
+
+    def fake_run(args, **kwargs):
+        if args[1] == "push":
+            raise subprocess.TimeoutExpired(args, kwargs["timeout"])
+        return SimpleNamespace(returncode=0)
+
+    monkeypatch.setattr("b3th.git_utils.run_process", fake_run, raising=True)
+
+    result = runner.invoke(app, ["sync", str(repo), "-y"])
+    assert result.exit_code == 1
+    assert "timed out after 7.0s" in result.output
+    assert "git push failed" in result.output
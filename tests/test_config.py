@@ -164,3 +164,43 @@ def test_require_raises_with_hint_and_path(monkeypatch, tmp_path: Path):
     assert "GitHub token" in msg
     assert "please set it" in msg
     assert str(custom) in msg  # message should reference resolved config path
+
+
+def test_timeouts_env_then_toml_then_default(monkeypatch, tmp_path: Path):
+    """B3TH_TIMEOUT_<CLASS> beats [timeouts] in TOML, which beats the default."""
+    cfg_file = tmp_path / "config.toml"
+    cfg_file.write_text('[timeouts]\npush = 120\ngh = "off"\nread = "soon"\n')
+    monkeypatch.setenv("B3TH_CONFIG", str(cfg_file))
+    assert config.get_timeout("push") == 120.0
+    assert config.get_timeout("gh") is None
+    assert config.get_timeout("read") == config.TIMEOUT_DEFAULTS["read"]
+    assert config.get_timeout("commit") == 600.0
+
+    monkeypatch.setenv("B3TH_TIMEOUT_PUSH", "45")
+    monkeypatch.setenv("B3TH_TIMEOUT_COMMIT", "0")
+    assert config.get_timeout("push") == 45.0
+    assert config.get_timeout("commit") is None
+    with pytest.raises(KeyError):
+        config.get_timeout("fetch")
+
+
+def test_config_parsed_once_per_file_version(monkeypatch, tmp_path: Path):
+    """Each git call looks up a timeout; the TOML is parsed only on change."""
+    cfg_file = tmp_path / "config.toml"
+    cfg_file.write_text("[timeouts]\npush = 120\n")
+    monkeypatch.setenv("B3TH_CONFIG", str(cfg_file))
+    loads = []
+    real_load = config.tomllib.load
+
+    def counting_load(fh):
+        loads.append(fh.name)
+        return real_load(fh)
+
+    monkeypatch.setattr(config.tomllib, "load", counting_load)
+    for _ in range(5):
+        assert config.get_timeout("push") == 120.0
+    assert len(loads) == 1
+
+    cfg_file.write_text("[timeouts]\npush = 3600\n")  # edited in place
+    assert config.get_timeout("push") == 3600.0
+    assert len(loads) == 2
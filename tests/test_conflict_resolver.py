@@ -2,10 +2,14 @@
 Tests for conflict_resolver: listing, hunk extraction, Groq-powered resolution.
 """
 
+import asyncio
 import subprocess
 from pathlib import Path
 
+import pytest
+
 import b3th.conflict_resolver as cr
+from b3th import llm as cr_llm
 
 _CONFLICT_TEXT = """\
 line-1
@@ -34,14 +38,30 @@ def _init_repo(repo: Path) -> None:
     )  # noqa: S603,S607
 
 
-def _seed_conflict(repo: Path, fname: str = "file.txt") -> Path:
-    f = repo / fname
-    f.write_text(_CONFLICT_TEXT)
-    subprocess.run(["git", "add", "."], cwd=repo, check=True)  # noqa: S603,S607
-    subprocess.run(
-        ["git", "commit", "-m", "seed"], cwd=repo, check=True
-    )  # noqa: S603,S607
-    return f
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, check=True)  # noqa: S603,S607
+
+
+def _write_all(repo: Path, names: tuple[str, ...], a: str, b: str) -> None:
+    for name in names:
+        (repo / name).write_text(f"line-1\n{a}\nx\nx\nx\nline-2\n{b}\n")
+
+
+def _seed_conflicts(repo: Path, *names: str) -> list[Path]:
+    """Merge two branches that edit the same two lines of every file."""
+    names = names or ("file.txt",)
+    _write_all(repo, names, "a", "b")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-qm", "base")
+    _git(repo, "checkout", "-qb", "feature")
+    _write_all(repo, names, "theirs-a", "theirs-b")
+    _git(repo, "commit", "-qam", "theirs")
+    _git(repo, "checkout", "-q", "-")
+    _write_all(repo, names, "ours-a", "ours-b")
+    _git(repo, "commit", "-qam", "ours")
+    merge = ["git", "merge", "-q", "feature"]  # exits 1: conflicts
+    subprocess.run(merge, cwd=repo, capture_output=True)  # noqa: S603
+    return [repo / name for name in names]
 
 
 # tests
@@ -51,8 +71,23 @@ def test_conflict_listing(tmp_path: Path) -> None:
     repo = tmp_path / "r"
     repo.mkdir()
     _init_repo(repo)
-    path = _seed_conflict(repo)
-    assert cr.list_conflicted_files(repo) == [path]
+    paths = _seed_conflicts(repo, "a.txt", "b.txt")
+    assert cr.list_conflicted_files(repo) == paths
+
+
+def test_committed_markers_are_not_conflicts(tmp_path: Path) -> None:
+    """A tracked file that merely contains markers (docs, fixtures) is ignored."""
+    repo = tmp_path / "r"
+    repo.mkdir()
+    _init_repo(repo)
+    fixture = repo / "fixture.txt"
+    fixture.write_text(_CONFLICT_TEXT)
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-qm", "fixture")
+
+    assert cr.list_conflicted_files(repo) == []
+    assert cr.list_conflicted_files(repo, scan_markers=True) == [fixture]
+    assert cr.list_conflicted_files(tmp_path / "missing") == []
 
 
 def test_extract_hunks(tmp_path: Path) -> None:
@@ -67,7 +102,7 @@ def test_build_prompt(tmp_path: Path) -> None:
     repo = tmp_path / "r2"
     repo.mkdir()
     _init_repo(repo)
-    path = _seed_conflict(repo, "f.txt")
+    (path,) = _seed_conflicts(repo, "f.txt")
     prompt = cr.build_resolution_prompt(repo)
     assert prompt and path.name in prompt and "### Conflict 2" in prompt
 
@@ -77,14 +112,64 @@ def test_llm_resolution(tmp_path: Path, monkeypatch) -> None:
     repo = tmp_path / "r3"
     repo.mkdir()
     _init_repo(repo)
-    path = _seed_conflict(repo, "conf.txt")
+    (path,) = _seed_conflicts(repo, "conf.txt")
 
-    # Stub chat_completion
+    # Stub achat_completion
     stub_output = "merged\ncode\n"
-    monkeypatch.setattr(cr, "chat_completion", lambda prompt, model=None: stub_output)
+
+    async def fake_achat(prompt, model=None):
+        return stub_output
+
+    monkeypatch.setattr(cr, "achat_completion", fake_achat)
 
     out_paths = cr.resolve_conflicts(repo, model="gpt-mock")
     expected_out = path.with_suffix(".txt.resolved")
 
     assert out_paths == [expected_out]
     assert expected_out.read_text() == stub_output
+
+
+def test_llm_resolution_runs_files_concurrently(tmp_path: Path, monkeypatch) -> None:
+    """Per-file calls overlap, but never exceed the in-flight cap."""
+    repo = tmp_path / "r4"
+    repo.mkdir()
+    _init_repo(repo)
+    _seed_conflicts(repo, *(f"f{i}.txt" for i in range(4)))
+
+    state = {"now": 0, "peak": 0}
+
+    async def fake_achat(prompt, model=None):
+        state["now"] += 1
+        state["peak"] = max(state["peak"], state["now"])
+        await asyncio.sleep(0.05)
+        state["now"] -= 1
+        return next(ln for ln in prompt.splitlines() if ln.startswith("## File"))
+
+    monkeypatch.setattr(cr, "achat_completion", fake_achat)
+
+    out_paths = cr.resolve_conflicts(repo, max_in_flight=2)
+    assert len(out_paths) == 4
+    assert state["peak"] == 2
+    for p in out_paths:
+        assert p.name.replace(".resolved", "") in p.read_text()
+
+
+def test_llm_resolution_writes_successes_before_raising(
+    tmp_path: Path, monkeypatch
+) -> None:
+    repo = tmp_path / "r5"
+    repo.mkdir()
+    _init_repo(repo)
+    _seed_conflicts(repo, "good.txt", "bad.txt")
+
+    async def fake_achat(prompt, model=None):
+        if "bad.txt" in prompt:
+            raise cr_llm.LLMError("boom")
+        return "merged"
+
+    monkeypatch.setattr(cr, "achat_completion", fake_achat)
+
+    with pytest.raises(cr_llm.LLMError):
+        cr.resolve_conflicts(repo)
+    assert (repo / "good.txt.resolved").read_text() == "merged\n"
+    assert not (repo / "bad.txt.resolved").exists()
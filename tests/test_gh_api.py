@@ -178,7 +178,7 @@ def test_create_pr_uses_gh_cli_when_no_token(monkeypatch, tmp_path: Path):
 
     captured = {}
 
-    def fake_run(cmd, input=None, text=False, capture_output=False):  # noqa: ANN001
+    def fake_run(cmd, input=None, timeout=None, new_group=False):  # noqa: ANN001, A002
         captured["cmd"] = cmd
         captured["input"] = input
         return SimpleNamespace(
@@ -187,7 +187,7 @@ def test_create_pr_uses_gh_cli_when_no_token(monkeypatch, tmp_path: Path):
             stderr="",
         )
 
-    monkeypatch.setattr(gh_api.subprocess, "run", fake_run, raising=True)
+    monkeypatch.setattr(gh_api, "run_process", fake_run, raising=True)
 
     url = gh_api.create_pull_request("t", "b", repo_path=repo)
     assert url.endswith("/pull/123")
@@ -207,10 +207,10 @@ def test_post_json_parses_malformed_gh_output(monkeypatch):
     monkeypatch.setattr(gh_api, "get_github_token", raise_cfg, raising=True)
 
     # Simulate `gh api` returning invalid JSON
-    def fake_run(cmd, input=None, text=False, capture_output=False):  # noqa: ANN001
+    def fake_run(cmd, input=None, timeout=None, new_group=False):  # noqa: ANN001, A002
         return SimpleNamespace(returncode=0, stdout="not-json", stderr="")
 
-    monkeypatch.setattr(gh_api.subprocess, "run", fake_run, raising=True)
+    monkeypatch.setattr(gh_api, "run_process", fake_run, raising=True)
 
     with pytest.raises(gh_api.GitHubAPIError):
         gh_api._post_json("/repos/x/y/pulls", {"x": 1})
@@ -232,10 +232,10 @@ def test_gh_cli_nonzero_exit(monkeypatch, tmp_path: Path):
     monkeypatch.setattr(gh_api, "get_github_token", raise_cfg, raising=True)
 
     # gh api fails
-    def fake_run(cmd, input=None, text=False, capture_output=False):  # noqa: ANN001
+    def fake_run(cmd, input=None, timeout=None, new_group=False):  # noqa: ANN001, A002
         return SimpleNamespace(returncode=1, stdout="", stderr="fail!")
 
-    monkeypatch.setattr(gh_api.subprocess, "run", fake_run, raising=True)
+    monkeypatch.setattr(gh_api, "run_process", fake_run, raising=True)
 
     with pytest.raises(gh_api.GitHubAPIError):
         gh_api.create_pull_request("t", "b", repo_path=repo)
@@ -302,7 +302,7 @@ def test_run_git_raises_on_nonzero(monkeypatch):
     def fake_run(*_a, **_k):
         return SimpleNamespace(returncode=1, stdout="", stderr="fatal: bad")
 
-    monkeypatch.setattr(gh_api.subprocess, "run", fake_run, raising=True)
+    monkeypatch.setattr("b3th.git_utils.run_process", fake_run, raising=True)
 
     with pytest.raises(gh_api.GitRepoError):
         gh_api._run_git(["status"])
@@ -366,3 +366,39 @@ def test_push_current_branch_failure(monkeypatch, tmp_path: Path):
 
     with pytest.raises(gh_api.GitRepoError):
         gh_api._push_current_branch(repo)
+
+
+def test_gh_timeouts_are_reported(monkeypatch):
+    """Both transports honour B3TH_TIMEOUT_GH and emit a timed-out GhCall."""
+    import subprocess
+
+    from b3th import telemetry
+
+    monkeypatch.setenv("B3TH_TIMEOUT_GH", "5")
+
+    def slow_post(url, headers=None, json=None, timeout=None):  # noqa: ANN001
+        raise requests.Timeout("read timed out")
+
+    def slow_run(cmd, input=None, timeout=None, new_group=False):  # noqa: ANN001, A002
+        assert new_group
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    monkeypatch.setattr(gh_api.requests, "post", slow_post, raising=True)
+    monkeypatch.setattr(gh_api, "run_process", slow_run, raising=True)
+    monkeypatch.setattr(gh_api, "_gh_exe", lambda: "gh", raising=True)
+
+    records = []
+    remove = telemetry.add_hook(records.append)
+    try:
+        with pytest.raises(gh_api.GitHubAPIError, match="within 5.0s"):
+            gh_api._requests_post("/repos/x/y/pulls", {}, "tok")
+        with pytest.raises(gh_api.GitHubAPIError, match="timed out after 5.0s"):
+            gh_api._gh_cli_post("/repos/x/y/pulls", {})
+    finally:
+        remove()
+
+    assert [(r.kind, r.transport, r.timed_out) for r in records] == [
+        ("gh", "rest", True),
+        ("gh", "cli", True),
+    ]
+    assert all(r.timeout_s == 5.0 for r in records)
@@ -0,0 +1,133 @@
+"""
+In-process index parser (b3th.git_index), checked against git ls-files.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from b3th import git_index, git_utils
+
+
+def _git(repo: Path, *args: str) -> str:
+    cmd = ["git", *args]
+    return subprocess.run(  # noqa: S603,S607
+        cmd, cwd=repo, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _repo(repo: Path) -> None:
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "t@example.com")
+    _git(repo, "config", "user.name", "T")
+    for sub in ("a", "b/c/d"):
+        (repo / sub).mkdir(parents=True)
+    for name in ("a/one.txt", "b/c/two.txt", "b/c/d/three.txt", "top.txt"):
+        (repo / name).write_text(name + "\n")
+    _git(repo, "add", ".")
+
+
+def _ls_files(repo: Path, *flags: str) -> list[str]:
+    return [p for p in _git(repo, "ls-files", "-z", *flags).split("\0") if p]
+
+
+@pytest.mark.parametrize("version", [2, 3, 4])
+def test_matches_ls_files(tmp_path: Path, version: int) -> None:
+    _repo(tmp_path)
+    # a name of 0xFFF bytes or more is stored NUL-terminated, not by length;
+    # too long for the filesystem, so it goes straight into the index
+    long_name = "/".join(["x" * 200] * 22) + ".txt"
+    empty_blob = _git(tmp_path, "hash-object", "-w", "/dev/null").strip()
+    _git(
+        tmp_path,
+        "update-index",
+        "--add",
+        "--cacheinfo",
+        f"100644,{empty_blob},{long_name}",
+    )
+    (tmp_path / "new.txt").write_text("intent\n")
+    _git(tmp_path, "add", "-N", "new.txt")  # extended flags (v3+)
+    _git(tmp_path, "update-index", "--index-version", str(version))
+
+    index = git_index.GitIndex.load(tmp_path)
+    assert index.version == max(version, 3)  # intent-to-add needs v3
+    assert index.paths == _ls_files(tmp_path)
+    stage_line = _git(tmp_path, "ls-files", "-s", "top.txt").split()
+    top = index.entry(index.paths.index("top.txt"))
+    assert (oct(top.mode)[2:], top.oid, str(top.stage)) == tuple(stage_line[:3])
+    assert top.size == len("top.txt\n")
+    assert len(list(index)) == len(index)
+    assert index.entry(index.paths.index(long_name)).oid == empty_blob
+
+
+def test_unmerged_and_cache_tree(tmp_path: Path, monkeypatch) -> None:
+    _repo(tmp_path)
+    _git(tmp_path, "commit", "-qm", "base")
+    index = git_index.GitIndex.load(tmp_path)
+    head_tree = _git(tmp_path, "rev-parse", "HEAD^{tree}").strip()
+    assert index.tree_oid == head_tree
+    assert not index.has_unmerged()
+    assert git_utils.has_staged_changes(tmp_path) is False
+    with monkeypatch.context() as m:  # clean index: no `git diff` at all
+        m.setattr(git_utils, "scan_staged", None)
+        assert git_utils.get_staged_diff(tmp_path) == ""
+
+    (tmp_path / "top.txt").write_text("changed\n")
+    _git(tmp_path, "add", "top.txt")  # invalidates the cache-tree root
+    assert git_index.GitIndex.load(tmp_path).tree_oid is None
+    assert git_utils.has_staged_changes(tmp_path) is True
+
+    _git(tmp_path, "commit", "-qm", "ours")
+    _git(tmp_path, "checkout", "-qb", "other", "HEAD~1")
+    (tmp_path / "b/c/two.txt").write_text("theirs\n")
+    (tmp_path / "top.txt").write_text("theirs\n")
+    _git(tmp_path, "commit", "-qam", "theirs")
+    _git(tmp_path, "checkout", "-q", "-")
+    (tmp_path / "b/c/two.txt").write_text("ours\n")
+    _git(tmp_path, "commit", "-qam", "ours again")
+    merge = ["git", "merge", "-q", "other"]  # exits 1: conflicts
+    subprocess.run(merge, cwd=tmp_path, capture_output=True)  # noqa: S603
+
+    index = git_index.GitIndex.load(tmp_path)
+    assert index.has_unmerged()
+    unmerged = index.unmerged()
+    assert sorted(unmerged) == ["b/c/two.txt", "top.txt"]
+    for line in _git(tmp_path, "ls-files", "-u").splitlines():
+        info, name = line.split("\t")
+        _mode, oid, stage = info.split()
+        assert unmerged[name][int(stage)] == oid
+
+    # git_utils answers relative to the directory it is given
+    assert list(git_utils.unmerged_files(tmp_path / "b")) == ["c/two.txt"]
+    assert git_utils.has_merge_conflicts(tmp_path / "b") is True
+    assert git_utils.has_merge_conflicts(tmp_path / "a") is False
+
+
+def test_unsupported_index_falls_back_to_git(tmp_path: Path) -> None:
+    _repo(tmp_path)
+    _git(tmp_path, "update-index", "--split-index")
+    with pytest.raises(git_index.IndexFormatError, match="link"):
+        git_index.GitIndex.load(tmp_path)
+    assert git_utils.unmerged_files(tmp_path) == {}
+    assert git_utils.has_merge_conflicts(tmp_path) is False
+    assert git_utils.has_staged_changes(tmp_path) is True  # unborn, files added
+
+
+def test_large_indexes_are_left_to_git(tmp_path: Path, monkeypatch) -> None:
+    _repo(tmp_path)
+    monkeypatch.setattr(git_utils, "INDEX_FAST_PATH_MAX_BYTES", 0)
+    monkeypatch.setattr(git_utils, "GitIndex", None)  # must not be used
+    assert git_utils.has_staged_changes(tmp_path) is True
+    assert git_utils.has_merge_conflicts(tmp_path) is False
+
+
+def test_bad_files(tmp_path: Path) -> None:
+    bad = tmp_path / "index"
+    for content in (b"", b"XXXX" + bytes(40), b"DIRC\0\0\0\x07" + bytes(40)):
+        bad.write_bytes(content)
+        with pytest.raises(git_index.IndexFormatError):
+            git_index.GitIndex.from_file(bad)
+    with pytest.raises(git_index.IndexFormatError):
+        git_index.GitIndex.load(tmp_path)  # not a repository
+    assert git_index.find_repo(tmp_path) is None
@@ -4,6 +4,9 @@ Unit tests for b3th.git_utils helpers, including merge-conflict detection.
 
 import subprocess
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 from b3th import git_utils
 
@@ -103,3 +106,419 @@ def test_detect_conflicts(tmp_path: Path) -> None:
     subprocess.run(["git", "merge", "-q", "feature"], cwd=tmp_path)  # noqa: S603,S607
 
     assert git_utils.has_merge_conflicts(tmp_path) is True
+    stages = git_utils.unmerged_files(tmp_path)["file.txt"]
+    assert sorted(stages) == [1, 2, 3]
+    theirs = git_utils.read_object(stages[3], tmp_path)
+    assert theirs.data == b"feature change\n"
+
+
+def test_marker_scan_is_opt_in(tmp_path: Path, monkeypatch) -> None:
+    """Files that merely contain "<<<<<<< " are only flagged by the grep scan."""
+    _commit_files(tmp_path, {"doc.md": "<<<<<<< HEAD\nexample\n"})
+    assert git_utils.has_merge_conflicts(tmp_path) is False
+    assert git_utils.has_merge_conflicts(tmp_path, scan_markers=True) is True
+    monkeypatch.setenv("B3TH_CONFLICT_MARKERS", "1")
+    assert git_utils.conflicted_files(tmp_path) == ["doc.md"]
+    with pytest.raises(git_utils.GitError):
+        git_utils.files_with_markers(tmp_path / "missing")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Persistent cat-file worker
+# ────────────────────────────────────────────────────────────────────────────────
+def _commit_files(repo: Path, files: dict[str, str]) -> None:
+    _init_repo(repo)
+    for name, text in files.items():
+        (repo / name).write_text(text)
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)  # noqa: S603,S607
+    subprocess.run(
+        ["git", "commit", "-qm", "init"], cwd=repo, check=True
+    )  # noqa: S603,S607
+
+
+def test_cat_file_reads_objects(tmp_path: Path) -> None:
+    _commit_files(tmp_path, {"a.txt": "alpha\n", "b.txt": "beta\n"})
+    with git_utils.CatFile(tmp_path) as cf:
+        blob = cf.read_object("HEAD:a.txt")
+        assert blob.type == "blob"
+        assert blob.data == b"alpha\n"
+        assert blob.size == 6
+
+        objs = cf.read_many(["HEAD:b.txt", "HEAD", "HEAD:nope", "HEAD:b.txt"])
+        assert list(objs) == ["HEAD:b.txt", "HEAD", "HEAD:nope"]
+        assert objs["HEAD:b.txt"].data == b"beta\n"
+        assert objs["HEAD"].type == "commit"
+        assert b"init" in objs["HEAD"].data
+        assert objs["HEAD:nope"] is None
+        # Missing specs containing spaces ("HEAD:my file missing")
+        spaced = ["HEAD:my file", "HEAD:a b c", "HEAD:a.txt"]
+        for content in (True, False):
+            got = cf.read_many(spaced, content=content)
+            assert got["HEAD:my file"] is None and got["HEAD:a b c"] is None
+            assert got["HEAD:a.txt"].size == 6
+
+        info = cf.object_info("HEAD:a.txt")
+        assert (info.type, info.size, info.data) == ("blob", 6, None)
+
+        with pytest.raises(git_utils.GitError, match="not found"):
+            cf.read_object("HEAD:missing.txt")
+        with pytest.raises(git_utils.GitError, match="invalid"):
+            cf.read_object("a\nb")
+
+
+def test_cat_file_many_large_objects(tmp_path: Path) -> None:
+    """More replies than fit in a pipe buffer must not deadlock."""
+    files = {f"f{i}.txt": f"{i}\n" * 5000 for i in range(150)}
+    _commit_files(tmp_path, files)
+    objs = git_utils.read_many((f"HEAD:{n}" for n in files), tmp_path)
+    assert all(objs[f"HEAD:{n}"].data == t.encode() for n, t in files.items())
+
+
+def test_cat_file_restarts_dead_worker(tmp_path: Path) -> None:
+    _commit_files(tmp_path, {"a.txt": "alpha\n"})
+    cf = git_utils.cat_file(tmp_path)
+    assert git_utils.cat_file(tmp_path) is cf  # shared per repository
+    cf.read_object("HEAD:a.txt")
+    cf._procs["--batch"].kill()
+    cf._procs["--batch"].wait()
+    assert git_utils.read_object("HEAD:a.txt", tmp_path).data == b"alpha\n"
+    git_utils.close_cat_files()
+    assert cf._procs == {}
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# GitRunner
+# ────────────────────────────────────────────────────────────────────────────────
+def test_runner_env_and_records(tmp_path: Path, monkeypatch) -> None:
+    from b3th import telemetry
+
+    _init_repo(tmp_path)
+    monkeypatch.setenv("LC_ALL", "de_DE.UTF-8")
+    seen: list = []
+    remove = telemetry.add_hook(seen.append)
+    try:
+        out = git_utils.GIT.output(["var", "GIT_PAGER"], cwd=tmp_path)
+        with pytest.raises(git_utils.GitError):
+            git_utils.run_git(["rev-parse", "HEAD"], cwd=tmp_path)  # no commits
+    finally:
+        remove()
+
+    assert out == "cat"
+    assert git_utils.GitRunner.env()["LC_ALL"] == "C"
+    assert git_utils.GitRunner.env()["GIT_OPTIONAL_LOCKS"] == "0"
+    ok, failed = seen
+    assert ok.kind == "git" and ok.args == ["var", "GIT_PAGER"]
+    assert ok.returncode == 0 and ok.wall_s > 0
+    assert failed.returncode != 0
+
+
+def test_runner_timeouts(monkeypatch, tmp_path: Path) -> None:
+    seen = {}
+
+    def fake_run(cmd, **kwargs):
+        seen[cmd[1]] = kwargs["timeout"]
+        if cmd[1] == "log":
+            raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(git_utils, "run_process", fake_run)
+    monkeypatch.setenv("B3TH_CONFIG", str(tmp_path / "missing.toml"))
+    monkeypatch.setenv("B3TH_TIMEOUT_COMMIT", "90")
+    monkeypatch.setenv("B3TH_TIMEOUT_PUSH", "off")
+    for args in (["status"], ["commit"], ["push"]):
+        git_utils.GIT.run(args)
+    git_utils.GIT.run(["fetch"], timeout=5)
+    assert seen == {"status": 30.0, "commit": 90.0, "push": None, "fetch": 5}
+
+    from b3th import telemetry
+
+    records = []
+    remove = telemetry.add_hook(records.append)
+    try:
+        with pytest.raises(git_utils.GitError, match="timed out"):
+            git_utils.GIT.run(["log"], timeout=0.1)
+    finally:
+        remove()
+    assert records[-1].timed_out and records[-1].timeout_s == 0.1
+
+
+def test_hanging_commit_hook_is_killed(monkeypatch, tmp_path: Path) -> None:
+    import time
+
+    _init_repo(tmp_path)
+    hook = tmp_path / ".git" / "hooks" / "pre-commit"
+    hook.write_text("#!/bin/sh\nsleep 60\n")
+    hook.chmod(0o755)
+    (tmp_path / "a.txt").write_text("a\n")
+    git_utils.GIT.run(["add", "a.txt"], cwd=tmp_path)
+
+    monkeypatch.setenv("B3TH_TIMEOUT_COMMIT", "0.5")
+    start = time.monotonic()
+    with pytest.raises(git_utils.GitError, match="timed out"):
+        git_utils.GIT.run(["commit", "-qm", "stuck"], cwd=tmp_path)
+    assert time.monotonic() - start < 10  # the hook's sleep died with git
+    assert not (tmp_path / ".git" / "index.lock").exists()
+
+
+def test_command_class_and_process_groups(monkeypatch) -> None:
+    assert git_utils.command_class(["diff", "--staged"]) == "read"
+    assert git_utils.command_class(["rebase", "main"]) == "commit"
+    assert git_utils.command_class(["add", "--all"]) == "commit"
+    assert git_utils.command_class(["ls-remote"]) == "push"
+    # Reads always get their own group; commands that may prompt keep the
+    # terminal's group when there is one.
+    monkeypatch.setattr(git_utils.sys, "stdin", SimpleNamespace(isatty=lambda: True))
+    assert git_utils._own_group(["log"])
+    assert not git_utils._own_group(["push"])
+    monkeypatch.setattr(git_utils.sys, "stdin", None)
+    assert git_utils._own_group(["push"])
+
+
+def test_runner_missing_cwd_is_git_error(tmp_path: Path) -> None:
+    assert git_utils.is_git_repo(tmp_path / "does-not-exist") is False
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Streaming output
+# ────────────────────────────────────────────────────────────────────────────────
+def test_iter_git_lines_and_nul_records(tmp_path: Path) -> None:
+    files = {f"f{i}.txt": "x\n" for i in range(3000)}  # > one pipe buffer
+    _commit_files(tmp_path, files)
+
+    names = list(git_utils.iter_git(["ls-files"], cwd=tmp_path))
+    assert sorted(names) == sorted(files)
+
+    records = list(git_utils.iter_git(["ls-files", "-z"], cwd=tmp_path, sep="\0"))
+    assert records == names
+
+    (commit,) = git_utils.get_last_commits(tmp_path, 5)
+    assert commit["subject"] == "init"
+    assert commit["hash"].startswith(commit["abbrev"])
+
+
+def test_iter_git_records_across_reads(tmp_path: Path, monkeypatch) -> None:
+    big = "y" * 3_000_000  # one record spanning many pipe reads
+    _commit_files(tmp_path, {"big.txt": big, "a b.txt": "x\n", "c.txt": "z\n"})
+
+    shown = list(git_utils.iter_git(["show", "HEAD:big.txt"], cwd=tmp_path))
+    assert shown == [big]
+
+    # Tiny reads: separators land at every offset within a chunk.
+    monkeypatch.setattr(git_utils, "_ITER_CHUNK", 3)
+    records = list(git_utils.iter_git(["ls-files", "-z"], cwd=tmp_path, sep="\0"))
+    assert records == ["a b.txt", "big.txt", "c.txt"]
+    pairs = list(git_utils.iter_git(["ls-files"], cwd=tmp_path, sep=".t"))
+    assert pairs == ["a b", "xt\nbig", "xt\nc", "xt\n"]
+
+
+def test_iter_git_error_and_early_close(tmp_path: Path) -> None:
+    from b3th import telemetry
+
+    _commit_files(tmp_path, {f"f{i}.txt": "x\n" for i in range(3000)})
+    seen: list = []
+    remove = telemetry.add_hook(seen.append)
+    try:
+        with pytest.raises(git_utils.GitError, match="nope"):
+            list(git_utils.iter_git(["log", "nope"], cwd=tmp_path))
+
+        lines = git_utils.iter_git(["ls-files"], cwd=tmp_path)
+        assert next(lines) == "f0.txt"
+        lines.close()  # stops git without raising
+    finally:
+        remove()
+
+    failed, closed = seen
+    assert failed.returncode != 0
+    assert closed.args == ["ls-files"] and closed.wall_s > 0
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# RepoContext
+# ────────────────────────────────────────────────────────────────────────────────
+def test_repo_context_states(tmp_path: Path) -> None:
+    _init_repo(tmp_path)
+    ctx = git_utils.repo_context(tmp_path)
+    assert ctx.toplevel == tmp_path.resolve()
+    assert ctx.git_dir == tmp_path.resolve() / ".git"
+    assert ctx.head is None and ctx.branch in {"main", "master"}  # unborn
+
+    _commit_files(tmp_path, {"a.txt": "a\n"})
+    branch = ctx.branch
+    for args in (
+        ["remote", "add", "origin", "git@github.com:me/proj.git"],
+        ["config", f"branch.{branch}.remote", "origin"],
+        ["config", f"branch.{branch}.merge", f"refs/heads/{branch}"],
+    ):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True)  # noqa: S603,S607
+    (tmp_path / "sub").mkdir()
+    ctx = git_utils.repo_context(tmp_path / "sub")
+    assert ctx.toplevel == tmp_path.resolve()
+    assert ctx.head == git_utils.run_git(["rev-parse", "HEAD"], cwd=tmp_path)
+    assert ctx.upstream == f"origin/{branch}"
+    assert ctx.origin_url == "git@github.com:me/proj.git"
+
+    subprocess.run(  # noqa: S603,S607
+        ["git", "checkout", "-q", "--detach"], cwd=tmp_path, check=True
+    )
+    detached = git_utils.repo_context(tmp_path)
+    assert (detached.branch, detached.upstream) == (None, None)
+    assert detached.head == ctx.head
+
+    with pytest.raises(git_utils.GitError):
+        git_utils.repo_context(tmp_path.parent)
+
+
+def test_repo_scope_probes_once(tmp_path: Path) -> None:
+    from b3th import gh_api, telemetry
+
+    _commit_files(tmp_path, {"a.txt": "a\n"})
+    subprocess.run(  # noqa: S603,S607
+        ["git", "remote", "add", "origin", "https://github.com/me/proj.git"],
+        cwd=tmp_path,
+        check=True,
+    )
+    assert git_utils.scoped_repo_context(tmp_path) is None
+
+    seen: list = []
+    remove = telemetry.add_hook(seen.append)
+    try:
+        with git_utils.repo_scope():
+            with git_utils.repo_scope():  # nested scopes share the cache
+                assert git_utils.is_git_repo(tmp_path)
+            branch = git_utils.get_current_branch(tmp_path)
+            slug = gh_api._get_repo_slug(tmp_path)
+            assert git_utils.scoped_repo_context(tmp_path) is not None
+            assert not git_utils.is_git_repo(tmp_path.parent)
+    finally:
+        remove()
+
+    assert branch in {"main", "master"}
+    assert slug == "me/proj"
+    probes = [r.args[0] for r in seen if r.args[0] in {"rev-parse", "config"}]
+    assert probes == ["rev-parse", "config", "rev-parse"]  # last: parent dir
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Staged diff: pre-scan, skipped files, byte budget
+# ────────────────────────────────────────────────────────────────────────────────
+def _stage_mixed_changes(repo: Path) -> None:
+    _commit_files(repo, {"old_name.py": "".join(f"v{i} = {i}\n" for i in range(20))})
+    (repo / "dist").mkdir()
+    files = {
+        "app.py": "print('hi')\n",
+        "poetry.lock": "".join(f'name = "pkg{i}"\n' for i in range(50)),
+        "dist/bundle.min.js": "var a=1;" * 100,
+        "big.txt": "".join(f"row {i}\n" for i in range(300)),
+    }
+    for name, text in files.items():
+        (repo / name).write_text(text)
+    (repo / "logo.png").write_bytes(b"\x89PNG\0\0" + bytes(range(256)))
+    subprocess.run(  # noqa: S603,S607
+        ["git", "mv", "old_name.py", "new_name.py"], cwd=repo, check=True
+    )
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)  # noqa: S603,S607
+
+
+def test_staged_diff_skips_low_value_files(tmp_path: Path) -> None:
+    _stage_mixed_changes(tmp_path)
+    policy = git_utils.DiffPolicy(max_file_lines=100)
+
+    scan = {e.path: e for e in git_utils.scan_staged(tmp_path, policy)}
+    assert {p: e.skip for p, e in scan.items()} == {
+        "app.py": None,
+        "big.txt": "oversized",
+        "dist/bundle.min.js": "generated",
+        "logo.png": "binary",
+        "new_name.py": None,
+        "poetry.lock": "lockfile",
+    }
+    assert scan["new_name.py"].old_path == "old_name.py"
+    assert scan["logo.png"].size == 262
+
+    diff = git_utils.get_staged_diff(tmp_path, policy=policy)
+    assert "+print('hi')" in diff
+    assert "rename to new_name.py" in diff
+    assert "big.txt | +300 -0 (diff omitted: oversized)" in diff
+    assert "poetry.lock | +50 -0 (diff omitted: lockfile)" in diff
+    assert "logo.png | binary, 262 bytes (diff omitted)" in diff
+    assert "row 1" not in diff and "pkg1" not in diff and "var a" not in diff
+
+
+def test_staged_diff_stops_at_byte_budget(tmp_path: Path, monkeypatch) -> None:
+    _init_repo(tmp_path)
+    for i in range(5):
+        (tmp_path / f"f{i}.txt").write_text("".join(f"line {j}\n" for j in range(40)))
+    subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)  # noqa: S603,S607
+    full = git_utils.get_staged_diff(tmp_path)
+    assert full.count("diff --git ") == 5 and "omitted" not in full
+
+    monkeypatch.setenv("B3TH_DIFF_MAX_BYTES", str(len(full) // 2))
+    capped = git_utils.get_staged_diff(tmp_path)
+    assert len(capped.encode()) <= len(full) // 2 + 200  # + stat lines
+    kept = capped.count("diff --git ")
+    assert 0 < kept < 5
+    for i in range(kept, 5):
+        assert f"f{i}.txt | +40 -0 (diff omitted: byte budget)" in capped
+    assert full.startswith(capped[capped.index("diff --git ") :])
+
+    monkeypatch.setenv("B3TH_DIFF_LOCKFILES", "f*.txt")
+    assert git_utils.get_staged_diff(tmp_path).count("(diff omitted: lockfile)") == 5
+    with pytest.raises(git_utils.GitError):
+        git_utils.get_staged_diff(tmp_path / "missing")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Async runner
+# ────────────────────────────────────────────────────────────────────────────────
+def test_arun_git_overlaps_up_to_the_cap(tmp_path: Path, monkeypatch) -> None:
+    import asyncio
+
+    from b3th import telemetry
+
+    _commit_files(tmp_path, {"a.txt": "a\n"})
+    monkeypatch.setenv("B3TH_GIT_CONCURRENCY", "2")
+    seen: list = []
+
+    async def main() -> list[str]:
+        jobs = [git_utils.arun_git(["rev-parse", "HEAD"], tmp_path) for _ in range(6)]
+        return await asyncio.gather(*jobs)
+
+    remove = telemetry.add_hook(seen.append)
+    try:
+        heads = asyncio.run(main())
+        assert asyncio.run(git_utils.ais_git_repo(tmp_path)) is True
+        assert asyncio.run(git_utils.ais_git_repo(tmp_path.parent)) is False
+        (commit,) = asyncio.run(git_utils.aget_last_commits(tmp_path, 5))
+    finally:
+        remove()
+
+    assert len(set(heads)) == 1 and len(heads[0]) == 40
+    assert commit["hash"] == heads[0] and commit["subject"] == "init"
+    calls = [r for r in seen if r.args == ["rev-parse", "HEAD"]]
+    assert [r.returncode for r in calls] == [0] * 6
+    edges = sorted(
+        [(r.started, 1) for r in calls] + [(r.started + r.wall_s, -1) for r in calls]
+    )
+    running = peak = 0
+    for _t, step in edges:
+        running += step
+        peak = max(peak, running)
+    assert peak <= 2
+
+
+def test_arun_errors_and_timeouts(tmp_path: Path) -> None:
+    import asyncio
+
+    _init_repo(tmp_path)
+    with pytest.raises(git_utils.GitError, match="single revision"):
+        asyncio.run(git_utils.arun_git(["rev-parse", "--verify", "nope^{}"], tmp_path))
+    failed = asyncio.run(
+        git_utils.GIT.arun(["cat-file", "-e", "HEAD"], cwd=tmp_path, check=False)
+    )
+    assert failed.returncode != 0
+
+    slow = ["-c", "alias.nap=!sleep 1", "nap"]
+    with pytest.raises(git_utils.GitError, match="timed out"):
+        asyncio.run(git_utils.GIT.arun(slow, cwd=tmp_path, timeout=0.2))
+    with pytest.raises(git_utils.GitError, match="cannot run git"):
+        asyncio.run(git_utils.arun_git(["status"], tmp_path / "missing"))
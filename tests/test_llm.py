@@ -11,11 +11,14 @@ def test_chat_completion_success(monkeypatch):
 
     fake_resp = MagicMock()
     fake_resp.status_code = 200
+    fake_resp.headers = {}
     fake_resp.json.return_value = {
         "choices": [{"message": {"content": "Hello from Groq!"}}]
     }
 
-    with patch("requests.post", return_value=fake_resp) as mock_post:
+    with patch.object(llm, "_session") as mock_session:
+        mock_post = mock_session.return_value.post
+        mock_post.return_value = fake_resp
         reply = llm.chat_completion(
             [{"role": "user", "content": "Hi"}], model="dummy-model"
         )
@@ -26,9 +29,46 @@ def test_chat_completion_success(monkeypatch):
     assert "/openai/v1/chat/completions" in mock_post.call_args.args[0]
 
 
+def test_session_is_shared_and_closable():
+    """All calls reuse one pooled session until it is explicitly closed."""
+    first = llm._session()
+    assert llm._session() is first
+    assert first.get_adapter("https://api.groq.com")._pool_maxsize == llm._POOL_MAXSIZE
+
+    llm.close_session()
+    second = llm._session()
+    assert second is not first
+
+
 def test_chat_completion_no_key(monkeypatch):
     """Wrapper should raise LLMError when the API key is missing."""
     monkeypatch.delenv("GROQ_API_KEY", raising=False)
 
     with pytest.raises(llm.LLMError):
         llm.chat_completion([{"role": "user", "content": "Hi"}])
+
+
+def test_gather_limited_caps_concurrency_and_keeps_order():
+    import asyncio
+
+    state = {"now": 0, "peak": 0}
+
+    async def job(i):
+        state["now"] += 1
+        state["peak"] = max(state["peak"], state["now"])
+        await asyncio.sleep(0.01 * (5 - i))
+        state["now"] -= 1
+        return i
+
+    out = asyncio.run(llm.gather_limited((job(i) for i in range(5)), limit=2))
+    assert out == [0, 1, 2, 3, 4]
+    assert state["peak"] == 2
+
+
+def test_achat_completion_delegates(monkeypatch):
+    import asyncio
+
+    monkeypatch.setattr(
+        llm, "chat_completion", lambda messages, **kw: f"{messages}:{kw['model']}"
+    )
+    assert asyncio.run(llm.achat_completion("hi", model="m")) == "hi:m"
@@ -0,0 +1,132 @@
+"""Tests for the on-disk LLM reply cache."""
+
+import os
+import time
+
+import pytest
+
+from b3th import llm, llm_cache
+from b3th.mock_server import MockGroqServer
+
+
+def _key(content="hi", **kw):
+    params = {"model": "m", "temperature": 0.2, "max_tokens": 10}
+    params.update(kw)
+    return llm_cache.cache_key(
+        messages=[{"role": "user", "content": content}], **params
+    )
+
+
+def test_key_depends_on_every_request_field():
+    base = _key()
+    assert base == _key()
+    assert base != _key("other")
+    assert base != _key(model="m2")
+    assert base != _key(temperature=0.3)
+    assert base != _key(max_tokens=11)
+    assert base != _key(base="http://127.0.0.1:8000")
+
+
+def test_put_get_roundtrip_and_miss():
+    assert llm_cache.get(_key()) is None
+    llm_cache.put(_key(), "reply")
+    assert llm_cache.get(_key()) == "reply"
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    llm_cache.put(_key(), "old")
+    monkeypatch.setenv("B3TH_CACHE_TTL", "0")
+    time.sleep(0.01)
+    assert llm_cache.get(_key()) is None
+    assert not list(llm_cache.cache_dir().glob("*/*.json"))
+
+
+def test_eviction_drops_least_recently_used():
+    keys = [_key(str(i)) for i in range(3)]
+    for i, key in enumerate(keys):
+        llm_cache.put(key, "x" * 100)
+        path = llm_cache._entry_path(key)
+        os.utime(path, (1000 + i, 1000 + i))
+    # Touch the oldest entry so it becomes most recently used
+    assert llm_cache.get(keys[0]) == "x" * 100
+
+    sizes = [llm_cache._entry_path(k).stat().st_size for k in keys]
+    assert llm_cache.evict(sizes[0] + sizes[2]) == 1
+    assert llm_cache.get(keys[1]) is None  # LRU victim
+    assert llm_cache.get(keys[0]) is not None
+    assert llm_cache.get(keys[2]) is not None
+
+
+def test_put_rescans_only_near_the_cap(monkeypatch):
+    scans = []
+    evict = llm_cache.evict
+    monkeypatch.setattr(
+        llm_cache, "evict", lambda n: scans.append(n) or evict(n), raising=True
+    )
+    monkeypatch.setenv("B3TH_CACHE_MAX_BYTES", "1000")
+    for i in range(5):
+        llm_cache.put(_key(str(i)), "x" * 100)
+    assert len(scans) == 1  # the first write measures the directory
+    for i in range(5, 10):
+        llm_cache.put(_key(str(i)), "x" * 100)
+    assert len(scans) > 1
+    total = sum(p.stat().st_size for p in llm_cache.cache_dir().glob("*/*.json"))
+    assert total <= 1000
+
+
+def test_failed_write_leaves_no_temp_file(monkeypatch):
+    def fail(*_args, **_kw):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(llm_cache.json, "dump", fail, raising=True)
+    llm_cache.put(_key(), "reply")
+    assert llm_cache.get(_key()) is None
+    assert not list(llm_cache.cache_dir().rglob("*.tmp"))
+
+
+def test_disable_switches():
+    assert llm_cache.is_enabled()
+    llm_cache.set_enabled(False)
+    assert not llm_cache.is_enabled()
+    llm_cache.set_enabled(None)
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    with MockGroqServer(reply="cached reply") as srv:
+        monkeypatch.setenv("GROQ_API_KEY", "test_key")
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        yield srv
+
+
+def test_identical_requests_skip_the_network(server, monkeypatch):
+    assert llm.chat_completion("same prompt") == "cached reply"
+    assert llm.chat_completion("same prompt") == "cached reply"
+    assert server.requests == 1
+
+    # No API key needed for a hit
+    monkeypatch.delenv("GROQ_API_KEY")
+    assert llm.chat_completion("same prompt") == "cached reply"
+
+    monkeypatch.setenv("GROQ_API_KEY", "test_key")
+    llm.chat_completion("same prompt", use_cache=False)
+    monkeypatch.setenv("B3TH_NO_CACHE", "1")
+    llm.chat_completion("same prompt")
+    assert server.requests == 3
+
+
+def test_cli_no_cache_flag(monkeypatch, tmp_path):
+    from typer.testing import CliRunner
+
+    from b3th.cli import app
+
+    seen = []
+    monkeypatch.setattr(
+        "b3th.cli.summarize_commits",
+        lambda *_a, **_k: seen.append(llm_cache.is_enabled()) or "ok",
+        raising=True,
+    )
+    runner = CliRunner()
+    assert runner.invoke(app, ["--no-cache", "summarize", str(tmp_path)]).exit_code == 0
+    assert runner.invoke(app, ["summarize", str(tmp_path)]).exit_code == 0
+    assert seen == [False, True]
@@ -0,0 +1,100 @@
+"""
+Latency hedging in b3th.llm.chat_completion, against the local mock server.
+
+The reply callable stalls requests for the "slow" model, standing in for a
+primary model that hangs.
+"""
+
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from b3th import llm
+from b3th.cli import app
+from b3th.mock_server import MockGroqServer
+
+
+def _reply(payload):
+    if payload.get("model") == "slow":
+        time.sleep(1.0)
+        return "slow answer"
+    return "fast answer"
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    with MockGroqServer(reply=_reply) as srv:
+        monkeypatch.setenv("GROQ_API_KEY", "test_key")
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        llm.close_session()
+        yield srv
+    llm.close_session()
+
+
+def test_hedge_wins_when_primary_stalls(server):
+    start = time.perf_counter()
+    out = llm.chat_completion("hi", model="slow", hedge_after=0.05, hedge_model="fast")
+    assert out == "fast answer"
+    assert time.perf_counter() - start < 0.8
+    assert server.requests == 2
+
+
+def test_no_hedge_when_primary_is_quick(server):
+    out = llm.chat_completion("hi", model="quick", hedge_after=0.5, hedge_model="fast")
+    assert out == "fast answer"
+    assert server.requests == 1
+
+
+def test_streaming_hedge_owns_the_sink(server):
+    seen: list[str] = []
+    with llm.stream_to(seen.append):
+        out = llm.chat_completion(
+            "hi", model="slow", hedge_after=0.05, hedge_model="fast"
+        )
+    assert out == "fast answer"
+    assert "".join(seen) == "fast answer"
+
+
+def test_primary_error_falls_back_to_hedge(server):
+    server.fail_next(400)
+    out = llm.chat_completion("hi", model="slow", hedge_after=5, hedge_model="fast")
+    assert out == "fast answer"
+
+
+def test_both_failing_raises_primary_error(server):
+    server.fail_next(400, 401)
+    with pytest.raises(llm.LLMError, match="400"):
+        llm.chat_completion("hi", model="slow", hedge_after=5, hedge_model="fast")
+
+
+def test_hedged_reply_cached_under_requested_model(server):
+    llm.chat_completion("hi", model="slow", hedge_after=0.05, hedge_model="fast")
+    served = server.requests
+    out = llm.chat_completion("hi", model="slow", hedge_after=0.05, hedge_model="fast")
+    assert out == "fast answer"
+    assert server.requests == served  # the repeat is a cache hit
+    assert llm.chat_completion("hi", model="fast") == "fast answer"
+    assert server.requests == served + 1  # nothing stored under "fast"
+
+
+def test_hedge_settings_resolution(monkeypatch):
+    assert llm._hedge_settings("m", None, None) is None
+    monkeypatch.setenv("B3TH_HEDGE_AFTER", "2.5")
+    assert llm._hedge_settings("m", None, None) is None  # no model
+    monkeypatch.setenv("B3TH_HEDGE_MODEL", "fast")
+    assert llm._hedge_settings("m", None, None) == (2.5, "fast")
+    assert llm._hedge_settings("fast", None, None) is None  # same model
+    assert llm._hedge_settings("m", 1.0, "other") == (1.0, "other")
+    monkeypatch.setenv("B3TH_HEDGE_AFTER", "soon")
+    assert llm._hedge_settings("m", None, None) is None
+
+
+def test_cli_hedge_options(monkeypatch, tmp_path):
+    monkeypatch.setattr("b3th.cli.summarize_commits", lambda *_a, **_k: "ok")
+    res = CliRunner().invoke(
+        app,
+        ["--hedge-after", "1.5", "--hedge-model", "fast", "summarize", str(tmp_path)],
+    )
+    assert res.exit_code == 0
+    assert llm._hedge_settings("m", None, None) == (1.5, "fast")
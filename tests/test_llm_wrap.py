@@ -7,13 +7,14 @@ def test_chat_completion_wraps_string_prompt(monkeypatch):
     """String prompts should be converted into a single user message."""
     captured = {}
 
-    def fake_post(url, headers, json, timeout):
+    def fake_post(url, headers, json, timeout, stream=False):
         captured["url"] = url
         captured["headers"] = headers
         captured["json"] = json
         # Minimal OpenAI-compatible success payload
         return SimpleNamespace(
             status_code=200,
+            headers={},
             json=lambda: {"choices": [{"message": {"content": "ok"}}]},
             text="OK",
         )
@@ -21,7 +22,9 @@ def test_chat_completion_wraps_string_prompt(monkeypatch):
     monkeypatch.setenv("GROQ_API_KEY", "dummy")
     monkeypatch.setenv("GROQ_API_BASE", "https://api.groq.com")
     monkeypatch.setenv("GROQ_MODEL_ID", "llama-3.3-70b-versatile")
-    monkeypatch.setattr("b3th.llm.requests.post", fake_post, raising=True)
+    monkeypatch.setattr(
+        "b3th.llm._session", lambda: SimpleNamespace(post=fake_post), raising=True
+    )
 
     out = chat_completion("hello world")  # pass a plain string
     assert out == "ok"
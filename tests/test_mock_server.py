@@ -0,0 +1,57 @@
+"""
+End-to-end tests for b3th.llm against the local mock Groq server.
+
+These exercise the real HTTP path (session, JSON parsing) with no network.
+"""
+
+import pytest
+
+from b3th import llm
+from b3th.mock_server import MockGroqServer
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    with MockGroqServer(reply="feat: add greeting") as srv:
+        monkeypatch.setenv("GROQ_API_KEY", "test_key")
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        monkeypatch.setenv("B3TH_NO_CACHE", "1")  # every call must hit the server
+        llm.close_session()  # start from a cold pool
+        yield srv
+    llm.close_session()
+
+
+def test_chat_completion_roundtrip(server):
+    assert llm.chat_completion("hi", model="mock-model") == "feat: add greeting"
+    assert server.requests == 1
+
+
+def test_connections_are_reused(server):
+    """Several calls should ride on one keep-alive connection."""
+    for _ in range(5):
+        llm.chat_completion("hi")
+    assert server.requests == 5
+    assert server.connections == 1
+
+
+def test_unknown_path_is_llm_error(server, monkeypatch):
+    monkeypatch.setenv("GROQ_API_BASE", server.url + "/nope")
+    with pytest.raises(llm.LLMError, match="404"):
+        llm.chat_completion("hi")
+
+
+def test_stream_chat_completion_yields_deltas(server):
+    deltas = list(llm.stream_chat_completion("hi"))
+    assert len(deltas) == 3
+    assert "".join(deltas) == "feat: add greeting"
+
+
+def test_stream_to_feeds_sink_and_returns_full_text(server):
+    seen = []
+    with llm.stream_to(seen.append):
+        out = llm.chat_completion("hi")
+    assert out == "feat: add greeting"
+    assert seen == ["feat: ", "add ", "greeting"]
+    # Outside the block the regular JSON path is used again.
+    assert llm.chat_completion("hi") == "feat: add greeting"
+    assert server.connections == 1
@@ -0,0 +1,144 @@
+"""
+In-process object reader (b3th.object_store), checked against git cat-file.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from b3th import git_utils, object_store
+
+
+def _git(repo: Path, *args: str) -> str:
+    cmd = ["git", *args]
+    return subprocess.run(  # noqa: S603,S607
+        cmd, cwd=repo, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _history(repo: Path, commits: int = 12) -> None:
+    """A file that grows a little per commit, so packs contain delta chains."""
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "t@example.com")
+    _git(repo, "config", "user.name", "T")
+    lines = [f"line {i} " + "x" * 40 for i in range(400)]
+    for n in range(commits):
+        lines[n * 7] = f"changed in commit {n}"
+        (repo / "big.txt").write_text("\n".join(lines) + "\n")
+        (repo / f"small{n}.txt").write_text(f"{n}\n")
+        _git(repo, "add", ".")
+        _git(repo, "commit", "-qm", f"commit {n}")
+
+
+def _all_oids(repo: Path) -> list[str]:
+    out = _git(repo, "cat-file", "--batch-all-objects", "--batch-check=%(objectname)")
+    return out.split()
+
+
+def _assert_matches_git(repo: Path, **kwargs) -> None:
+    oids = _all_oids(repo)
+    with object_store.ObjectStore(repo, **kwargs) as store:
+        with git_utils.CatFile(repo) as cf:
+            expected = cf.read_many(oids)
+            headers = cf.read_many(oids, content=False)
+        for oid in oids:
+            got = store.read(oid)
+            assert got == expected[oid], oid
+            assert store.stat(oid) == headers[oid], oid
+
+
+def test_loose_objects(tmp_path: Path) -> None:
+    _history(tmp_path, commits=2)
+    _assert_matches_git(tmp_path)
+
+
+@pytest.mark.parametrize("ofs_delta", ["true", "false"])  # OFS vs REF deltas
+def test_packed_objects_with_deltas(tmp_path: Path, ofs_delta: str) -> None:
+    _history(tmp_path)
+    _git(tmp_path, "-c", f"repack.useDeltaBaseOffset={ofs_delta}", "repack", "-adfq")
+    verify = _git(
+        tmp_path,
+        "verify-pack",
+        "-v",
+        *map(str, tmp_path.glob(".git/objects/pack/*.idx")),
+    )
+    assert "chain length" in verify  # the pack really has deltas
+    _assert_matches_git(tmp_path)
+    _assert_matches_git(tmp_path, cache_bytes=4096)  # constant cache eviction
+
+
+def test_misses_and_unsupported_specs(tmp_path: Path) -> None:
+    _history(tmp_path, commits=1)
+    head = _git(tmp_path, "rev-parse", "HEAD").strip()
+    with object_store.ObjectStore(tmp_path / "small0.txt") as store:  # from a subpath
+        assert store.read("0" * 40) is None
+        with pytest.raises(object_store.ObjectStoreError):
+            store.read("HEAD:big.txt")
+        found = store.read_many([head, "HEAD", "0" * 40])
+        assert list(found) == [head]
+        assert found[head].type == "commit"
+
+    with pytest.raises(object_store.ObjectStoreError):
+        object_store.ObjectStore(tmp_path.parent / "no-such-dir")
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_stat_does_not_inflate_content(
+    tmp_path: Path, monkeypatch, packed: bool
+) -> None:
+    _history(tmp_path, commits=3)
+    if packed:
+        _git(tmp_path, "repack", "-adfq")
+    blob = _git(tmp_path, "rev-parse", "HEAD:big.txt").strip()
+    size = int(_git(tmp_path, "cat-file", "-s", blob))
+
+    def no_full_inflate(*_args):
+        raise AssertionError("content inflated")
+
+    monkeypatch.setattr(object_store, "_inflate", no_full_inflate)
+    monkeypatch.setattr(object_store.ObjectStore, "_read_loose", no_full_inflate)
+    with object_store.ObjectStore(tmp_path) as store:
+        assert store.stat(blob) == git_utils.GitObject(blob, "blob", size, None)
+        old = _git(tmp_path, "rev-parse", "HEAD~2:big.txt").strip()  # a delta
+        assert store.stat(old).size == int(_git(tmp_path, "cat-file", "-s", old))
+        assert store.read_many([blob, "HEAD"], content=False)[blob].size == size
+        assert store.stat("0" * 40) is None
+        with pytest.raises(object_store.ObjectStoreError):
+            store.stat("HEAD")
+
+
+def test_new_pack_picked_up_on_miss(tmp_path: Path) -> None:
+    _history(tmp_path, commits=1)
+    with object_store.ObjectStore(tmp_path) as store:
+        _git(tmp_path, "repack", "-adq")  # loose objects disappear into a pack
+        _git(tmp_path, "prune-packed")
+        head = _git(tmp_path, "rev-parse", "HEAD").strip()
+        assert store.read(head).type == "commit"
+
+
+def test_apply_delta_rejects_bad_input() -> None:
+    # base size 3, result size 2, copy 2 bytes from offset 1
+    assert object_store.apply_delta(b"abc", bytes([3, 2, 0x91, 1, 2])) == b"bc"
+    with pytest.raises(object_store.ObjectStoreError):
+        object_store.apply_delta(b"abcd", bytes([3, 2, 0x91, 1, 2]))
+    with pytest.raises(object_store.ObjectStoreError):
+        object_store.apply_delta(b"abc", bytes([3, 2, 0]))
+
+
+def test_git_utils_uses_store_when_enabled(tmp_path: Path, monkeypatch) -> None:
+    _history(tmp_path, commits=1)
+    monkeypatch.setenv("B3TH_OBJECT_STORE", "1")
+    blob = _git(tmp_path, "rev-parse", "HEAD:small0.txt").strip()
+    try:
+        objs = git_utils.read_many([blob, "HEAD:small0.txt", "0" * 40], tmp_path)
+        assert objs[blob].data == objs["HEAD:small0.txt"].data == b"0\n"
+        assert objs["0" * 40] is None
+        assert object_store.shared_store(tmp_path) is not None
+        info = git_utils.read_many([blob], tmp_path, content=False)[blob]
+        assert (info.size, info.data) == (2, None)
+        with pytest.raises(git_utils.GitError, match="not found"):
+            git_utils.read_object("0" * 40, tmp_path)
+    finally:
+        object_store.close_stores()
+        git_utils.close_cat_files()
@@ -6,10 +6,10 @@ All git and network interactions are stubbed.
 
 from pathlib import Path
 from unittest.mock import patch
-from types import SimpleNamespace
 
 import pytest
 
+from b3th import git_utils
 from b3th import pr_description as prd
 
 FAKE_DIFF = """
@@ -25,14 +25,14 @@ docs: update readme
 """
 
 
-def test_pr_description_success(monkeypatch, tmp_path: Path):
+def test_pr_description_success(async_stub, monkeypatch, tmp_path: Path):
     """Happy path returns title/body parsed from LLM reply."""
     repo = tmp_path / "repo"
     repo.mkdir()
 
-    monkeypatch.setattr(prd, "is_git_repo", lambda _: True, raising=True)
-    monkeypatch.setattr(prd, "_branch_diff", lambda *_: FAKE_DIFF, raising=True)
-    monkeypatch.setattr(prd, "_commit_messages", lambda *_: FAKE_COMMITS, raising=True)
+    monkeypatch.setattr(prd, "ais_git_repo", async_stub(True), raising=True)
+    monkeypatch.setattr(prd, "_branch_diff", async_stub(FAKE_DIFF), raising=True)
+    monkeypatch.setattr(prd, "_commit_messages", async_stub(FAKE_COMMITS), raising=True)
 
     fake_reply = (
         "add comprehensive api and docs\n\n"
@@ -48,26 +48,27 @@ def test_pr_description_success(monkeypatch, tmp_path: Path):
     assert "* Introduces the new endpoint" in body
 
 
-def test_pr_description_no_changes(monkeypatch, tmp_path: Path):
+def test_pr_description_no_changes(async_stub, monkeypatch, tmp_path: Path):
     """Empty diff should raise PRDescriptionError."""
     repo = tmp_path / "repo"
     repo.mkdir()
 
-    monkeypatch.setattr(prd, "is_git_repo", lambda _: True, raising=True)
-    monkeypatch.setattr(prd, "_branch_diff", lambda *_: "", raising=True)
+    monkeypatch.setattr(prd, "ais_git_repo", async_stub(True), raising=True)
+    monkeypatch.setattr(prd, "_branch_diff", async_stub(""), raising=True)
+    monkeypatch.setattr(prd, "_commit_messages", async_stub(""), raising=True)
 
     with pytest.raises(prd.PRDescriptionError):
         prd.generate_pr_description(repo)
 
 
-def test_pr_description_llm_error(monkeypatch, tmp_path: Path):
+def test_pr_description_llm_error(async_stub, monkeypatch, tmp_path: Path):
     """If the LLM call fails, the function should raise PRDescriptionError."""
     repo = tmp_path / "repo"
     repo.mkdir()
 
-    monkeypatch.setattr(prd, "is_git_repo", lambda _: True, raising=True)
-    monkeypatch.setattr(prd, "_branch_diff", lambda *_: FAKE_DIFF, raising=True)
-    monkeypatch.setattr(prd, "_commit_messages", lambda *_: FAKE_COMMITS, raising=True)
+    monkeypatch.setattr(prd, "ais_git_repo", async_stub(True), raising=True)
+    monkeypatch.setattr(prd, "_branch_diff", async_stub(FAKE_DIFF), raising=True)
+    monkeypatch.setattr(prd, "_commit_messages", async_stub(FAKE_COMMITS), raising=True)
 
     LLMError = getattr(prd.llm, "LLMError", RuntimeError)
     with patch.object(prd.llm, "chat_completion", side_effect=LLMError("down")):
@@ -75,14 +76,14 @@ def test_pr_description_llm_error(monkeypatch, tmp_path: Path):
             prd.generate_pr_description(repo)
 
 
-def test_pr_description_title_only(monkeypatch, tmp_path: Path):
+def test_pr_description_title_only(async_stub, monkeypatch, tmp_path: Path):
     """If LLM returns only a title line, body should be empty after trimming."""
     repo = tmp_path / "repo"
     repo.mkdir()
 
-    monkeypatch.setattr(prd, "is_git_repo", lambda _: True, raising=True)
-    monkeypatch.setattr(prd, "_branch_diff", lambda *_: FAKE_DIFF, raising=True)
-    monkeypatch.setattr(prd, "_commit_messages", lambda *_: FAKE_COMMITS, raising=True)
+    monkeypatch.setattr(prd, "ais_git_repo", async_stub(True), raising=True)
+    monkeypatch.setattr(prd, "_branch_diff", async_stub(FAKE_DIFF), raising=True)
+    monkeypatch.setattr(prd, "_commit_messages", async_stub(FAKE_COMMITS), raising=True)
 
     # Leading/trailing blank lines & spaces; no body content.
     reply = "\nAdd feature XYZ  \n\n"
@@ -93,29 +94,34 @@ def test_pr_description_title_only(monkeypatch, tmp_path: Path):
     assert body == ""
 
 
-def test_pr_description_not_git_repo(monkeypatch, tmp_path: Path):
+def test_pr_description_not_git_repo(async_stub, monkeypatch, tmp_path: Path):
     """Early guard: non-repo path should raise PRDescriptionError."""
     repo = tmp_path / "repo"; repo.mkdir()
-    monkeypatch.setattr(prd, "is_git_repo", lambda *_: False, raising=True)
+    monkeypatch.setattr(prd, "ais_git_repo", async_stub(False), raising=True)
 
     with pytest.raises(prd.PRDescriptionError) as ex:
         prd.generate_pr_description(repo)
     assert "is not a Git repository" in str(ex.value)
 
 
-def test_pr_description_git_diff_error(monkeypatch, tmp_path: Path):
+def test_pr_description_git_diff_error(async_stub, monkeypatch, tmp_path: Path):
     """
-    _run_git error path: git diff returns non-zero -> GitError.
-    We patch subprocess.run used by _run_git().
+    arun_git error path: git diff exits non-zero -> GitError carrying stderr.
+    We patch the asyncio subprocess factory used by GitRunner.arun().
     """
     repo = tmp_path / "repo"; repo.mkdir()
-    monkeypatch.setattr(prd, "is_git_repo", lambda *_: True, raising=True)
+    monkeypatch.setattr(prd, "ais_git_repo", async_stub(True), raising=True)
 
-    def fake_run(*_a, **_k):
-        # Simulate 'git diff --stat' failing
-        return SimpleNamespace(returncode=1, stdout="", stderr="boom")
+    class FakeProc:
+        returncode = 1
 
-    monkeypatch.setattr(prd.subprocess, "run", fake_run, raising=True)
+        async def communicate(self):
+            return b"", b"boom"
+
+    async def fake_exec(*_a, **_k):
+        return FakeProc()
+
+    monkeypatch.setattr(git_utils.asyncio, "create_subprocess_exec", fake_exec)
 
     with pytest.raises(prd.GitError) as ex:
         prd.generate_pr_description(repo)
@@ -137,13 +143,13 @@ def test_build_messages_shape_and_content():
     assert commits in user
 
 
-def test_pr_description_empty_llm_response(monkeypatch, tmp_path: Path):
+def test_pr_description_empty_llm_response(async_stub, monkeypatch, tmp_path: Path):
     """Empty/whitespace-only LLM output → PRDescriptionError."""
     repo = tmp_path / "repo"; repo.mkdir()
 
-    monkeypatch.setattr(prd, "is_git_repo", lambda *_: True, raising=True)
-    monkeypatch.setattr(prd, "_branch_diff", lambda *_: "a.diff", raising=True)
-    monkeypatch.setattr(prd, "_commit_messages", lambda *_: "c", raising=True)
+    monkeypatch.setattr(prd, "ais_git_repo", async_stub(True), raising=True)
+    monkeypatch.setattr(prd, "_branch_diff", async_stub("a.diff"), raising=True)
+    monkeypatch.setattr(prd, "_commit_messages", async_stub("c"), raising=True)
 
     with patch.object(prd.llm, "chat_completion", return_value=" \n  \n"):
         with pytest.raises(prd.PRDescriptionError) as ex:
@@ -151,13 +157,13 @@ def test_pr_description_empty_llm_response(monkeypatch, tmp_path: Path):
     assert "empty response" in str(ex.value).lower()
 
 
-def test_pr_description_passes_params_to_llm(monkeypatch, tmp_path: Path):
+def test_pr_description_passes_params_to_llm(async_stub, monkeypatch, tmp_path: Path):
     """Ensure model/temperature/max_tokens are forwarded to llm.chat_completion()."""
     repo = tmp_path / "repo"; repo.mkdir()
 
-    monkeypatch.setattr(prd, "is_git_repo", lambda *_: True, raising=True)
-    monkeypatch.setattr(prd, "_branch_diff", lambda *_: "D", raising=True)
-    monkeypatch.setattr(prd, "_commit_messages", lambda *_: "C", raising=True)
+    monkeypatch.setattr(prd, "ais_git_repo", async_stub(True), raising=True)
+    monkeypatch.setattr(prd, "_branch_diff", async_stub("D"), raising=True)
+    monkeypatch.setattr(prd, "_commit_messages", async_stub("C"), raising=True)
 
     called = {}
     def fake_chat_completion(messages, *, model, temperature, max_tokens):
@@ -177,18 +183,18 @@ def test_pr_description_passes_params_to_llm(monkeypatch, tmp_path: Path):
     assert called == {"model": "gptx", "temperature": 0.3, "max_tokens": 123}
 
 
-def test_pr_description_base_param_propagates(monkeypatch, tmp_path: Path):
+def test_pr_description_base_param_propagates(async_stub, monkeypatch, tmp_path: Path):
     """Custom base branch should be passed through to git helpers."""
     repo = tmp_path / "repo"; repo.mkdir()
-    monkeypatch.setattr(prd, "is_git_repo", lambda *_: True, raising=True)
+    monkeypatch.setattr(prd, "ais_git_repo", async_stub(True), raising=True)
 
     seen = {"diff_base": None, "log_base": None}
 
-    def fake_diff(path, base):
+    async def fake_diff(path, base):
         seen["diff_base"] = base
         return "x | 1 +"
 
-    def fake_commits(path, base):
+    async def fake_commits(path, base):
         seen["log_base"] = base
         return "feat: x"
 
@@ -203,10 +209,29 @@ def test_pr_description_base_param_propagates(monkeypatch, tmp_path: Path):
     assert seen["log_base"] == "develop"
 
 
-def test__run_git_success_strips_newlines(monkeypatch, tmp_path: Path):
-    """Directly cover the happy path in _run_git()."""
-    def fake_run(*_a, **_k):
-        return SimpleNamespace(returncode=0, stdout=" ok\n", stderr="")
-    monkeypatch.setattr(prd.subprocess, "run", fake_run, raising=True)
-    out = prd._run_git(["status"])
-    assert out == "ok"
\ No newline at end of file
+def test_gather_inputs_runs_git_concurrently(tmp_path: Path):
+    """The repo check, diff stat and log come from real git in one gather."""
+    import asyncio
+    import subprocess
+
+    def git(*args):
+        cmd = ["git", *args]
+        subprocess.run(cmd, cwd=tmp_path, check=True, capture_output=True)  # noqa: S603
+
+    git("init", "-q", "-b", "trunk")
+    git("config", "user.email", "t@example.com")
+    git("config", "user.name", "T")
+    (tmp_path / "a.txt").write_text("a\n")
+    git("add", ".")
+    git("commit", "-qm", "base")
+    git("checkout", "-qb", "feature")
+    (tmp_path / "b.txt").write_text("b\n")
+    git("add", ".")
+    git("commit", "-qm", "feat: add b")
+
+    diff, commits = asyncio.run(prd._gather_inputs(tmp_path, "trunk"))
+    assert "b.txt | 1 +" in diff
+    assert commits == "feat: add b"
+
+    with pytest.raises(prd.PRDescriptionError, match="not a Git repository"):
+        asyncio.run(prd._gather_inputs(tmp_path / "nope", "trunk"))
@@ -0,0 +1,102 @@
+"""
+Tests for b3th.process: timeouts and Ctrl-C stop the whole process group.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from b3th import process
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX process groups")
+
+
+def _alive(pid: int) -> bool:
+    """True unless *pid* is gone or a zombie waiting to be reaped."""
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+    except (FileNotFoundError, IndexError):
+        return False
+    return state not in ("Z", "X")
+
+
+def _with_helper(tmp_path: Path) -> tuple[list[str], Path]:
+    """A command that leaves a long-running helper behind, like git + ssh."""
+    pidfile = tmp_path / "helper.pid"
+    script = f"sleep 30 & echo $! > {pidfile}; wait"
+    return ["sh", "-c", script], pidfile
+
+
+def _helper_pid(pidfile: Path) -> int:
+    deadline = time.monotonic() + 5
+    while not pidfile.exists() or not pidfile.read_text().strip():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    return int(pidfile.read_text())
+
+
+def test_run_process_result_and_input() -> None:
+    result = process.run_process(
+        [sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"],
+        input="hi",
+    )
+    assert result.returncode == 0 and result.stdout.strip() == "HI"
+
+
+def test_timeout_stops_the_whole_group(tmp_path: Path) -> None:
+    cmd, pidfile = _with_helper(tmp_path)
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        process.run_process(cmd, timeout=0.5, new_group=True)
+    assert time.monotonic() - start < 5
+    helper = _helper_pid(pidfile)
+    deadline = time.monotonic() + 5
+    while _alive(helper):
+        assert time.monotonic() < deadline, "helper survived the timeout"
+        time.sleep(0.01)
+
+
+def test_timeout_without_group_does_not_wait_for_helpers(tmp_path: Path) -> None:
+    cmd, pidfile = _with_helper(tmp_path)
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        process.run_process(cmd, timeout=0.5)
+    # The helper still holds stdout open; the call must not block on it.
+    assert time.monotonic() - start < 5
+    os.kill(_helper_pid(pidfile), signal.SIGKILL)
+
+
+def test_ctrl_c_interrupts_and_stops_the_group(tmp_path: Path) -> None:
+    cmd, pidfile = _with_helper(tmp_path)
+    threading.Timer(0.5, os.kill, (os.getpid(), signal.SIGINT)).start()
+    with pytest.raises(KeyboardInterrupt):
+        process.run_process(cmd, new_group=True)
+    helper = _helper_pid(pidfile)
+    deadline = time.monotonic() + 5
+    while _alive(helper):
+        assert time.monotonic() < deadline, "helper survived Ctrl-C"
+        time.sleep(0.01)
+
+
+def test_stop_escalates_to_sigkill() -> None:
+    stubborn = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-c",
+            "import signal, time\n"
+            "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+            "print('ready', flush=True)\ntime.sleep(30)",
+        ],
+        stdout=subprocess.PIPE,
+        **process.group_kwargs(True),
+    )
+    stubborn.stdout.readline()
+    process.stop(stubborn, new_group=True)
+    assert stubborn.returncode == -signal.SIGKILL
+    stubborn.stdout.close()
@@ -0,0 +1,96 @@
+"""Tests for b3th.prompt_budget (token estimation and prompt trimming)."""
+
+from unittest.mock import patch
+
+from b3th import commit_message as cm
+from b3th import prompt_budget as pb
+
+
+def _file_diff(path: str, hunks: list[list[str]]) -> str:
+    out = [f"diff --git a/{path} b/{path}\n", f"--- a/{path}\n", f"+++ b/{path}\n"]
+    for i, lines in enumerate(hunks, 1):
+        out.append(f"@@ -{i},1 +{i},{len(lines)} @@\n")
+        out.extend(f"+{ln}\n" for ln in lines)
+    return "".join(out)
+
+
+def test_estimate_tokens_scales_with_text():
+    assert pb.estimate_tokens("") == 0
+    short = pb.estimate_tokens("def add(a, b):\n    return a + b\n")
+    assert 8 < short < 30
+    assert pb.estimate_tokens("x = 1\n" * 100) == 100 * pb.estimate_tokens("x = 1\n")
+
+
+def test_prompt_budget_uses_context_table_and_cap(monkeypatch):
+    monkeypatch.setenv("B3TH_PROMPT_MAX_TOKENS", "1000000")
+    small = pb.prompt_budget("llama3-8b-8192", reply_tokens=500)
+    assert small == 8192 - 500 - pb._SAFETY_MARGIN
+    assert pb.prompt_budget("unknown-model", reply_tokens=500) == small
+    assert (
+        pb.prompt_budget("llama3-8b-8192", reply_tokens=500, overhead="a b c") < small
+    )
+
+    monkeypatch.setenv("B3TH_PROMPT_MAX_TOKENS", "2000")
+    assert pb.prompt_budget("llama-3.3-70b-versatile", reply_tokens=500) == 2000
+
+
+def test_fit_lines_keeps_head_and_tail():
+    text = "\n".join(f"line {i}" for i in range(200)) + "\n9 files changed"
+    out = pb.fit_lines(text, 100, keep_last=1)
+    assert pb.estimate_tokens(out) <= 100
+    assert out.startswith("line 0\n")
+    assert out.endswith("9 files changed")
+    assert "more lines omitted" in out
+    assert pb.fit_lines("short", 100) == "short"
+
+
+def test_fit_diff_leaves_small_diffs_alone():
+    diff = _file_diff("app.py", [["print('hi')"]])
+    assert pb.fit_diff(diff, 10_000) == diff
+
+
+def test_fit_diff_reduces_lockfiles_and_keeps_source():
+    source = _file_diff("b3th/core.py", [["def f():", "    return 1"]])
+    lock = _file_diff("poetry.lock", [[f'name = "pkg{i}"' for i in range(2000)]])
+    out = pb.fit_diff(source + lock, 400)
+
+    assert pb.estimate_tokens(out) <= 400
+    assert "+def f():" in out
+    assert "poetry.lock | +2000 -0 (diff omitted: low-value file)" in out
+
+
+def test_fit_diff_ranks_hunks_and_marks_omissions():
+    big = _file_diff("src/big.py", [[f"x{i} = {i}" for i in range(300)]] * 3)
+    small = _file_diff("src/small.py", [["y = 2"]])
+    docs = _file_diff("README.md", [["Some prose"] * 50])
+    out = pb.fit_diff(docs + big + small, 2500)
+
+    assert pb.estimate_tokens(out) <= 2500
+    assert "+y = 2" in out  # small source hunk wins
+    assert out.index("README.md") < out.index("src/big.py") < out.index("small.py")
+    assert "more hunk(s) omitted" in out or "src/big.py | +900" in out
+
+
+def test_share_gives_leftovers_to_large_parts():
+    small, large = "a " * 10, "b " * 10_000
+    grants = pb.share(1000, [small, large])
+    assert grants[0] == pb.estimate_tokens(small)
+    assert grants[1] == 1000 - grants[0]
+
+
+def test_commit_message_trims_huge_diff(monkeypatch):
+    lock = _file_diff("package-lock.json", [['"x": 1,'] * 50_000])
+    diff = _file_diff("main.py", [["print('hello world')"]]) + lock
+    monkeypatch.setattr(cm.git_utils, "get_staged_diff", lambda _: diff)
+
+    sent = {}
+
+    def fake_chat(messages, **_kw):
+        sent["prompt"] = messages[1]["content"]
+        return "chore: bump deps"
+
+    with patch.object(cm.llm, "chat_completion", side_effect=fake_chat):
+        cm.generate_commit_message(".", model="llama3-8b-8192")
+
+    assert "+print('hello world')" in sent["prompt"]
+    assert pb.estimate_tokens(sent["prompt"]) < 8192
@@ -0,0 +1,142 @@
+"""Tests for the header-driven rate limiter and the LLM retry loop."""
+
+import time
+
+import pytest
+
+from b3th import llm, ratelimit
+from b3th.mock_server import MockGroqServer
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("7.66s", 7.66),
+        ("2m59.56s", 179.56),
+        ("1h2m", 3720.0),
+        ("250ms", 0.25),
+        ("12", 12.0),
+        ("", None),
+        (None, None),
+        ("soon", None),
+    ],
+)
+def test_parse_duration(raw, expected):
+    got = ratelimit.parse_duration(raw)
+    assert got == pytest.approx(expected) if expected is not None else got is None
+
+
+def test_backoff_is_jittered_and_capped():
+    for attempt in range(1, 10):
+        delay = ratelimit.backoff_delay(attempt, base=0.5, cap=4)
+        assert 0 <= delay <= min(4, 0.5 * 2 ** (attempt - 1))
+
+
+def test_unknown_limits_never_wait():
+    assert ratelimit.RateLimiter().reserve(tokens=10_000) == 0.0
+
+
+def test_low_remaining_tokens_paces_callers():
+    limiter = ratelimit.RateLimiter()
+    limiter.update(
+        {
+            "x-ratelimit-limit-tokens": "1000",
+            "x-ratelimit-remaining-tokens": "0",
+            "x-ratelimit-reset-tokens": "10s",
+        }
+    )
+    # Refills at 100 tokens/s → 50 tokens available after ~0.5 s
+    assert limiter.reserve(tokens=50) == pytest.approx(0.5, abs=0.05)
+    # The reservation is kept, so the next caller queues behind it
+    assert limiter.reserve(tokens=50) == pytest.approx(1.0, abs=0.05)
+
+
+def test_full_bucket_overdraw_waits_for_refill():
+    limiter = ratelimit.RateLimiter()
+    limiter.update(
+        {
+            "x-ratelimit-limit-tokens": "6000",
+            "x-ratelimit-remaining-tokens": "6000",
+            "x-ratelimit-reset-tokens": "7.66s",
+        }
+    )
+    waits = [limiter.reserve(tokens=2500) for _ in range(4)]
+    # Refills at 6000 tokens per 7.66 s: overdrawn by 1500, then 4000
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(1500 * 7.66 / 6000, abs=0.05)
+    assert waits[3] == pytest.approx(4000 * 7.66 / 6000, abs=0.05)
+
+
+def test_unknown_refill_rate_does_not_pace():
+    limiter = ratelimit.RateLimiter()
+    limiter.update({"x-ratelimit-remaining-tokens": "0"})  # no limit, no reset
+    assert limiter.reserve(tokens=500) == 0.0
+
+
+def test_plenty_of_budget_does_not_wait():
+    limiter = ratelimit.RateLimiter()
+    limiter.update(
+        {
+            "x-ratelimit-limit-requests": "14400",
+            "x-ratelimit-remaining-requests": "14000",
+            "x-ratelimit-reset-requests": "2m59.56s",
+        }
+    )
+    assert limiter.reserve() == 0.0
+
+
+def test_pause_blocks_everyone():
+    limiter = ratelimit.RateLimiter()
+    limiter.pause(2)
+    assert 1.9 < limiter.reserve() <= 2
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    with MockGroqServer(reply="ok") as srv:
+        monkeypatch.setenv("GROQ_API_KEY", "test_key")
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        monkeypatch.setenv("B3TH_NO_CACHE", "1")
+        yield srv
+
+
+def test_429_honours_retry_after(server):
+    server.fail_next(429, retry_after="0.2")
+    start = time.monotonic()
+    assert llm.chat_completion("hi") == "ok"
+    assert time.monotonic() - start >= 0.2
+    assert server.requests == 2
+
+
+def test_5xx_retries_then_gives_up(server, monkeypatch):
+    monkeypatch.setattr(ratelimit, "backoff_delay", lambda *_a, **_k: 0.0)
+    server.fail_next(503, 503)
+    assert llm.chat_completion("hi", retries=2) == "ok"
+
+    server.fail_next(503, 503, 503)
+    with pytest.raises(llm.LLMError, match="503"):
+        llm.chat_completion("hi", retries=2)
+
+
+def test_retry_budget_stops_long_waits(server):
+    server.fail_next(429, retry_after="30")
+    start = time.monotonic()
+    with pytest.raises(llm.LLMError, match="429"):
+        llm.chat_completion("hi", retry_budget=1)
+    assert time.monotonic() - start < 1
+
+
+def test_headers_slow_the_client_down(monkeypatch):
+    headers = {
+        "x-ratelimit-limit-requests": "10",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "2s",
+    }
+    with MockGroqServer(reply="ok", headers=headers) as srv:
+        monkeypatch.setenv("GROQ_API_KEY", "test_key")
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        monkeypatch.setenv("B3TH_NO_CACHE", "1")
+        llm.chat_completion("hi")  # learns: empty bucket, 5 requests/s refill
+        start = time.monotonic()
+        llm.chat_completion("hi")
+        assert time.monotonic() - start >= 0.15
@@ -4,41 +4,37 @@ Unit tests for b3th.stats.get_stats()
 All Git calls are stubbed so no real repository is needed.
 """
 
+import os
 from pathlib import Path
 
+import pytest
+
 from b3th import stats as st
 
 
-def _fake_run_git_factory(commit_log: str, numstat: str):
+def _fake_iter_git_factory(log: str):
     """
-    Returns a stub function that mimics git-utils.run_git.
+    Returns a stub function that mimics git_utils.iter_git.
 
-    It looks at the args:
-        • '--pretty=%h'  -> commit_log
-        • '--numstat'    -> numstat
+    *log* is the raw `git log --numstat -z` output the single pass reads.
     """
 
-    def _fake_run_git(args: list[str], cwd=None):  # noqa: ANN001
-        if "--pretty=%h" in args:
-            return commit_log
-        if "--numstat" in args:
-            return numstat
-        return ""
+    def _fake_iter_git(args: list[str], cwd=None, sep="\n"):  # noqa: ANN001
+        assert "--numstat" in args and "-z" in args and sep == "\0"
+        return iter(log.split(sep))
 
-    return _fake_run_git
+    return _fake_iter_git
 
 
 def test_stats_counts(monkeypatch, tmp_path: Path):
     """
     Two commits touching two files with insertions/deletions.
     """
-    commit_log = "abc123\n def456\n"
-    numstat = "10\t0\tfoo.py\n5\t2\tbar.py\n-\t-\tbinary.png\n"
+    log = "@abc123\0\n10\t0\tfoo.py\0-\t-\tbinary.png\0" "@def456\0\n5\t2\tbar.py\0"
 
+    monkeypatch.setenv("B3TH_STATS_INDEX", "0")  # exercise the direct walk
     monkeypatch.setattr(st, "is_git_repo", lambda _: True, raising=True)
-    monkeypatch.setattr(
-        st, "run_git", _fake_run_git_factory(commit_log, numstat), raising=True
-    )
+    monkeypatch.setattr(st, "iter_git", _fake_iter_git_factory(log), raising=True)
 
     result = st.get_stats(tmp_path, last="7d")
     assert result == {"commits": 2, "files": 2, "additions": 15, "deletions": 2}
@@ -46,8 +42,183 @@ def test_stats_counts(monkeypatch, tmp_path: Path):
 
 def test_stats_no_commits(monkeypatch, tmp_path: Path):
     """When git log returns nothing, all counts should be zero."""
+    monkeypatch.setenv("B3TH_STATS_INDEX", "0")
     monkeypatch.setattr(st, "is_git_repo", lambda _: True, raising=True)
-    monkeypatch.setattr(st, "run_git", _fake_run_git_factory("", ""), raising=True)
+    monkeypatch.setattr(st, "iter_git", _fake_iter_git_factory(""), raising=True)
 
     result = st.get_stats(tmp_path, last="7d")
     assert result == {"commits": 0, "files": 0, "additions": 0, "deletions": 0}
+
+
+def test_stats_renames_and_odd_paths(monkeypatch, tmp_path: Path):
+    """Renames count under their new path; paths may hold tabs or the marker."""
+    log = (
+        "@c3\0\n1\t0\t\0@old.txt\0@new.txt\0"
+        "4\t1\tta\tb.txt\0"
+        "@c2\0"  # empty commit
+        "@c1\0\n2\t0\t@new.txt\0"
+    )
+    monkeypatch.setenv("B3TH_STATS_INDEX", "0")
+    monkeypatch.setattr(st, "is_git_repo", lambda _: True, raising=True)
+    monkeypatch.setattr(st, "iter_git", _fake_iter_git_factory(log), raising=True)
+
+    assert st.get_stats(tmp_path) == {
+        "commits": 3,
+        "files": 2,
+        "additions": 7,
+        "deletions": 1,
+    }
+
+
+def test_stats_real_repo(tmp_path: Path):
+    """Streams real `git log` output end to end."""
+    import subprocess
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True)  # noqa: S603,S607
+
+    git("init", "-q")
+    git("config", "user.email", "t@example.com")
+    git("config", "user.name", "T")
+    (tmp_path / "a.txt").write_text("1\n2\n")
+    git("add", ".")
+    git("commit", "-qm", "one")
+    (tmp_path / "a.txt").write_text("1\n")
+    (tmp_path / "b.txt").write_text("3\n")
+    git("add", ".")
+    git("commit", "-qm", "two")
+
+    result = st.get_stats(tmp_path)
+    assert result == {"commits": 2, "files": 2, "additions": 3, "deletions": 1}
+
+
+def test_stats_real_repo_renames(tmp_path: Path):
+    """A rename shows up once, under its new name, and empty commits count."""
+    import subprocess
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True)  # noqa: S603,S607
+
+    git("init", "-q")
+    git("config", "user.email", "t@example.com")
+    git("config", "user.name", "T")
+    (tmp_path / "a.txt").write_text("1\n2\n3\n")
+    git("add", ".")
+    git("commit", "-qm", "one")
+    git("mv", "a.txt", "b.txt")
+    git("commit", "-qm", "rename")
+    git("commit", "-q", "--allow-empty", "-m", "empty")
+
+    result = st.get_stats(tmp_path)
+    assert result == {"commits": 3, "files": 2, "additions": 3, "deletions": 0}
+
+
+def test_stats_windows_single_walk(monkeypatch, tmp_path: Path):
+    """One walk back to the widest window fills every window it covers."""
+    import time
+
+    now = int(time.time())
+    log = (
+        f"@c4 {now - 3600} A\0\n1\t1\tfoo.py\0"
+        f"@c3 {now - 3 * 86400} A\0\n2\t0\tbar.py\0-\t-\tlogo.png\0"
+        f"@c2 {now - 20 * 86400} B\0\n4\t2\tfoo.py\0"
+        f"@c1 {now - 200 * 86400} B\0\n8\t0\told.py\0"  # outside every window
+    )
+    walks = []
+
+    def fake_iter_git(args, cwd=None, sep="\n"):  # noqa: ANN001
+        walks.append(args)
+        return iter(log.split(sep))
+
+    monkeypatch.setenv("B3TH_STATS_INDEX", "0")
+    monkeypatch.setattr(st, "is_git_repo", lambda _: True, raising=True)
+    monkeypatch.setattr(st, "iter_git", fake_iter_git, raising=True)
+
+    result = st.get_stats_windows(tmp_path, ["7d", "1d", "30d", "1m"])
+    assert len(walks) == 1 and walks[0].count("--since") == 1
+    assert list(result) == ["7d", "1d", "30d", "1m"]
+    assert result["1d"] == {"commits": 1, "files": 1, "additions": 1, "deletions": 1}
+    assert result["7d"] == {"commits": 2, "files": 2, "additions": 3, "deletions": 1}
+    assert result["30d"] == result["1m"]
+    assert result["30d"] == {
+        "commits": 3,
+        "files": 2,
+        "additions": 7,
+        "deletions": 3,
+    }
+
+    with pytest.raises(st.StatsError, match="--last"):
+        st.get_stats_windows(tmp_path, [])
+    with pytest.raises(st.StatsError, match="--last"):
+        st.get_stats_windows(tmp_path, ["7d", "soon"])
+
+
+def test_stats_windows_agree(tmp_path: Path, monkeypatch):
+    """Index, single walk, parallel walk and per-window runs give the same."""
+    import subprocess
+    import time
+
+    from b3th import stats_parallel
+
+    now = int(time.time())
+
+    def git(*args, date=None):
+        env = None
+        if date is not None:
+            env = {**os.environ, "GIT_COMMITTER_DATE": f"{date} +0000"}
+        subprocess.run(  # noqa: S603
+            ["git", *args], cwd=tmp_path, check=True, env=env  # noqa: S607
+        )
+
+    git("init", "-q")
+    git("config", "user.email", "t@example.com")
+    git("config", "user.name", "T")
+    for days, name in [(100, "a.txt"), (40, "b.txt"), (5, "a.txt"), (0, "c.txt")]:
+        path = tmp_path / name
+        path.write_text((path.read_text() if path.exists() else "") + f"{days}\n")
+        git("add", name)
+        git("commit", "-qm", name, date=now - days * 86400 - 60)
+
+    lasts = ["1d", "7d", "30d", "90d"]
+    monkeypatch.setattr(stats_parallel, "MIN_CHUNK", 1)
+    monkeypatch.setenv("B3TH_STATS_INDEX", "0")
+    walked = st.get_stats_windows(tmp_path, lasts)
+    assert walked == {last: st.get_stats(tmp_path, last=last) for last in lasts}
+    assert st.get_stats_windows(tmp_path, lasts, jobs=2) == walked
+    monkeypatch.setenv("B3TH_STATS_INDEX", "1")
+    assert st.get_stats_windows(tmp_path, lasts) == walked
+    assert [w["commits"] for w in walked.values()] == [1, 2, 2, 3]
+    assert walked["90d"]["files"] == 3
+
+
+def test_cli_stats_windows(monkeypatch, tmp_path: Path):
+    """`--last 1d,7d` prints one row per window, or JSON."""
+    import json
+
+    from typer.testing import CliRunner
+
+    from b3th.cli import app
+
+    zero = {"commits": 0, "files": 0, "additions": 0, "deletions": 0}
+    seen = {}
+
+    def fake_windows(repo_path, lasts, *, jobs=1):  # noqa: ANN001
+        seen["lasts"] = lasts
+        return {"1d": zero, "7d": {**zero, "commits": 12, "additions": 40}}
+
+    monkeypatch.setattr(st, "get_stats_windows", fake_windows, raising=True)
+    runner = CliRunner()
+    result = runner.invoke(app, ["stats", str(tmp_path), "--last", "1d, 7d"])
+    assert result.exit_code == 0, result.output
+    assert seen["lasts"] == ["1d", "7d"]
+    assert result.output.splitlines() == [
+        "Window  Commits  Files  Additions  Deletions",
+        "1d            0      0         +0         -0",
+        "7d           12      0        +40         -0",
+    ]
+
+    result = runner.invoke(app, ["stats", str(tmp_path), "-l", "1d,7d", "--json"])
+    assert json.loads(result.output)["7d"]["commits"] == 12
+
+    result = runner.invoke(app, ["stats", str(tmp_path), "-l", "1d,7d", "-b", "day"])
+    assert result.exit_code != 0
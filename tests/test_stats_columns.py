@@ -0,0 +1,159 @@
+"""
+Tests for b3th.stats_columns and `b3th stats --by`: the column store, both
+group-by paths, and agreement between the index and a direct walk.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from b3th import stats as st
+from b3th import stats_columns as sc
+from b3th.cli import app
+
+_DAY = 86_400
+MON = 1_704_067_200  # Mon 2024-01-01 00:00 UTC
+SUN, NEXT_MON = MON + 6 * _DAY, MON + 7 * _DAY
+
+LOG = (
+    f"@a1 {MON} Ada\0\n10\t0\tsrc/foo.py\0-\t-\tlogo.png\0"
+    f"@b2 {SUN + 3600} Bob\0\n5\t2\tsrc/bar.py\0"
+    f"@c3 {NEXT_MON} Ada\0\n1\t1\tsrc/foo.py\0"
+    "2\t0\tdocs/index.md\0"
+    "3\t3\tREADME.md\0"
+    f"@d4 {NEXT_MON + 60} Bob\0"  # no file changes (e.g. a merge)
+)
+
+
+def _records() -> list[str]:
+    return LOG.split("\0")
+
+
+def _by_key(rows: list[dict]) -> dict[str, tuple]:
+    return {
+        r["key"]: (r["commits"], r["files"], r["additions"], r["deletions"])
+        for r in rows
+    }
+
+
+@pytest.fixture(params=["python", "numpy"])
+def group(request, monkeypatch):
+    """Run each test against both group-by implementations."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(sc, "np", None)
+    return request.param
+
+
+def test_columns_from_log() -> None:
+    cols = sc.Columns.from_log(_records())
+    assert len(cols) == 6
+    assert list(cols.commits) == [0, 1, 2, 3]
+    assert cols.authors == ["Ada", "Bob"]
+    assert list(cols.author) == [0, 1, 0, 1]
+    assert cols.paths[cols.row_path[1]] == "logo.png"
+    assert (cols.added[1], cols.deleted[1]) == (-1, -1)
+
+
+def test_breakdown_by_each_key(group) -> None:
+    cols = sc.Columns.from_log(_records())
+
+    authors = sc.breakdown(cols, "author")
+    assert [r["key"] for r in authors] == ["Ada", "Bob"]  # most lines first
+    assert _by_key(authors) == {"Ada": (2, 3, 16, 4), "Bob": (2, 1, 5, 2)}
+
+    assert _by_key(sc.breakdown(cols, "path")) == {
+        "src": (3, 2, 16, 3),
+        ".": (2, 1, 3, 3),  # logo.png is binary: a commit, but no file
+        "docs": (1, 1, 2, 0),
+    }
+    assert _by_key(sc.breakdown(cols, "day")) == {
+        "2024-01-01": (1, 1, 10, 0),
+        "2024-01-07": (1, 1, 5, 2),
+        "2024-01-08": (2, 3, 6, 4),
+    }
+    weeks = sc.breakdown(cols, "week")
+    assert [r["key"] for r in weeks] == ["2024-W01", "2024-W02"]
+    assert _by_key(weeks)["2024-W01"] == (2, 2, 15, 2)
+
+    assert sc.breakdown(sc.Columns(), "week") == []
+    with pytest.raises(ValueError, match="cannot group by"):
+        sc.breakdown(cols, "month")
+
+
+def test_week_labels_cross_years() -> None:
+    # 2020-12-31 is in ISO week 2020-W53; 2021-01-04 starts 2021-W01.
+    assert sc._week_label((18_627 + 3) // 7) == "2020-W53"
+    assert sc._week_label((18_631 + 3) // 7) == "2021-W01"
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(  # noqa: S603
+        ["git", *args], cwd=repo, check=True, capture_output=True  # noqa: S607
+    )
+
+
+def test_index_and_walk_agree(tmp_path: Path, monkeypatch, group) -> None:
+    _git(tmp_path, "init", "-q")
+    for name, path in [("Ada", "src/a.py"), ("Bob", "b.txt"), ("Ada", "src/c.py")]:
+        (tmp_path / path).parent.mkdir(exist_ok=True)
+        (tmp_path / path).write_text(f"{name}\n{path}\n")
+        _git(tmp_path, "add", path)
+        _git(
+            tmp_path,
+            "-c",
+            f"user.name={name}",
+            "-c",
+            "user.email=x@example.com",
+            "commit",
+            "-qm",
+            path,
+        )
+
+    for by in sc.BY_CHOICES:
+        monkeypatch.setenv("B3TH_STATS_INDEX", "1")
+        indexed = st.get_breakdown(tmp_path, by)
+        monkeypatch.setenv("B3TH_STATS_INDEX", "0")
+        assert indexed == st.get_breakdown(tmp_path, by)
+    monkeypatch.setenv("B3TH_STATS_INDEX", "1")
+    assert _by_key(st.get_breakdown(tmp_path, "author", last="1d")) == {
+        "Ada": (2, 2, 4, 0),
+        "Bob": (1, 1, 2, 0),
+    }
+    assert _by_key(st.get_breakdown(tmp_path, "path")) == {
+        "src": (2, 2, 4, 0),
+        ".": (1, 1, 2, 0),
+    }
+
+    with pytest.raises(st.StatsError, match="Invalid --by"):
+        st.get_breakdown(tmp_path, "month")
+    with pytest.raises(st.StatsError, match="not a Git repository"):
+        st.get_breakdown(tmp_path / "nope", "author")
+
+
+def test_cli_stats_by(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(st, "is_git_repo", lambda _: True, raising=True)
+    monkeypatch.setattr(st, "_log", lambda _repo, _since: _records(), raising=True)
+    monkeypatch.setenv("B3TH_STATS_INDEX", "0")
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["stats", str(tmp_path), "--by", "author"])
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == [
+        "Author  Commits  Files  Additions  Deletions",
+        "Ada           2      3        +16         -4",
+        "Bob           2      1         +5         -2",
+    ]
+
+    result = runner.invoke(app, ["stats", str(tmp_path), "--by", "month"])
+    assert result.exit_code != 0
+    assert "--by" in result.output
+
+    monkeypatch.setattr(st, "_log", lambda _repo, _since: [], raising=True)
+    result = runner.invoke(app, ["stats", str(tmp_path), "--by", "week"])
+    assert result.output.strip() == "No commits in the specified range."
@@ -0,0 +1,177 @@
+"""
+Tests for b3th.stats_index: incremental ingestion, rewrite detection and
+range queries, checked against a direct `git log` walk.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from b3th import stats as st
+from b3th import stats_index as si
+
+
+def _git(repo: Path, *args: str, date: int | None = None) -> str:
+    env = dict(os.environ)
+    if date is not None:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = f"{date} +0000"
+    return subprocess.run(  # noqa: S603
+        ["git", *args],  # noqa: S607
+        cwd=repo,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def _commit(repo: Path, name: str, text: str, date: int | None = None) -> None:
+    (repo / name).write_text(text)
+    _git(repo, "add", name)
+    _git(repo, "commit", "-qm", f"edit {name}", date=date)
+
+
+@pytest.fixture()
+def repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.email", "t@example.com")
+    _git(tmp_path, "config", "user.name", "T")
+    _commit(tmp_path, "a.txt", "1\n2\n")
+    _commit(tmp_path, "b.txt", "x\n")
+    return tmp_path
+
+
+def _walk(repo: Path, monkeypatch, last: str | None = None) -> dict[str, int]:
+    with monkeypatch.context() as m:
+        m.setenv("B3TH_STATS_INDEX", "0")
+        return st.get_stats(repo, last=last)
+
+
+def test_ingests_only_new_commits(repo: Path, monkeypatch) -> None:
+    with si.StatsIndex.open(repo) as index:
+        assert index.update() == 2
+        assert index.update() == 0  # nothing new: no history walk at all
+        _commit(repo, "a.txt", "1\n2\n3\n")
+        _git(repo, "switch", "-qc", "side")
+        _commit(repo, "c.bin", "\0\1")
+        _git(repo, "tag", "-a", "v1", "-m", "v1")
+        assert index.update() == 2
+        assert index.totals() == _walk(repo, monkeypatch)
+    assert si.index_path(repo) == (repo / ".git" / "b3th" / "stats.sqlite").resolve()
+
+
+def test_rewritten_history_is_reindexed(repo: Path, monkeypatch) -> None:
+    with si.StatsIndex.open(repo) as index:
+        index.update()
+        _commit(repo, "b.txt", "x\ny\n")
+        index.update()
+        _git(repo, "reset", "-q", "--hard", "HEAD~1")  # drop the last commit
+        _git(repo, "commit", "-q", "--amend", "-m", "reworded")
+        assert index.update() == 2  # rebuilt: root + amended commit
+        assert index.totals() == _walk(repo, monkeypatch)
+        assert index.totals()["commits"] == 2
+
+        _git(repo, "switch", "-qc", "gone")
+        _commit(repo, "d.txt", "d\n")
+        index.update()
+        _git(repo, "switch", "-q", "main")
+        _git(repo, "branch", "-qD", "gone")
+        index.update()
+        assert index.totals() == _walk(repo, monkeypatch)
+
+
+def test_totals_are_a_range_query(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "t@example.com")
+    _git(repo, "config", "user.name", "T")
+    now = int(time.time())
+    _commit(repo, "old.txt", "o\n" * 5, date=now - 40 * 86400)
+    _commit(repo, "a.txt", "1\n2\n", date=now - 3 * 86400)
+    _commit(repo, "b.txt", "x\n", date=now - 60)
+    with si.StatsIndex.open(repo) as index:
+        index.update()
+        week = index.totals(now - 7 * 86400)
+    assert week == {"commits": 2, "files": 2, "additions": 3, "deletions": 0}
+    assert week == _walk(repo, monkeypatch, last="7d")
+    assert st.get_stats(repo, last="7d") == week
+    assert st.get_stats(repo)["commits"] == 3
+
+
+def test_last_window_starts_exactly_delta_ago(tmp_path: Path, monkeypatch) -> None:
+    """`--last 7d` covers now-7d onwards, to the second, as date-only
+    `git log --since YYYY-MM-DD` did (git reads it at the current time)."""
+    repo = tmp_path
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "t@example.com")
+    _git(repo, "config", "user.name", "T")
+    week = int(time.time()) - 7 * 86400
+    _commit(repo, "out.txt", "o\n", date=week - 120)
+    _commit(repo, "in.txt", "i\n", date=week + 120)
+
+    expected = {"commits": 1, "files": 1, "additions": 1, "deletions": 0}
+    assert st.get_stats(repo, last="7d") == expected
+    assert _walk(repo, monkeypatch, last="7d") == expected
+    day = time.strftime("%Y-%m-%d", time.localtime(week))
+    assert _git(repo, "log", "--all", "--since", day, "--format=%s") == "edit in.txt\n"
+
+
+def test_unusable_files_are_replaced_or_skipped(repo: Path, monkeypatch) -> None:
+    path = si.index_path(repo)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a database" * 100)
+    with si.StatsIndex.open(repo) as index:  # corrupt: replaced
+        index.update()
+
+    db = sqlite3.connect(path)
+    db.execute("UPDATE meta SET value = 'old' WHERE key = 'version'")
+    db.commit()
+    db.close()
+    with si.StatsIndex.open(repo) as index:  # other schema: rebuilt
+        assert index.update() == 2
+
+    # Can't be created (here: a file is in the way): stats walk history.
+    blocked = repo / "a.txt" / "b3th" / "stats.sqlite"
+    monkeypatch.setattr(si, "index_path", lambda _repo: blocked, raising=True)
+    with pytest.raises(si.StatsIndexError):
+        si.StatsIndex.open(repo)
+    assert st.get_stats(repo) == _walk(repo, monkeypatch)
+
+
+def test_disabled_index_is_not_created(repo: Path, monkeypatch) -> None:
+    _walk(repo, monkeypatch)
+    assert not si.index_path(repo).exists()
+
+
+def test_batches_locked_tips_and_nested_tags(repo: Path, monkeypatch) -> None:
+    monkeypatch.setattr(si, "_BATCH", 1)  # flush after every row
+    _git(repo, "tag", "-a", "inner", "-m", "inner")
+    _git(repo, "tag", "-a", "outer", "-m", "outer", "inner")  # tag of a tag
+    _git(repo, "switch", "-qc", "side")
+    _commit(repo, "c.txt", "c\n")
+    _git(repo, "tag", "-a", "deep", "-m", "deep")
+    _git(repo, "tag", "-a", "deeper", "-m", "deeper", "deep")
+    tip = _git(repo, "rev-parse", "deep^{commit}").strip()
+    _git(repo, "tag", "-d", "deep")
+    _git(repo, "switch", "-q", "main")
+    _git(repo, "branch", "-qD", "side")  # only the tag of a tag keeps c.txt
+    assert tip in si._ref_tips(repo)
+
+    real_tips = si._ref_tips
+    locked = []
+
+    def tips_under_lock(path: Path) -> set[str]:
+        locked.append(index._db.in_transaction)
+        return real_tips(path)
+
+    monkeypatch.setattr(si, "_ref_tips", tips_under_lock)
+    with si.StatsIndex.open(repo) as index:
+        assert index.update() == 3
+        assert index.totals() == _walk(repo, monkeypatch)
+    assert locked == [True]
@@ -0,0 +1,111 @@
+"""
+Tests for b3th.stats_parallel and `stats --jobs`: a chunked, multi-process
+scan must give exactly the totals of a single `git log` walk.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from b3th import stats as st
+from b3th import stats_parallel as sp
+from b3th.cli import app
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(  # noqa: S603
+        ["git", *args], cwd=repo, check=True, capture_output=True  # noqa: S607
+    )
+
+
+def _commit(repo: Path, name: str, data: str | bytes) -> None:
+    path = repo / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, bytes):
+        path.write_bytes(data)
+    else:
+        path.write_text(data)
+    _git(repo, "add", name)
+    _git(repo, "commit", "-qm", f"edit {name}")
+
+
+@pytest.fixture()
+def repo(tmp_path: Path, monkeypatch) -> Path:
+    """A small history with a merge, a rename, a binary file and files that
+    change in several chunks; chunks of one commit each."""
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.email", "t@example.com")
+    _git(tmp_path, "config", "user.name", "T")
+    _commit(tmp_path, "a.txt", "1\n")
+    _commit(tmp_path, "src/b.py", "b\n")
+    _git(tmp_path, "switch", "-qc", "side")
+    _commit(tmp_path, "a.txt", "1\n2\n")
+    _commit(tmp_path, "logo.png", b"\0\1\2")
+    _git(tmp_path, "switch", "-q", "main")
+    _commit(tmp_path, "src/b.py", "b\nc\n")
+    _git(tmp_path, "merge", "-q", "--no-edit", "side")
+    _git(tmp_path, "mv", "src/b.py", "src/c.py")
+    _git(tmp_path, "commit", "-qm", "rename")
+    _commit(tmp_path, "a.txt", "2\n")
+    monkeypatch.setattr(sp, "MIN_CHUNK", 1)
+    return tmp_path
+
+
+def test_parallel_walk_matches_serial(repo: Path, monkeypatch) -> None:
+    monkeypatch.setenv("B3TH_STATS_INDEX", "0")
+    serial = st.get_stats(repo)
+    assert serial["commits"] == 8
+    assert st.get_stats(repo, jobs=3) == serial  # 8 chunks over 3 processes
+    assert st.get_stats(repo, last="1d", jobs=2) == serial
+    for by in ("author", "path"):
+        assert st.get_breakdown(repo, by, jobs=2) == st.get_breakdown(repo, by)
+
+
+def test_parallel_index_build(repo: Path, monkeypatch) -> None:
+    monkeypatch.setenv("B3TH_STATS_INDEX", "0")
+    serial = st.get_stats(repo)
+    monkeypatch.setenv("B3TH_STATS_INDEX", "1")
+    assert st.get_stats(repo, jobs=2) == serial
+    _commit(repo, "d.txt", "d\n")  # incremental: only the new commit
+    assert st.get_stats(repo, jobs=2)["commits"] == serial["commits"] + 1
+
+
+def test_scan_chunking(repo: Path, monkeypatch) -> None:
+    shas = sp.rev_list(repo, ["--all"])
+    assert len(shas) == 8
+    assert list(sp.scan(_chunk_size, repo, shas, 1)) == [8]  # in-process
+    assert list(sp.scan(_chunk_size, repo, [], 4)) == []
+    monkeypatch.setattr(sp, "MAX_CHUNK", 3)  # caps chunks even for one job
+    assert list(sp.scan(_chunk_size, repo, shas, 1)) == [3, 3, 2]
+    assert list(sp.log_chunk(repo, [])) == []  # not HEAD's history
+
+    assert sp.resolve_jobs(0) >= 1
+    with pytest.raises(ValueError, match="jobs"):
+        sp.resolve_jobs(-1)
+    with pytest.raises(st.StatsError, match="--jobs"):
+        st.get_stats(repo, jobs=-1)
+
+
+def _chunk_size(_repo: str, shas: list[str]) -> int:
+    return len(shas)
+
+
+def test_cli_jobs_option(monkeypatch, tmp_path: Path) -> None:
+    seen = {}
+
+    def fake_print_stats(
+        repo, last=None, by=None, jobs=1, as_json=False
+    ):  # noqa: ANN001
+        seen["jobs"] = jobs
+
+    monkeypatch.setattr(st, "print_stats", fake_print_stats, raising=True)
+    runner = CliRunner()
+    result = runner.invoke(app, ["stats", str(tmp_path), "--jobs", "0"])
+    assert result.exit_code == 0, result.output
+    assert seen == {"jobs": 0}
+    result = runner.invoke(app, ["stats", str(tmp_path), "-j", "-2"])
+    assert result.exit_code != 0
@@ -2,8 +2,8 @@
 Tests for b3th.summarizer.summarize_commits()
 
 We stub:
-  • is_git_repo           → True
-  • get_last_commits      → deterministic list
+  • ais_git_repo          → True
+  • aget_last_commits     → deterministic list
   • llm.chat_completion   → fixed summary
 """
 
@@ -32,13 +32,13 @@ FAKE_COMMITS = [
 ]
 
 
-def test_summarizer_happy_path(monkeypatch, tmp_path: Path):
+def test_summarizer_happy_path(async_stub, monkeypatch, tmp_path: Path):
     """Returns the LLM summary string."""
 
     # Make repo_path look like a Git repo
-    monkeypatch.setattr(sm, "is_git_repo", lambda _: True, raising=True)
+    monkeypatch.setattr(sm, "ais_git_repo", async_stub(True), raising=True)
     # Stub commit extraction
-    monkeypatch.setattr(sm, "get_last_commits", lambda *_: FAKE_COMMITS, raising=True)
+    monkeypatch.setattr(sm, "aget_last_commits", async_stub(FAKE_COMMITS), raising=True)
 
     fake_summary = (
         "Add a comprehensive stats command and fix a minor UI color issue, "
@@ -51,11 +51,11 @@ def test_summarizer_happy_path(monkeypatch, tmp_path: Path):
     assert "UI color issue" in out
 
 
-def test_summarizer_llm_failure(monkeypatch, tmp_path: Path):
+def test_summarizer_llm_failure(async_stub, monkeypatch, tmp_path: Path):
     """LLM exceptions should be surfaced as SummarizerError."""
 
-    monkeypatch.setattr(sm, "is_git_repo", lambda _: True, raising=True)
-    monkeypatch.setattr(sm, "get_last_commits", lambda *_: FAKE_COMMITS, raising=True)
+    monkeypatch.setattr(sm, "ais_git_repo", async_stub(True), raising=True)
+    monkeypatch.setattr(sm, "aget_last_commits", async_stub(FAKE_COMMITS), raising=True)
 
     # Simulate Groq API error
     with patch.object(sm.llm, "chat_completion", side_effect=sm.llm.LLMError("boom")):
@@ -0,0 +1,107 @@
+"""
+Per-call telemetry (b3th.telemetry) recorded by b3th.llm.
+"""
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from b3th import llm, telemetry
+from b3th.cli import app
+from b3th.mock_server import MockGroqServer
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    with MockGroqServer(reply="feat: add greeting") as srv:
+        monkeypatch.setenv("GROQ_API_KEY", "test_key")
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        llm.close_session()
+        yield srv
+    llm.close_session()
+
+
+@pytest.fixture()
+def records():
+    seen: list = []
+    remove = telemetry.add_hook(seen.append)
+    yield seen
+    remove()
+
+
+def test_chat_completion_record(server, records):
+    llm.chat_completion("hi", model="m")
+    (rec,) = records
+    assert rec.model == "m"
+    assert rec.status == 200
+    assert rec.retries == 0
+    assert rec.completion_tokens == 3
+    assert rec.total_tokens == 3
+    assert rec.error is None and not rec.cached and not rec.stream
+    assert 0 <= rec.ttfb_s <= rec.wall_s
+
+
+def test_streamed_record_has_ttft_and_usage(server, records):
+    assert "".join(llm.stream_chat_completion("hi")) == "feat: add greeting"
+    (rec,) = records
+    assert rec.stream
+    assert 0 <= rec.ttfb_s <= rec.ttft_s <= rec.wall_s
+    assert rec.completion_tokens == 3
+
+
+def test_retries_counted(server, records):
+    server.fail_next(503, retry_after="0")
+    llm.chat_completion("hi")
+    assert records[0].retries == 1
+    assert records[0].status == 200
+
+
+def test_error_recorded(server, records):
+    server.fail_next(400)
+    with pytest.raises(llm.LLMError):
+        llm.chat_completion("hi")
+    assert records[0].status == 400
+    assert "400" in records[0].error
+
+
+def test_cache_hit_recorded(server, records):
+    llm.chat_completion("hi")
+    llm.chat_completion("hi")
+    assert [r.cached for r in records] == [False, True]
+
+
+def test_failing_hook_is_ignored(server, records):
+    def broken(_rec):
+        raise RuntimeError("boom")
+
+    remove = telemetry.add_hook(broken)
+    try:
+        assert llm.chat_completion("hi") == "feat: add greeting"
+    finally:
+        remove()
+    assert len(records) == 1
+
+
+def test_trace_file_from_env(server, monkeypatch, tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    monkeypatch.setenv("B3TH_TRACE", str(trace))
+    llm.chat_completion("hi", model="m")
+    (line,) = trace.read_text().splitlines()
+    data = json.loads(line)
+    assert data["kind"] == "llm"
+    assert data["model"] == "m"
+    assert "_t0" not in data
+
+
+def test_cli_trace_option(monkeypatch, tmp_path):
+    trace = tmp_path / "cli.jsonl"
+
+    def fake_summary(*_a, **_k):
+        telemetry.emit(telemetry.LLMCall(model="x"))
+        return "ok"
+
+    monkeypatch.setattr("b3th.cli.summarize_commits", fake_summary)
+    res = CliRunner().invoke(app, ["--trace", str(trace), "summarize", str(tmp_path)])
+    assert res.exit_code == 0
+    assert json.loads(trace.read_text())["model"] == "x"
@@ -0,0 +1,106 @@
+"""
+Record/replay transports (b3th.transport) wired through b3th.llm.
+"""
+
+import json
+import time
+
+import pytest
+
+from b3th import llm, transport
+from b3th.mock_server import MockGroqServer
+
+
+@pytest.fixture(autouse=True)
+def _offline_env(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "secret-key")
+    monkeypatch.setenv("B3TH_NO_CACHE", "1")
+    monkeypatch.delenv("B3TH_LLM_RECORD", raising=False)
+    monkeypatch.delenv("B3TH_LLM_REPLAY", raising=False)
+    llm.close_session()
+    yield
+    llm.set_transport(None)
+    llm.close_session()
+
+
+def _record(tmp_path, monkeypatch, reply="feat: recorded reply", **calls):
+    cassette = tmp_path / "llm.jsonl"
+    with MockGroqServer(reply=reply) as srv:
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        llm.set_transport(transport.RecordTransport(cassette, llm._SessionTransport()))
+        llm.chat_completion("hi", model="m")
+        list(llm.stream_chat_completion("hi", model="m"))
+    llm.set_transport(None)
+    return cassette
+
+
+def test_record_then_replay_offline(tmp_path, monkeypatch):
+    cassette = _record(tmp_path, monkeypatch)
+    lines = cassette.read_text().splitlines()
+    assert len(lines) == 2
+    assert "secret-key" not in cassette.read_text()
+    assert json.loads(lines[0])["request"]["path"] == "/openai/v1/chat/completions"
+
+    # The server is gone and the base points elsewhere; replay still works.
+    monkeypatch.setenv("GROQ_API_BASE", "http://127.0.0.1:9")
+    llm.set_transport(transport.ReplayTransport(cassette))
+    assert llm.chat_completion("hi", model="m") == "feat: recorded reply"
+    assert "".join(llm.stream_chat_completion("hi", model="m")) == (
+        "feat: recorded reply"
+    )
+
+
+def test_replay_via_environment(tmp_path, monkeypatch):
+    cassette = _record(tmp_path, monkeypatch)
+    monkeypatch.setenv("B3TH_LLM_REPLAY", str(cassette))
+    assert llm.chat_completion("hi", model="m") == "feat: recorded reply"
+
+
+def test_record_via_environment(tmp_path, monkeypatch):
+    cassette = tmp_path / "env.jsonl"
+    monkeypatch.setenv("B3TH_LLM_RECORD", str(cassette))
+    with MockGroqServer(reply="ok") as srv:
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        assert llm.chat_completion("hi") == "ok"
+    assert len(cassette.read_text().splitlines()) == 1
+
+
+def test_replay_miss_is_llm_error(tmp_path, monkeypatch):
+    cassette = _record(tmp_path, monkeypatch)
+    llm.set_transport(transport.ReplayTransport(cassette))
+    with pytest.raises(llm.LLMError, match="No recorded response"):
+        llm.chat_completion("something else", model="m")
+
+
+def test_missing_cassette_is_llm_error(tmp_path, monkeypatch):
+    monkeypatch.setenv("B3TH_LLM_REPLAY", str(tmp_path / "absent.jsonl"))
+    with pytest.raises(llm.LLMError, match="Cannot load cassette"):
+        llm.chat_completion("hi")
+
+
+def test_replay_reproduces_retry_sequence(tmp_path, monkeypatch):
+    cassette = tmp_path / "retry.jsonl"
+    with MockGroqServer(reply="ok") as srv:
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        srv.fail_next(503, retry_after="0")
+        llm.set_transport(transport.RecordTransport(cassette, llm._SessionTransport()))
+        assert llm.chat_completion("hi", model="m") == "ok"
+    statuses = [
+        json.loads(line)["response"]["status"]
+        for line in cassette.read_text().splitlines()
+    ]
+    assert statuses == [503, 200]
+
+    replay = transport.ReplayTransport(cassette)
+    llm.set_transport(replay)
+    assert llm.chat_completion("hi", model="m") == "ok"
+    assert llm.chat_completion("hi", model="m") == "ok"  # last answer sticks
+
+
+def test_mock_server_latency_and_token_rate(monkeypatch):
+    with MockGroqServer(reply="a b c d", latency=0.05, token_rate=100) as srv:
+        monkeypatch.setenv("GROQ_API_BASE", srv.url)
+        start = time.perf_counter()
+        llm.chat_completion("hi")
+        # 50 ms to first byte + 4 words at 100 words/s
+        assert time.perf_counter() - start >= 0.09